@@ -6,6 +6,8 @@ import datetime
 import re
 import time as time_mod
 
+from repoze.lru import LRUCache
+
 from zope.interface import implementer
 
 from pyramid.compat import long
@@ -21,14 +23,69 @@ from pyramid.interfaces import IDebugLogger
 
 from pyramid.security import Authenticated
 from pyramid.security import Everyone
+from pyramid.security import _authn_memo
 
 VALID_TOKEN = re.compile(r"^[A-Za-z][A-Za-z0-9+_-]*$")
 
+class PrincipalCache(object):
+    """ A cache of the groups returned by the ``callback`` of an
+    authentication policy, keyed by userid, which may be passed as the
+    ``principal_cache`` argument of the
+    :class:`pyramid.authentication.AuthTktAuthenticationPolicy`,
+    :class:`pyramid.authentication.SessionAuthenticationPolicy` and
+    :class:`pyramid.authentication.RemoteUserAuthenticationPolicy`
+    constructors.  The callback is then only called for a userid whose
+    groups are not in the cache, so the groups of a user are looked up at
+    most once every ``timeout`` seconds, however many requests the user
+    makes.  A ``None`` result (an unknown user) is not cached.
+
+    At most ``max_size`` userids are cached; the least recently used are
+    discarded first.  Call ``invalidate`` when the groups of a user change,
+    or ``clear`` to discard every cached result.  The ``hits`` and
+    ``misses`` attributes count the lookups which did and did not find
+    groups in the cache.
+
+    A cache should only be used by policies which share the same
+    callback."""
+
+    hits = 0
+    misses = 0
+
+    def __init__(self, max_size=1000, timeout=300):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._cache = LRUCache(max_size)
+
+    def get(self, userid):
+        """ Return the cached groups of ``userid``, or ``None``."""
+        entry = self._cache.get(userid)
+        if entry is not None:
+            expires, groups = entry
+            if expires > time_mod.time():
+                self.hits += 1
+                return groups
+            self._cache.invalidate(userid)
+        self.misses += 1
+        return None
+
+    def set(self, userid, groups):
+        """ Cache ``groups`` as the groups of ``userid``."""
+        self._cache.put(userid, (time_mod.time() + self.timeout, groups))
+
+    def invalidate(self, userid):
+        """ Discard the cached groups of ``userid``, if any."""
+        self._cache.invalidate(userid)
+
+    def clear(self):
+        """ Discard all cached groups."""
+        self._cache.clear()
+
 class CallbackAuthenticationPolicy(object):
     """ Abstract class """
 
     debug = False
     callback = None
+    principal_cache = None
 
     def _log(self, msg, methodname, request):
         logger = request.registry.queryUtility(IDebugLogger)
@@ -38,6 +95,29 @@ class CallbackAuthenticationPolicy(object):
             methodname = classname + '.' + methodname
             logger.debug(methodname + ': ' + msg)
 
+    def _callback(self, userid, request):
+        # the callback's answer is remembered for the request along with
+        # the other security results (see pyramid.security.forget)
+        memo = _authn_memo(request, self)
+        key = ('callback', userid)
+        try:
+            return memo[key]
+        except KeyError:
+            pass
+        except TypeError: # unhashable userid
+            return self.callback(userid, request)
+        cache = self.principal_cache
+        if cache is None:
+            groups = self.callback(userid, request)
+        else:
+            groups = cache.get(userid)
+            if groups is None:
+                groups = self.callback(userid, request)
+                if groups is not None:
+                    cache.set(userid, groups)
+        memo[key] = groups
+        return groups
+
     def authenticated_userid(self, request):
         debug = self.debug
         userid = self.unauthenticated_userid(request)
@@ -53,7 +133,7 @@ class CallbackAuthenticationPolicy(object):
                 'authenticated_userid',
                 request)
             return userid
-        callback_ok = self.callback(userid, request)
+        callback_ok = self._callback(userid, request)
         if callback_ok is not None: # is not None!
             debug and self._log(
                 'groupfinder callback returned %r; returning %r' % (
@@ -87,7 +167,7 @@ class CallbackAuthenticationPolicy(object):
                 request)
             groups = []
         else:
-            groups = self.callback(userid, request)
+            groups = self._callback(userid, request)
             debug and self._log(
                 'groupfinder callback returned %r as groups' % (groups,),
                 'effective_principals',
@@ -228,14 +308,22 @@ class RemoteUserAuthenticationPolicy(CallbackAuthenticationPolicy):
         steps.  The output from debugging is useful for reporting to maillist
         or IRC channels when asking for support.
 
+    ``principal_cache``
+
+        Default: ``None``.  A :class:`pyramid.authentication.PrincipalCache`
+        which remembers the groups ``callback`` returns for each userid
+        across requests.  Optional.
+
     Objects of this class implement the interface described by
     :class:`pyramid.interfaces.IAuthenticationPolicy`.
     """
 
-    def __init__(self, environ_key='REMOTE_USER', callback=None, debug=False):
+    def __init__(self, environ_key='REMOTE_USER', callback=None, debug=False,
+                 principal_cache=None):
         self.environ_key = environ_key
         self.callback = callback
         self.debug = debug
+        self.principal_cache = principal_cache
 
     def unauthenticated_userid(self, request):
         return request.environ.get(self.environ_key)
@@ -346,6 +434,12 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
         steps.  The output from debugging is useful for reporting to maillist
         or IRC channels when asking for support.
 
+    ``principal_cache``
+
+        Default: ``None``.  A :class:`pyramid.authentication.PrincipalCache`
+        which remembers the groups ``callback`` returns for each userid
+        across requests.  Optional.
+
     Objects of this class implement the interface described by
     :class:`pyramid.interfaces.IAuthenticationPolicy`.
     """
@@ -362,6 +456,7 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
                  http_only=False,
                  wild_domain=True,
                  debug=False,
+                 principal_cache=None,
                  ):
         self.cookie = AuthTktCookieHelper(
             secret,
@@ -377,6 +472,7 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
             )
         self.callback = callback
         self.debug = debug
+        self.principal_cache = principal_cache
 
     def unauthenticated_userid(self, request):
         result = self.cookie.identify(request)
@@ -530,6 +626,9 @@ class AuthTktCookieHelper(object):
     BadTicket = BadTicket # for tests
     now = None # for tests
 
+    # the most verified tickets remembered by ``identify``
+    verified_cache_size = 1000
+
     userid_type_decoders = {
         'int':int,
         'unicode':lambda x: utf_8_decode(x)[0], # bw compat for old cookies
@@ -557,6 +656,8 @@ class AuthTktCookieHelper(object):
         self.http_only = http_only
         self.path = path
         self.wild_domain = wild_domain
+        # (cookie, remote_addr) -> (timestamp, userid, tokens, user_data)
+        self._verified = {}
 
         static_flags = []
         if self.secure:
@@ -622,12 +723,36 @@ class AuthTktCookieHelper(object):
             remote_addr = environ['REMOTE_ADDR']
         else:
             remote_addr = '0.0.0.0'
-        
-        try:
-            timestamp, userid, tokens, user_data = self.parse_ticket(
-                self.secret, cookie, remote_addr)
-        except self.BadTicket:
-            return None
+
+        # A ticket is a function of the secret, the cookie and the remote
+        # address, so the parsed and decoded ticket of a cookie the client
+        # has sent before is reused instead of recomputing its digest.
+        key = (cookie, remote_addr)
+        verified = self._verified.get(key)
+
+        if verified is None:
+            try:
+                timestamp, userid, tokens, user_data = self.parse_ticket(
+                    self.secret, cookie, remote_addr)
+            except self.BadTicket:
+                return None
+
+            userid_typename = 'userid_type:'
+            user_data_info = user_data.split('|')
+            for datum in filter(None, user_data_info):
+                if datum.startswith(userid_typename):
+                    userid_type = datum[len(userid_typename):]
+                    decoder = self.userid_type_decoders.get(userid_type)
+                    if decoder:
+                        userid = decoder(userid)
+
+            verified = (timestamp, userid, tokens, user_data)
+            if len(self._verified) >= self.verified_cache_size:
+                self._verified.clear()
+            self._verified[key] = verified
+
+        timestamp, userid, tokens, user_data = verified
+        tokens = tokens[:] # the cached tokens are never handed out
 
         now = self.now # service tests
 
@@ -636,17 +761,9 @@ class AuthTktCookieHelper(object):
 
         if self.timeout and ( (timestamp + self.timeout) < now ):
             # the auth_tkt data has expired
+            self._verified.pop(key, None)
             return None
 
-        userid_typename = 'userid_type:'
-        user_data_info = user_data.split('|')
-        for datum in filter(None, user_data_info):
-            if datum.startswith(userid_typename):
-                userid_type = datum[len(userid_typename):]
-                decoder = self.userid_type_decoders.get(userid_type)
-                if decoder:
-                    userid = decoder(userid)
-
         reissue = self.reissue_time is not None
 
         if reissue and not hasattr(request, '_authtkt_reissued'):
@@ -773,14 +890,22 @@ class SessionAuthenticationPolicy(CallbackAuthenticationPolicy):
         Pyramid debug logger about the results of various authentication
         steps.  The output from debugging is useful for reporting to maillist
         or IRC channels when asking for support.
+
+    ``principal_cache``
+
+        Default: ``None``.  A :class:`pyramid.authentication.PrincipalCache`
+        which remembers the groups ``callback`` returns for each userid
+        across requests.  Optional.
        
     """
 
-    def __init__(self, prefix='auth.', callback=None, debug=False):
+    def __init__(self, prefix='auth.', callback=None, debug=False,
+                 principal_cache=None):
         self.callback = callback
         self.prefix = prefix or ''
         self.userid_key = prefix + 'userid'
         self.debug = debug
+        self.principal_cache = principal_cache
 
     def remember(self, request, principal, **kw):
         """ Store a principal in the session."""
@@ -1,13 +1,17 @@
+import weakref
+
 from zope.interface import implementer
 
 from pyramid.interfaces import IAuthorizationPolicy
 
+from pyramid.compat import is_nonstr_iter
 from pyramid.location import lineage
 from pyramid.security import ACLAllowed
 from pyramid.security import ACLDenied
 from pyramid.security import Allow
 from pyramid.security import Deny
 from pyramid.security import Everyone
+from pyramid.security import AllPermissionsList
 
 @implementer(IAuthorizationPolicy)
 class ACLAuthorizationPolicy(object):
@@ -55,19 +59,39 @@ class ACLAuthorizationPolicy(object):
       walking process that matches the ``permission``, the allow list
       is cleared for all principals encountered in previous ACLs.  The
       walking process ends after we've processed the any ACL directly
-      attached to ``context``; a set of principals is returned.
+      attached to ``context``; a set of principals is returned.  The set
+      computed for each resource with an ACL is remembered by the policy
+      for that ACL and the set computed above it, so resources sharing
+      ancestors share that work; changing an ACL, or moving a resource,
+      invalidates it.  The policy does not keep resources alive.
 
     Objects of this class implement the
     :class:`pyramid.interfaces.IAuthorizationPolicy` interface.
     """
 
+    # the memos are created on first use rather than in a constructor, so
+    # that subclasses which don't call ours still get them
+
+    @property
+    def _compiled_acls(self):
+        # id(acl) -> (acl, snapshot, compiled ACL or None or _marker); ACLs
+        # cannot be weakly referenced, but they do not refer to resources
+        return self.__dict__.setdefault('_compiled_acls', {})
+
+    @property
+    def _allowed_principals(self):
+        # id(location) -> (weak reference to location,
+        #                  {permission: (acl, set allowed above, snapshot,
+        #                                set allowed here)})
+        return self.__dict__.setdefault('_allowed_principals', {})
+
     def permits(self, context, principals, permission):
         """ Return an instance of
         :class:`pyramid.security.ACLAllowed` instance if the policy
         permits access, return an instance of
         :class:`pyramid.security.ACLDenied` if not."""
 
-        acl = '<No ACL found on any object in resource lineage>'
+        acl = _no_acl
         
         for location in lineage(context):
             try:
@@ -75,18 +99,16 @@ class ACLAuthorizationPolicy(object):
             except AttributeError:
                 continue
 
-            for ace in acl:
-                ace_action, ace_principal, ace_permissions = ace
-                if ace_principal in principals:
-                    if not hasattr(ace_permissions, '__iter__'):
-                        ace_permissions = [ace_permissions]
-                    if permission in ace_permissions:
-                        if ace_action == Allow:
-                            return ACLAllowed(ace, acl, permission,
-                                              principals, location)
-                        else:
-                            return ACLDenied(ace, acl, permission,
-                                             principals, location)
+            match = _first_match(acl, principals, permission,
+                                 self._compiled_acls)
+            if match is not None:
+                ace_action, ace = match
+                if ace_action == Allow:
+                    return ACLAllowed(ace, acl, permission,
+                                      principals, location)
+                else:
+                    return ACLDenied(ace, acl, permission,
+                                     principals, location)
 
         # default deny (if no ACL in lineage at all, or if none of the
         # principals were mentioned in any ACE we found)
@@ -97,12 +119,38 @@ class ACLAuthorizationPolicy(object):
             principals,
             context)
 
+    def permits_many(self, contexts, principals, permissions):
+        """ Return a list holding, for each of ``contexts`` in turn, a
+        dictionary mapping each of ``permissions`` to the result
+        :meth:`permits` would return for that context and permission.  The
+        ACL of a resource which is in the lineage of several of the
+        contexts is consulted once per permission rather than once per
+        context."""
+        permissions = list(permissions)
+        states = {}
+        results = []
+        for context in contexts:
+            answers = {}
+            for permission in permissions:
+                found = states.setdefault(permission, {})
+                result, acl = _lineage_state(context, principals,
+                                             permission, found,
+                                             self._compiled_acls)
+                if result is None:
+                    # default deny
+                    result = ACLDenied('<default deny>', acl, permission,
+                                       principals, context)
+                answers[permission] = result
+            results.append(answers)
+        return results
+
     def principals_allowed_by_permission(self, context, permission):
         """ Return the set of principals explicitly granted the
         permission named ``permission`` according to the ACL directly
         attached to the ``context`` as well as inherited ACLs based on
         the :term:`lineage`."""
-        allowed = set()
+        memo = self._allowed_principals
+        allowed = _nobody
 
         for location in reversed(list(lineage(context))):
             # NB: we're walking *up* the object graph from the root
@@ -111,25 +159,283 @@ class ACLAuthorizationPolicy(object):
             except AttributeError:
                 continue
 
-            allowed_here = set()
-            denied_here = set()
-            
-            for ace_action, ace_principal, ace_permissions in acl:
-                if not hasattr(ace_permissions, '__iter__'):
-                    ace_permissions = [ace_permissions]
-                if (ace_action == Allow) and (permission in ace_permissions):
-                    if not ace_principal in denied_here:
-                        allowed_here.add(ace_principal)
-                if (ace_action == Deny) and (permission in ace_permissions):
-                        denied_here.add(ace_principal)
-                        if ace_principal == Everyone:
-                            # clear the entire allowed set, as we've hit a
-                            # deny of Everyone ala (Deny, Everyone, ALL)
-                            allowed = set()
-                            break
-                        elif ace_principal in allowed:
-                            allowed.remove(ace_principal)
-
-            allowed.update(allowed_here)
-
-        return allowed
+            # the set allowed here depends only on the set allowed above
+            # and on this ACL, so it is remembered for both
+            entry = memo.get(id(location))
+            if entry is not None and entry[0]() is location:
+                try:
+                    here = entry[1].get(permission)
+                except TypeError: # unhashable permission
+                    here = None
+                if (here is not None and here[0] is acl and
+                    here[1] is allowed and
+                    (here[2] is None or here[2] == acl)):
+                    allowed = here[3]
+                    continue
+
+            above = allowed
+            allowed = _allowed_here(above, acl, permission)
+            if isinstance(acl, (list, tuple)):
+                _remember_allowed(memo, location, permission, acl, above,
+                                  allowed)
+
+        return set(allowed)
+
+_no_acl = '<No ACL found on any object in resource lineage>'
+_nobody = frozenset()
+_marker = object()
+_containers = (list, tuple, set, frozenset)
+
+# the memos of a policy are cleared rather than trimmed when full, like the
+# quoted segment memo of pyramid.urldispatch
+_compiled_acls_max = 1000
+_allowed_principals_max = 10000
+
+# scanning an ACL this short is cheaper than consulting its compiled form
+_short_acl = 8
+
+class _CompiledACL(object):
+    """ An ACL indexed by permission, then by principal. """
+    def __init__(self, acl):
+        self.index = {}
+        self.wildcards = []
+        self.tables = {}
+        for position, (action, principal, permissions) in enumerate(acl):
+            hash(principal)
+            entry = (position, action, principal)
+            if isinstance(permissions, AllPermissionsList):
+                self.wildcards.append(entry)
+                continue
+            if not is_nonstr_iter(permissions):
+                permissions = (permissions,)
+            elif not isinstance(permissions, _containers):
+                # an arbitrary container may answer ``in`` any way it likes
+                raise TypeError(permissions)
+            for permission in set(permissions):
+                self.index.setdefault(permission, []).append(entry)
+
+    def table(self, permission):
+        """ Return a dictionary mapping each principal named with
+        ``permission`` to the ``(position, action)`` of the first such
+        ACE."""
+        try:
+            return self.tables[permission]
+        except KeyError:
+            pass
+        entries = self.index.get(permission, [])
+        if self.wildcards:
+            entries = sorted(entries + self.wildcards)
+        table = {}
+        for position, action, principal in entries:
+            if principal not in table:
+                table[principal] = (position, action)
+        if len(self.tables) < 100:
+            self.tables[permission] = table
+        return table
+
+    def first(self, principals, permission):
+        """ Return the ``(position, action)`` of the first ACE naming
+        ``permission`` and one of ``principals``, ``None`` if there is
+        none, or ``_marker`` if ``permission`` is unhashable."""
+        try:
+            table = self.table(permission)
+        except TypeError:
+            return _marker
+        first = None
+        if isinstance(principals, _containers):
+            try:
+                for principal in principals:
+                    found = table.get(principal)
+                    if found is not None and (first is None or found < first):
+                        first = found
+                return first
+            except TypeError: # an unhashable principal
+                first = None
+        for principal, found in table.items():
+            if principal in principals and (first is None or found < first):
+                first = found
+        return first
+
+def _snapshot(acl):
+    """ Return a copy of ``acl`` which compares equal to it until it, or a
+    permission list or set in one of its ACEs, is changed; ``None`` if
+    ``acl`` cannot change."""
+    snapshot = []
+    mutable = not isinstance(acl, tuple)
+    for ace in acl:
+        action, principal, permissions = ace
+        if isinstance(permissions, list):
+            permissions = list(permissions)
+        elif isinstance(permissions, set):
+            permissions = set(permissions)
+        elif not isinstance(ace, list):
+            snapshot.append(ace)
+            continue
+        mutable = True
+        if isinstance(ace, list):
+            snapshot.append([action, principal, permissions])
+        else:
+            snapshot.append((action, principal, permissions))
+    if not mutable:
+        return None
+    if isinstance(acl, tuple):
+        return tuple(snapshot)
+    return snapshot
+
+def _compile(acl, compiled_acls):
+    """ Return the :class:`_CompiledACL` for ``acl`` cached in
+    ``compiled_acls`` or ``None``, in which case the caller scans the ACL
+    itself.  An ACL is compiled the second time it is seen, so an ACL built
+    anew for every check costs no more than it used to."""
+    key = id(acl)
+    cached = compiled_acls.get(key)
+    if (cached is not None and cached[0] is acl and
+        (cached[1] is None or cached[1] == acl)):
+        compiled = cached[2]
+        if compiled is _marker:
+            try:
+                compiled = _CompiledACL(acl)
+            except (TypeError, ValueError):
+                compiled = None
+            compiled_acls[key] = (acl, cached[1], compiled)
+        return compiled
+    try:
+        snapshot = _snapshot(acl)
+    except (TypeError, ValueError):
+        return None
+    if len(compiled_acls) >= _compiled_acls_max:
+        compiled_acls.clear()
+    # the entry keeps the ACL alive, so its id cannot be reused meanwhile
+    compiled_acls[key] = (acl, snapshot, _marker)
+    return None
+
+def _first_match(acl, principals, permission, compiled_acls):
+    """ Return ``(action, ace)`` for the first ACE in ``acl`` which
+    names ``permission`` and one of ``principals``, or ``None``.  Compiled
+    ACLs are cached in ``compiled_acls``."""
+    # a list or tuple; anything else might be an iterator we can only
+    # consume once
+    if isinstance(acl, (list, tuple)) and len(acl) > _short_acl:
+        compiled = _compile(acl, compiled_acls)
+    else:
+        compiled = None
+    if compiled is not None:
+        first = compiled.first(principals, permission)
+        if first is None:
+            return None
+        if first is not _marker:
+            position, ace_action = first
+            return ace_action, acl[position]
+
+    for ace in acl:
+        ace_action, ace_principal, ace_permissions = ace
+        if ace_principal in principals:
+            if not is_nonstr_iter(ace_permissions):
+                ace_permissions = [ace_permissions]
+            if permission in ace_permissions:
+                return ace_action, ace
+    return None
+
+def _lineage_state(context, principals, permission, found, compiled_acls):
+    """ Return ``(result, acl)`` for ``context`` and ``permission``: the
+    :class:`pyramid.security.ACLAllowed` or
+    :class:`pyramid.security.ACLDenied` of the first matching ACE in its
+    lineage and that ACE's ACL, or ``None`` and the ACL a default deny
+    reports.  ``found`` maps ``id(location)`` to ``(location, result,
+    acl)`` for each location resolved so far, and is updated.  Compiled
+    ACLs are cached in ``compiled_acls``."""
+    path = []
+    state = (None, _no_acl)
+    location = context
+    while location is not None:
+        resolved = found.get(id(location))
+        if resolved is not None and resolved[0] is location:
+            state = resolved[1:]
+            break
+        try:
+            acl = location.__acl__
+        except AttributeError:
+            acl = _marker
+        else:
+            match = _first_match(acl, principals, permission,
+                                 compiled_acls)
+            if match is not None:
+                ace_action, ace = match
+                if ace_action == Allow:
+                    result = ACLAllowed(ace, acl, permission, principals,
+                                        location)
+                else:
+                    result = ACLDenied(ace, acl, permission, principals,
+                                       location)
+                state = (result, acl)
+                found[id(location)] = (location, result, acl)
+                break
+        path.append((location, acl))
+        try:
+            location = location.__parent__
+        except AttributeError:
+            location = None
+
+    # resolve the locations passed on the way up from the top down; a
+    # default deny reports the ACL nearest the root, as permits does
+    for location, acl in reversed(path):
+        result, state_acl = state
+        if result is None and state_acl is _no_acl and acl is not _marker:
+            state = (None, acl)
+        found[id(location)] = (location,) + state
+    return state
+
+def _remember_allowed(memo, location, permission, acl, above, allowed):
+    """ Remember in ``memo`` the frozenset ``allowed`` of principals granted
+    ``permission`` at ``location`` by ``acl`` given the set ``above``."""
+    key = id(location)
+    entry = memo.get(key)
+    if entry is None or entry[0]() is not location:
+        if len(memo) >= _allowed_principals_max:
+            memo.clear()
+        try:
+            ref = weakref.ref(location, _forgetter(memo, key))
+        except TypeError: # cannot be weakly referenced
+            return
+        entry = memo[key] = (ref, {})
+    permissions = entry[1]
+    try:
+        if permission in permissions or len(permissions) < 100:
+            permissions[permission] = (acl, above, _snapshot(acl), allowed)
+    except TypeError: # unhashable permission
+        pass
+
+def _forgetter(memo, key):
+    # the callback of the weak reference to the location remembered in
+    # ``memo`` at ``key``, which forgets it once it is collected
+    def forget(ref):
+        entry = memo.get(key)
+        if entry is not None and entry[0] is ref:
+            memo.pop(key, None)
+    return forget
+
+def _allowed_here(above, acl, permission):
+    """ Return the frozenset of principals granted ``permission`` by ``acl``
+    given the set ``above`` granted it by the ACLs above."""
+    allowed = set(above)
+    allowed_here = set()
+    denied_here = set()
+
+    for ace_action, ace_principal, ace_permissions in acl:
+        if not is_nonstr_iter(ace_permissions):
+            ace_permissions = [ace_permissions]
+        if (ace_action == Allow) and (permission in ace_permissions):
+            if not ace_principal in denied_here:
+                allowed_here.add(ace_principal)
+        if (ace_action == Deny) and (permission in ace_permissions):
+            denied_here.add(ace_principal)
+            if ace_principal == Everyone:
+                # clear the entire allowed set, as we've hit a
+                # deny of Everyone ala (Deny, Everyone, ALL)
+                allowed = set()
+                break
+            elif ace_principal in allowed:
+                allowed.remove(ace_principal)
+
+    allowed.update(allowed_here)
+    return frozenset(allowed)
@@ -28,6 +28,7 @@ from pyramid.registry import Registry
 from pyramid.router import Router
 from pyramid.settings import aslist
 from pyramid.threadlocal import manager
+from pyramid.traversal import ResourcePathCache
 from pyramid.util import DottedNameResolver
 from pyramid.util import WeakOrderedSet
 
@@ -290,6 +291,9 @@ class Configurator(
         self._set_settings(settings)
         self._register_response_adapters()
 
+        if registry.settings.get('resource_path_cache'):
+            registry.resource_path_cache = ResourcePathCache()
+
         if isinstance(debug_logger, string_types):
             debug_logger = logging.getLogger(debug_logger)
 
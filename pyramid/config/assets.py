@@ -1,6 +1,7 @@
 import pkg_resources
 import sys
 
+from repoze.lru import LRUCache
 from zope.interface import implementer
 
 from pyramid.interfaces import IPackageOverrides
@@ -17,8 +18,16 @@ class OverrideProvider(pkg_resources.DefaultProvider):
 
     def _get_overrides(self):
         reg = get_current_registry()
-        overrides = reg.queryUtility(IPackageOverrides, self.module_name)
-        return overrides
+        try:
+            memo = reg._package_overrides
+        except AttributeError: # not a pyramid registry
+            return reg.queryUtility(IPackageOverrides, self.module_name)
+        try:
+            return memo[self.module_name]
+        except KeyError:
+            overrides = reg.queryUtility(IPackageOverrides, self.module_name)
+            memo[self.module_name] = overrides
+            return overrides
     
     def get_resource_filename(self, manager, resource_name):
         """ Return a true filesystem path for resource_name,
@@ -81,7 +90,14 @@ class OverrideProvider(pkg_resources.DefaultProvider):
             self, resource_name)
         
 @implementer(IPackageOverrides)
-class PackageOverrides:
+class PackageOverrides(object):
+    # incremented whenever an override is inserted into any instance, so
+    # that resolutions of asset paths may be cached until then
+    generation = 0
+
+    # the number of resource names whose search paths are memoized
+    search_cache_size = 1000
+
     # pkg_resources arg in kw args below for testing
     def __init__(self, package, pkg_resources=pkg_resources):
         if hasattr(package, '__loader__') and not isinstance(package.__loader__,
@@ -106,20 +122,79 @@ class PackageOverrides:
         self.overrides = []
         self.overridden_package_name = package.__name__
 
+    def _get_overrides(self):
+        return self._overrides
+
+    def _set_overrides(self, overrides):
+        self._overrides = overrides
+        self._reset()
+
+    # most recently inserted first
+    overrides = property(_get_overrides, _set_overrides)
+
+    def _reset(self):
+        self._index = None
+        self._searched = LRUCache(self.search_cache_size)
+
     def insert(self, path, package, prefix):
         if not path or path.endswith('/'):
             override = DirectoryOverride(path, package, prefix)
         else:
             override = FileOverride(path, package, prefix)
         self.overrides.insert(0, override)
+        self._reset()
+        PackageOverrides.generation += 1
         return override
 
     def search_path(self, resource_name):
-        for override in self.overrides:
-            o = override(resource_name)
-            if o is not None:
-                package, name = o
-                yield package, name
+        found = self._searched.get(resource_name)
+        if found is None:
+            found = tuple(self._search_path(resource_name))
+            self._searched.put(resource_name, found)
+        return iter(found)
+
+    def _search_path(self, resource_name):
+        index = self._index
+        if index is None:
+            index = self._index = self._build_index()
+        if not index:
+            # some overrides can't be indexed
+            for override in self.overrides:
+                o = override(resource_name)
+                if o is not None:
+                    package, name = o
+                    yield package, name
+            return
+        files, directories = index
+        # the file overrides of the name itself and the directory overrides
+        # of each of its leading directories, in override order
+        candidates = list(files.get(resource_name, ()))
+        candidates.extend(directories.get('', ()))
+        start = 0
+        while True:
+            end = resource_name.find('/', start) + 1
+            if not end:
+                break
+            candidates.extend(directories.get(resource_name[:end], ()))
+            start = end
+        candidates.sort()
+        for rank, override in candidates:
+            yield override(resource_name)
+
+    def _build_index(self):
+        files = {}
+        directories = {}
+        for rank, override in enumerate(self.overrides):
+            cls = override.__class__
+            if cls is FileOverride:
+                files.setdefault(override.path, []).append((rank, override))
+            elif cls is DirectoryOverride and (
+                not override.path or override.path.endswith('/')):
+                directories.setdefault(override.path, []).append(
+                    (rank, override))
+            else:
+                return False
+        return files, directories
 
     def get_filename(self, resource_name):
         for package, rname in self.search_path(resource_name):
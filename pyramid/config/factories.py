@@ -4,6 +4,7 @@ from pyramid.interfaces import IDefaultRootFactory
 from pyramid.interfaces import IRequestFactory
 from pyramid.interfaces import IRootFactory
 from pyramid.interfaces import ISessionFactory
+from pyramid.interfaces import ITraversalCache
 
 from pyramid.traversal import DefaultRootFactory
 
@@ -69,3 +70,18 @@ class FactoriesConfiguratorMixin(object):
             self.registry.registerUtility(factory, IRequestFactory)
         self.action(IRequestFactory, register)
 
+    @action_method
+    def set_traversal_cache(self, cache):
+        """ Configure the application with a :term:`traversal cache`.  The
+        ``cache`` argument must be an object implementing
+        :class:`pyramid.interfaces.ITraversalCache` (such as an instance of
+        :class:`pyramid.traversal.TraversalCache`) or a :term:`dotted Python
+        name` to such an object.  The default traverser will then reuse the
+        cached resources it finds for the longest cached prefix of each
+        path it traverses, and cache the resources it reaches which provide
+        :class:`pyramid.interfaces.ICacheableResource`.
+        """
+        cache = self.maybe_dotted(cache)
+        def register():
+            self.registry.registerUtility(cache, ITraversalCache)
+        self.action(ITraversalCache, register)
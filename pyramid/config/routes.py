@@ -409,7 +409,10 @@ class RoutesConfiguratorMixin(object):
         this configurator's :term:`registry`."""
         mapper = self.registry.queryUtility(IRoutesMapper)
         if mapper is None:
-            mapper = RoutesMapper()
+            settings = self.registry.settings or {}
+            mapper = RoutesMapper(
+                compiled=settings.get('compiled_routes', False),
+                cache_size=settings.get('route_match_cache_size'))
             self.registry.registerUtility(mapper, IRoutesMapper)
         return mapper
 
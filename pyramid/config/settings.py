@@ -3,6 +3,7 @@ import warnings
 
 from zope.interface import implementer
 
+from pyramid.exceptions import ConfigurationError
 from pyramid.interfaces import ISettings
 
 from pyramid.settings import asbool
@@ -117,6 +118,29 @@ class Settings(dict):
                                              config_prevent_http_cache)
         eff_prevent_http_cache = asbool(eget('PYRAMID_PREVENT_HTTP_CACHE',
                                              config_prevent_http_cache))
+        config_compiled_routes = self.get('compiled_routes', '')
+        config_compiled_routes = self.get('pyramid.compiled_routes',
+                                          config_compiled_routes)
+        eff_compiled_routes = asbool(eget('PYRAMID_COMPILED_ROUTES',
+                                          config_compiled_routes))
+        config_path_cache = self.get('resource_path_cache', '')
+        config_path_cache = self.get('pyramid.resource_path_cache',
+                                     config_path_cache)
+        eff_path_cache = asbool(eget('PYRAMID_RESOURCE_PATH_CACHE',
+                                     config_path_cache))
+        config_route_cache = self.get('route_match_cache_size', 0)
+        config_route_cache = self.get('pyramid.route_match_cache_size',
+                                      config_route_cache)
+        config_route_cache = eget('PYRAMID_ROUTE_MATCH_CACHE_SIZE',
+                                  config_route_cache)
+        try:
+            eff_route_cache = int(config_route_cache)
+        except (TypeError, ValueError):
+            eff_route_cache = -1
+        if eff_route_cache < 0:
+            raise ConfigurationError(
+                'route_match_cache_size must be a non-negative integer, '
+                'not %r' % (config_route_cache,))
 
         update = {
             'debug_authorization': eff_debug_all or eff_debug_auth,
@@ -128,6 +152,9 @@ class Settings(dict):
             'reload_assets':eff_reload_all or eff_reload_assets,
             'default_locale_name':eff_locale_name,
             'prevent_http_cache':eff_prevent_http_cache,
+            'compiled_routes':eff_compiled_routes,
+            'route_match_cache_size':eff_route_cache,
+            'resource_path_cache':eff_path_cache,
 
             'pyramid.debug_authorization': eff_debug_all or eff_debug_auth,
             'pyramid.debug_notfound': eff_debug_all or eff_debug_notfound,
@@ -138,6 +165,9 @@ class Settings(dict):
             'pyramid.reload_assets':eff_reload_all or eff_reload_assets,
             'pyramid.default_locale_name':eff_locale_name,
             'pyramid.prevent_http_cache':eff_prevent_http_cache,
+            'pyramid.compiled_routes':eff_compiled_routes,
+            'pyramid.route_match_cache_size':eff_route_cache,
+            'pyramid.resource_path_cache':eff_path_cache,
             }
 
         self.update(update)
@@ -34,6 +34,10 @@ from pyramid.exceptions import PredicateMismatch
 from pyramid.httpexceptions import HTTPForbidden
 from pyramid.httpexceptions import HTTPNotFound
 from pyramid.security import NO_PERMISSION_REQUIRED
+from pyramid.security import _effective_principals
+from pyramid.security import _permits
+from pyramid.static import build_manifest
+from pyramid.static import load_manifest
 from pyramid.static import static_view
 from pyramid.threadlocal import get_current_registry
 from pyramid.view import render_view_to_response
@@ -181,9 +185,8 @@ class ViewDeriver(object):
         wrapped_view = view
         if self.authn_policy and self.authz_policy and (permission is not None):
             def _permitted(context, request):
-                principals = self.authn_policy.effective_principals(request)
-                return self.authz_policy.permits(context, principals,
-                                                 permission)
+                return _permits(request, self.authn_policy,
+                                self.authz_policy, context, permission)
             def _secured_view(context, request):
                 result = _permitted(context, request)
                 if result:
@@ -213,8 +216,8 @@ class ViewDeriver(object):
                     if permission is None:
                         msg = 'Allowed (no permission registered)'
                     else:
-                        principals = self.authn_policy.effective_principals(
-                            request)
+                        principals = _effective_principals(
+                            request, self.authn_policy)
                         msg = str(self.authz_policy.permits(context, principals,
                                                             permission))
                 else:
@@ -1314,6 +1317,52 @@ class ViewsConfiguratorMixin(object):
         prefix*.  By default, this argument is ``None``, meaning that no
         particular Expires or Cache-Control headers are set in the response.
 
+        The ``block_size`` keyword argument is the size (in bytes) of the
+        chunks in which static assets are read and returned when the WSGI
+        server does not provide ``wsgi.file_wrapper``.  By default, it is
+        262144 (256K).  Like ``cache_max_age``, it has no effect when the
+        ``name`` is a *url prefix*.
+
+        The ``file_cache`` keyword argument may be a
+        :class:`pyramid.static.StaticFileCache` instance, in which small
+        static assets will be kept in memory and served without touching the
+        filesystem.  By default, no such cache is used.  It has no effect
+        when the ``name`` is a *url prefix*.
+
+        If the ``precompressed`` keyword argument is ``True``, a request for
+        a static asset which has a gzip-compressed sibling (e.g.
+        ``app.js.gz`` next to ``app.js``) is served that sibling with a
+        ``Content-Encoding: gzip`` header when the client accepts it.  See
+        :func:`pyramid.static.precompress`.  By default, it is ``False``.
+        It has no effect when the ``name`` is a *url prefix*.
+
+        The ``max_ranges`` keyword argument is the greatest number of byte
+        ranges the static view will serve in answer to a single ``Range``
+        request (as a ``multipart/byteranges`` response); the whole asset is
+        served if more are requested.  By default, it is ``1``.  If it is
+        ``0``, ``Range`` headers are ignored.  It has no effect when the
+        ``name`` is a *url prefix*.
+
+        The ``resolve_cache_size`` keyword argument is the number of request
+        paths whose resolution to a file (through any :term:`asset override`
+        declarations) is cached by a static view serving a package-relative
+        ``path``; paths which resolve to no file are not cached.  By
+        default, it is ``0``, which disables the cache.  It has no effect
+        when the ``name`` is a *url prefix*.
+
+        The ``cachebust`` keyword argument turns on cache busting: URLs
+        generated by :meth:`pyramid.request.Request.static_url` for the
+        static assets embed a hash of each asset's contents, and the static
+        view serves such URLs with a ``Cache-Control`` header allowing
+        clients to cache them for a year without revalidating them.  If it
+        is ``True``, the hashes are computed from the files beneath ``path``
+        when ``add_static_view`` is called.  It may also be the filename or
+        :term:`asset specification` of a JSON manifest file (see
+        :func:`pyramid.static.load_manifest`) or a
+        :class:`pyramid.static.StaticManifest` instance.  When the ``name``
+        is a *url prefix*, the external webserver must serve the
+        content-hashed paths itself.  By default, URLs are not cache-busted.
+
         The ``permission`` keyword argument is used to specify the
         :term:`permission` required by a user to execute the static view.  By
         default, it is the string
@@ -1394,6 +1443,9 @@ class ViewsConfiguratorMixin(object):
         See :ref:`static_assets_section` for more information.
         """
         spec = self._make_spec(path)
+        cachebust = kw.get('cachebust')
+        if isinstance(cachebust, string_types):
+            kw['cachebust'] = self._make_spec(cachebust)
         info = self.registry.queryUtility(IStaticURLInfo)
         if info is None:
             info = StaticURLInfo()
@@ -1426,9 +1478,12 @@ class StaticURLInfo(object):
             registry = request.registry
         except AttributeError: # bw compat (for tests)
             registry = get_current_registry()
-        for (url, spec, route_name) in self._get_registrations(registry):
+        for (url, spec, route_name, manifest) in self._get_registrations(
+            registry):
             if path.startswith(spec):
                 subpath = path[len(spec):]
+                if manifest is not None:
+                    subpath = manifest.busted_path(subpath)
                 if url is None:
                     kw['subpath'] = subpath
                     return request.route_url(route_name, **kw)
@@ -1456,6 +1511,14 @@ class StaticURLInfo(object):
             # make sure it ends with a slash
             name = name + '/'
 
+        cachebust = extra.pop('cachebust', None)
+        if cachebust is True:
+            manifest = build_manifest(spec)
+        elif isinstance(cachebust, string_types):
+            manifest = load_manifest(cachebust)
+        else:
+            manifest = cachebust or None
+
         if url_parse(name)[0]:
             # it's a URL
             # url, spec, route_name
@@ -1465,9 +1528,19 @@ class StaticURLInfo(object):
             # it's a view name
             url = None
             cache_max_age = extra.pop('cache_max_age', None)
+            block_size = extra.pop('block_size', None)
+            file_cache = extra.pop('file_cache', None)
+            precompressed = extra.pop('precompressed', False)
+            max_ranges = extra.pop('max_ranges', 1)
+            resolve_cache_size = extra.pop('resolve_cache_size', 0)
             # create a view
             view = static_view(spec, cache_max_age=cache_max_age,
-                               use_subpath=True)
+                               use_subpath=True, block_size=block_size,
+                               file_cache=file_cache,
+                               precompressed=precompressed,
+                               manifest=manifest,
+                               max_ranges=max_ranges,
+                               resolve_cache_size=resolve_cache_size)
 
             # Mutate extra to allow factory, etc to be passed through here.
             # Treat permission specially because we'd like to default to
@@ -1519,8 +1592,8 @@ class StaticURLInfo(object):
                 idx = names.index(name)
                 registrations.pop(idx)
 
-            # url, spec, route_name
-            registrations.append((url, spec, route_name))
+            # url, spec, route_name, manifest
+            registrations.append((url, spec, route_name, manifest))
 
         config.action(None, callable=register)
 
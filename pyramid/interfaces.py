@@ -438,7 +438,13 @@ class IAuthenticationPolicy(Interface):
         current user on subsequent requests. """
 
 class IAuthorizationPolicy(Interface):
-    """ An object representing a Pyramid authorization policy. """
+    """ An object representing a Pyramid authorization policy.
+
+    A policy may also provide a ``permits_many(contexts, principals,
+    permissions)`` method returning a list holding, for each context in
+    turn, a dictionary mapping each permission to the result of
+    ``permits``; :func:`pyramid.security.has_permissions` uses it when it
+    exists and calls ``permits`` repeatedly when it doesn't."""
     def permits(context, principals, permission):
         """ Return ``True`` if any of the ``principals`` is allowed the
         ``permission`` in the current ``context``, else return ``False``
@@ -599,6 +605,33 @@ class ITraverser(Interface):
 
 ITraverserFactory = ITraverser # b / c for 1.0 code
 
+class ICacheableResource(Interface):
+    """ Marker interface for a :term:`resource` which may be reused by a
+    :term:`traversal cache` for later requests for the same path.  A
+    resource providing this interface asserts that it (and the result of
+    its ``__getitem__``, unless that also provides this interface) does not
+    depend on the request being served.  A :term:`root` providing this
+    interface asserts that it is shared by every request; the traversal
+    cache is not used for other roots."""
+
+class ITraversalCache(Interface):
+    """ A cache of the resources found by
+    :class:`pyramid.traversal.ResourceTreeTraverser`, registered as a
+    utility.  ``path`` arguments are tuples of traversed path segments,
+    as produced by :func:`pyramid.traversal.traversal_path_info`."""
+    def get(root, path):
+        """ Return the tuple of resources traversed to reach ``path`` from
+        ``root`` (one per segment, excluding ``root``) or ``None`` if there
+        is no such cached entry."""
+
+    def set(root, path, resources):
+        """ Cache the tuple of ``resources`` traversed to reach ``path`` from
+        ``root``."""
+
+    def invalidate(path=None):
+        """ Discard the entries for ``path`` and every path beneath it, or
+        every entry if ``path`` is ``None``."""
+
 class IRendererFactory(Interface):
     def __call__(info):
         """ Return an object that implements ``IRenderer``.  ``info`` is an
@@ -843,6 +876,24 @@ class ISession(IDict):
         returned.
         """
 
+class ISessionStore(Interface):
+    """ A storage backend used by a server-side session factory (see
+    :func:`pyramid.session.ServerSideSessionFactoryConfig`).  Session ids
+    are native strings; stored values are pickleable objects."""
+
+    def load(session_id):
+        """ Return the value previously saved under ``session_id``, or
+        ``None`` if there is no such value or it has expired."""
+
+    def save(session_id, value, timeout):
+        """ Save ``value`` under ``session_id``.  The store may discard
+        the value once ``timeout`` seconds have passed without another
+        ``save``."""
+
+    def delete(session_id):
+        """ Remove any value saved under ``session_id``.  Removing a
+        nonexistent value is not an error."""
+
 class IRendererInfo(Interface):
     """ An object implementing this interface is passed to every
     :term:`renderer factory` constructor as its only argument (conventionally
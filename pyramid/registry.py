@@ -27,11 +27,31 @@ class Registry(Components, dict):
     # to notify them
     has_listeners = False
     _settings = None
+    # a pyramid.traversal.ResourcePathCache when the resource_path_cache
+    # setting is true
+    resource_path_cache = None
+
+    def __init__(self, *arg, **kw):
+        # IPackageOverrides utilities by package name, memoized by
+        # pyramid.config.assets.OverrideProvider until the next utility
+        # registration
+        self._package_overrides = {}
+        Components.__init__(self, *arg, **kw)
 
     def __nonzero__(self):
         # defeat bool determination via dict.__len__
         return True
 
+    def registerUtility(self, *arg, **kw):
+        result = Components.registerUtility(self, *arg, **kw)
+        self._package_overrides = {}
+        return result
+
+    def unregisterUtility(self, *arg, **kw):
+        result = Components.unregisterUtility(self, *arg, **kw)
+        self._package_overrides = {}
+        return result
+
     def registerSubscriptionAdapter(self, *arg, **kw):
         result = Components.registerSubscriptionAdapter(self, *arg, **kw)
         self.has_listeners = True
@@ -320,6 +320,29 @@ class Request(BaseRequest, DeprecatedRequestMethodsMixin, URLMethodsMixin,
     matchdict = None
     matched_route = None
 
+    @property
+    def application_url(self):
+        """ The URL including ``SCRIPT_NAME`` (no ``PATH_INFO`` or query
+        string).  Computing this is comparatively expensive, so the value
+        is remembered on the request, and recomputed only when one of the
+        WSGI environment values it is derived from changes.  It is used as
+        the prefix of URLs generated by :meth:`route_url`,
+        :meth:`resource_url`, :meth:`static_url` and
+        :meth:`current_route_url`."""
+        environ = self.environ
+        key = (environ.get('wsgi.url_scheme'),
+               environ.get('HTTP_HOST'),
+               environ.get('SERVER_NAME'),
+               environ.get('SERVER_PORT'),
+               environ.get('SCRIPT_NAME'),
+               environ.get('webob.url_encoding'))
+        cached = self.__dict__.get('_application_url')
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        app_url = BaseRequest.application_url.fget(self)
+        self.__dict__['_application_url'] = (key, app_url)
+        return app_url
+
     @reify
     def tmpl_context(self):
         """ Template context (for Pylons apps) """
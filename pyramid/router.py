@@ -115,16 +115,11 @@ class Router(object):
             traverser = ResourceTreeTraverser(root)
         tdict = traverser(request)
 
-        context, view_name, subpath, traversed, vroot, vroot_path = (
-            tdict['context'],
-            tdict['view_name'],
-            tdict['subpath'],
-            tdict['traversed'],
-            tdict['virtual_root'],
-            tdict['virtual_root_path']
-            )
-
+        # the traverser's dictionary becomes the request's attributes; only
+        # the values needed to find a view are unpacked from it
         attrs.update(tdict)
+        context = attrs['context']
+        view_name = attrs['view_name']
         has_listeners and notify(ContextFound(request))
 
         # find a view callable
@@ -142,8 +137,9 @@ class Router(object):
                     'traversed: %r, root: %r, vroot: %r, '
                     'vroot_path: %r' % (
                         request.url, request.path_info, context,
-                        view_name, subpath, traversed, root, vroot,
-                        vroot_path)
+                        view_name, attrs['subpath'], attrs['traversed'],
+                        root, attrs['virtual_root'],
+                        attrs['virtual_root_path'])
                     )
                 logger and logger.debug(msg)
             else:
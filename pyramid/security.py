@@ -37,7 +37,10 @@ def has_permission(permission, context, request):
     This function delegates to the current authentication and
     authorization policies.  Return
     :data:`pyramid.security.Allowed` unconditionally if no
-    authentication policy has been configured in this application."""
+    authentication policy has been configured in this application.
+
+    The effective principals and the authorization policy's answer are
+    remembered on the request (see :ref:`security_memoization`)."""
     try:
         reg = request.registry
     except AttributeError:
@@ -50,13 +53,51 @@ def has_permission(permission, context, request):
     if authz_policy is None:
         raise ValueError('Authentication policy registered without '
                          'authorization policy') # should never happen
-    principals = authn_policy.effective_principals(request)
-    return authz_policy.permits(context, principals, permission)
+    return _permits(request, authn_policy, authz_policy, context, permission)
+
+def has_permissions(permissions, contexts, request):
+    """ Provided a sequence of permissions, a sequence of contexts
+    (:term:`resource` instances) and a request object, return a list
+    holding, for each context in turn, a dictionary mapping each
+    permission to the result :func:`pyramid.security.has_permission`
+    would return for that permission and context.  For example::
+
+      results = has_permissions(['view', 'edit'], resources, request)
+      for resource, permitted in zip(resources, results):
+          if permitted['edit']:
+              ...
+
+    The policies are looked up and the effective principals computed
+    once for the whole batch.  If the authorization policy has a
+    ``permits_many`` method (as
+    :class:`pyramid.authorization.ACLAuthorizationPolicy` does) it is
+    asked for all the answers at once; otherwise its ``permits`` method is
+    called for each permission and context.  Answers are remembered on the
+    request as they are by ``has_permission`` (see
+    :ref:`security_memoization`)."""
+    permissions = list(permissions)
+    contexts = list(contexts)
+    try:
+        reg = request.registry
+    except AttributeError:
+        reg = get_current_registry() # b/c
+    authn_policy = reg.queryUtility(IAuthenticationPolicy)
+    if authn_policy is None:
+        allowed = Allowed('No authentication policy in use.')
+        return [dict.fromkeys(permissions, allowed) for context in contexts]
+
+    authz_policy = reg.queryUtility(IAuthorizationPolicy)
+    if authz_policy is None:
+        raise ValueError('Authentication policy registered without '
+                         'authorization policy') # should never happen
+    return _permits_many(request, authn_policy, authz_policy, contexts,
+                         permissions)
 
 def authenticated_userid(request):
     """ Return the userid of the currently authenticated user or
     ``None`` if there is no :term:`authentication policy` in effect or
-    there is no currently authenticated user."""
+    there is no currently authenticated user.  The result is remembered
+    on the request (see :ref:`security_memoization`)."""
     try:
         reg = request.registry
     except AttributeError:
@@ -65,7 +106,13 @@ def authenticated_userid(request):
     policy = reg.queryUtility(IAuthenticationPolicy)
     if policy is None:
         return None
-    return policy.authenticated_userid(request)
+    memo = _authn_memo(request, policy)
+    try:
+        return memo['authenticated_userid']
+    except KeyError:
+        userid = memo['authenticated_userid'] = policy.authenticated_userid(
+            request)
+        return userid
 
 def unauthenticated_userid(request):
     """ Return an object which represents the *claimed* (not verified) user
@@ -90,7 +137,8 @@ def effective_principals(request):
     for the ``request``.  This will include the userid of the
     currently authenticated user if a user is currently
     authenticated. If no :term:`authentication policy` is in effect,
-    this will return an empty sequence."""
+    this will return an empty sequence.  The result is remembered on the
+    request (see :ref:`security_memoization`)."""
     try:
         reg = request.registry
     except AttributeError:
@@ -99,7 +147,13 @@ def effective_principals(request):
     policy = reg.queryUtility(IAuthenticationPolicy)
     if policy is None:
         return []
-    return policy.effective_principals(request)
+    principals = _effective_principals(request, policy)
+    # don't let the caller change the remembered sequence
+    if isinstance(principals, list):
+        principals = list(principals)
+    elif isinstance(principals, set):
+        principals = set(principals)
+    return principals
 
 def principals_allowed_by_permission(context, permission):
     """ Provided a ``context`` (a resource object), and a ``permission``
@@ -160,7 +214,10 @@ def remember(request, principal, **kw):
     If no :term:`authentication policy` is in use, this function will
     always return an empty sequence.  If used, the composition and
     meaning of ``**kw`` must be agreed upon by the calling code and
-    the effective authentication policy."""
+    the effective authentication policy.
+
+    Security results remembered on the request are discarded (see
+    :ref:`security_memoization`)."""
     try:
         reg = request.registry
     except AttributeError:
@@ -169,6 +226,7 @@ def remember(request, principal, **kw):
     if policy is None:
         return []
     else:
+        _forget_authn_memo(request)
         return policy.remember(request, principal, **kw)
 
 def forget(request):
@@ -185,7 +243,10 @@ def forget(request):
       return response
 
     If no :term:`authentication policy` is in use, this function will
-    always return an empty sequence."""
+    always return an empty sequence.
+
+    Security results remembered on the request are discarded (see
+    :ref:`security_memoization`)."""
     try:
         reg = request.registry
     except AttributeError:
@@ -194,8 +255,108 @@ def forget(request):
     if policy is None:
         return []
     else:
+        _forget_authn_memo(request)
         return policy.forget(request)
 
+# Results of the authentication and authorization policies are remembered
+# in the request's __dict__, in a dictionary for each authentication policy
+# so that a different policy (in tests, say) starts afresh.
+
+def _authn_memo(request, policy):
+    try:
+        memos = request.__dict__.setdefault('_authn_memo', {})
+    except AttributeError:
+        return {} # remembers nothing
+    memo = memos.get(id(policy))
+    if memo is None or memo[0] is not policy:
+        memo = memos[id(policy)] = (policy, {})
+    return memo[1]
+
+def _forget_authn_memo(request):
+    try:
+        request.__dict__.pop('_authn_memo', None)
+    except AttributeError:
+        pass
+
+def _effective_principals(request, policy, memo=None):
+    if memo is None:
+        memo = _authn_memo(request, policy)
+    try:
+        return memo['effective_principals']
+    except KeyError:
+        principals = policy.effective_principals(request)
+        if isinstance(principals, (list, tuple, set, frozenset)):
+            # an iterator could only be consumed once
+            memo['effective_principals'] = principals
+        return principals
+
+def _permits(request, authn_policy, authz_policy, context, permission):
+    """ Return ``authz_policy``'s answer for ``context``, ``permission`` and
+    the effective principals of ``request``, remembered for the request."""
+    memo = _authn_memo(request, authn_policy)
+    principals = _effective_principals(request, authn_policy, memo)
+    if 'effective_principals' not in memo:
+        return authz_policy.permits(context, principals, permission)
+    # the principals are those remembered alongside the answer
+    key = (id(context), permission)
+    try:
+        cached = memo.get(key)
+    except TypeError: # unhashable permission
+        return authz_policy.permits(context, principals, permission)
+    # the context is kept in the entry so its id cannot be reused
+    if (cached is not None and cached[0] is context
+        and cached[1] is authz_policy):
+        return cached[2]
+    result = authz_policy.permits(context, principals, permission)
+    memo[key] = (context, authz_policy, result)
+    return result
+
+def _permits_many(request, authn_policy, authz_policy, contexts,
+                  permissions):
+    """ Return ``authz_policy``'s answers for each of ``contexts`` and
+    ``permissions`` as ``has_permissions`` does, remembered for the
+    request."""
+    permits_many = getattr(authz_policy, 'permits_many', None)
+    if permits_many is None:
+        return [
+            dict([(permission, _permits(request, authn_policy, authz_policy,
+                                        context, permission))
+                  for permission in permissions])
+            for context in contexts
+            ]
+
+    memo = _authn_memo(request, authn_policy)
+    principals = _effective_principals(request, authn_policy, memo)
+    if 'effective_principals' not in memo:
+        return permits_many(contexts, principals, permissions)
+
+    # ask the policy only about the contexts with an answer not yet
+    # remembered
+    results = [None] * len(contexts)
+    pending = []
+    for i, context in enumerate(contexts):
+        answers = {}
+        for permission in permissions:
+            cached = memo.get((id(context), permission))
+            if (cached is None or cached[0] is not context
+                or cached[1] is not authz_policy):
+                pending.append(i)
+                break
+            answers[permission] = cached[2]
+        else:
+            results[i] = answers
+
+    if pending:
+        found = permits_many([contexts[i] for i in pending], principals,
+                             permissions)
+        for i, answers in zip(pending, found):
+            context = contexts[i]
+            for permission, result in answers.items():
+                memo[(id(context), permission)] = (context, authz_policy,
+                                                   result)
+            results[i] = answers
+    return results
+
 class PermitsResult(int):
     def __new__(cls, s, *args):
         inst = int.__new__(cls, cls.boolval)
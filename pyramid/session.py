@@ -1,34 +1,81 @@
 from hashlib import sha1
+from hashlib import sha256
 import base64
 import binascii
 import hmac
-import time
+import marshal
 import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+
+from repoze.lru import LRUCache
 
 from zope.interface import implementer
 
+from pyramid.compat import json
 from pyramid.compat import pickle
 from pyramid.compat import PY3
 from pyramid.compat import text_
 from pyramid.compat import bytes_
 from pyramid.compat import native_
 from pyramid.interfaces import ISession
+from pyramid.interfaces import ISessionStore
+
+def _add_set_cookie_callback(session):
+    session._dirty = True
+    def set_cookie_callback(request, response):
+        session._set_cookie(response)
+        session.request = None # explicitly break cycle for gc
+    session.request.add_response_callback(set_cookie_callback)
 
 def manage_accessed(wrapped):
     """ Decorator which causes a cookie to be set when a wrapped
-    method is called"""
+    method is called.  If the session has a ``reissue_time``, the cookie
+    is only set if that many seconds have passed since it was last set."""
     def accessed(session, *arg, **kw):
-        session.accessed = int(time.time())
+        session.accessed = now = int(time.time())
         if not session._dirty:
-            session._dirty = True
-            def set_cookie_callback(request, response):
-                session._set_cookie(response)
-                session.request = None # explicitly break cycle for gc
-            session.request.add_response_callback(set_cookie_callback)
+            reissue_time = session._reissue_time
+            if reissue_time is None or now - session._renewed > reissue_time:
+                _add_set_cookie_callback(session)
         return wrapped(session, *arg, **kw)
     accessed.__doc__ = wrapped.__doc__
     return accessed
 
+class _FlashAndCSRFMixin(object):
+    """ The flash and CSRF methods of :class:`pyramid.interfaces.ISession`,
+    implemented in terms of the session's dictionary methods."""
+
+    # flash API methods
+    def flash(self, msg, queue='', allow_duplicate=True):
+        storage = self.setdefault('_f_' + queue, [])
+        if allow_duplicate or (msg not in storage):
+            storage.append(msg)
+            self.changed()
+
+    def pop_flash(self, queue=''):
+        storage = self.pop('_f_' + queue, [])
+        return storage
+
+    def peek_flash(self, queue=''):
+        storage = self.get('_f_' + queue, [])
+        return storage
+
+    # CSRF API methods
+    def new_csrf_token(self):
+        token = text_(binascii.hexlify(os.urandom(20)))
+        self['_csrft_'] = token
+        return token
+
+    def get_csrf_token(self):
+        token = self.get('_csrft_', None)
+        if token is None:
+            token = self.new_csrf_token()
+        return token
+
 def UnencryptedCookieSessionFactoryConfig(
     secret,
     timeout=1200,
@@ -39,6 +86,8 @@ def UnencryptedCookieSessionFactoryConfig(
     cookie_secure=False, 
     cookie_httponly=False,
     cookie_on_exception=True,
+    reissue_time=None,
+    serializer=None,
     ):
     """
     Configure a :term:`session factory` which will provide unencrypted
@@ -85,10 +134,30 @@ def UnencryptedCookieSessionFactoryConfig(
       If ``True``, set a session cookie even if an exception occurs
       while rendering a view.  Default: ``True``.
 
+    ``reissue_time``
+      If ``None``, the session cookie is set whenever the session is used,
+      even if it was only read.  If a number of seconds, the cookie is set
+      only when the session is changed, or when it is used and the cookie
+      was set more than ``reissue_time`` seconds ago; mutations of mutable
+      values held in the session must then be announced by calling
+      ``session.changed()``.  It should be well below ``timeout``, or an
+      unchanged session will time out while still in use.  Default:
+      ``None``.
+
+    ``serializer``
+      If ``None``, the session is pickled and signed by
+      :func:`pyramid.session.signed_serialize`.  Otherwise, an object with
+      ``dumps`` and ``loads`` methods (such as a
+      :class:`pyramid.session.JSONSerializer`) which converts the session
+      to and from bytes; its output is signed by
+      :func:`pyramid.session.signed_dumps`, which makes for a shorter
+      cookie.  Changing the serializer invalidates existing sessions.
+      Default: ``None``.
+
     """
 
     @implementer(ISession)
-    class UnencryptedCookieSessionFactory(dict):
+    class UnencryptedCookieSessionFactory(_FlashAndCSRFMixin, dict):
         """ Dictionary-like session object """
 
         # configuration parameters
@@ -101,6 +170,8 @@ def UnencryptedCookieSessionFactoryConfig(
         _cookie_on_exception = cookie_on_exception
         _secret = secret
         _timeout = timeout
+        _reissue_time = reissue_time
+        _serializer = serializer
 
         # dirty flag
         _dirty = False
@@ -115,7 +186,11 @@ def UnencryptedCookieSessionFactoryConfig(
             cookieval = request.cookies.get(self._cookie_name)
             if cookieval is not None:
                 try:
-                    value = signed_deserialize(cookieval, self._secret)
+                    if self._serializer is None:
+                        value = signed_deserialize(cookieval, self._secret)
+                    else:
+                        value = signed_loads(cookieval, self._secret,
+                                             self._serializer)
                 except ValueError:
                     value = None
 
@@ -126,15 +201,17 @@ def UnencryptedCookieSessionFactoryConfig(
                     state = {}
 
             self.created = created
-            self.accessed = accessed
+            self.accessed = self._renewed = accessed
             self.new = new
             dict.__init__(self, state)
 
         # ISession methods
         def changed(self):
-            """ This is intentionally a noop; the session is
-            serialized on every access, so unnecessary"""
-            pass
+            """ Cause the session cookie to be set.  Only needed when a
+            ``reissue_time`` is in use; otherwise the session is serialized
+            on every access."""
+            if not self._dirty:
+                _add_set_cookie_callback(self)
 
         def invalidate(self):
             self.clear() # XXX probably needs to unset cookie
@@ -156,44 +233,13 @@ def UnencryptedCookieSessionFactoryConfig(
             has_key = manage_accessed(dict.has_key)
 
         # modifying dictionary methods
-        clear = manage_accessed(dict.clear)
-        update = manage_accessed(dict.update)
-        setdefault = manage_accessed(dict.setdefault)
-        pop = manage_accessed(dict.pop)
-        popitem = manage_accessed(dict.popitem)
-        __setitem__ = manage_accessed(dict.__setitem__)
-        __delitem__ = manage_accessed(dict.__delitem__)
-
-        # flash API methods
-        @manage_accessed
-        def flash(self, msg, queue='', allow_duplicate=True):
-            storage = self.setdefault('_f_' + queue, [])
-            if allow_duplicate or (msg not in storage):
-                storage.append(msg)
-
-        @manage_accessed
-        def pop_flash(self, queue=''):
-            storage = self.pop('_f_' + queue, [])
-            return storage
-
-        @manage_accessed
-        def peek_flash(self, queue=''):
-            storage = self.get('_f_' + queue, [])
-            return storage
-
-        # CSRF API methods
-        @manage_accessed
-        def new_csrf_token(self):
-            token = text_(binascii.hexlify(os.urandom(20)))
-            self['_csrft_'] = token
-            return token
-
-        @manage_accessed
-        def get_csrf_token(self):
-            token = self.get('_csrft_', None)
-            if token is None:
-                token = self.new_csrf_token()
-            return token
+        clear = manage_changed(manage_accessed(dict.clear))
+        update = manage_changed(manage_accessed(dict.update))
+        setdefault = manage_changed(manage_accessed(dict.setdefault))
+        pop = manage_changed(manage_accessed(dict.pop))
+        popitem = manage_changed(manage_accessed(dict.popitem))
+        __setitem__ = manage_changed(manage_accessed(dict.__setitem__))
+        __delitem__ = manage_changed(manage_accessed(dict.__delitem__))
 
         # non-API methods
         def _set_cookie(self, response):
@@ -201,9 +247,11 @@ def UnencryptedCookieSessionFactoryConfig(
                 exception = getattr(self.request, 'exception', None)
                 if exception is not None: # dont set a cookie during exceptions
                     return False
-            cookieval = signed_serialize(
-                (self.accessed, self.created, dict(self)), self._secret
-                )
+            value = (self.accessed, self.created, dict(self))
+            if self._serializer is None:
+                cookieval = signed_serialize(value, self._secret)
+            else:
+                cookieval = signed_dumps(value, self._secret, self._serializer)
             if len(cookieval) > 4064:
                 raise ValueError(
                     'Cookie value is too long to store (%s bytes)' %
@@ -276,3 +324,539 @@ def signed_deserialize(serialized, secret, hmac=hmac):
 
     return pickle.loads(pickled)
 
+class PickleSerializer(object):
+    """ A session serializer (see
+    :func:`pyramid.session.UnencryptedCookieSessionFactoryConfig`) which
+    uses :mod:`pickle`.  Any pickleable value may be stored."""
+    def dumps(self, data):
+        return pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, serialized):
+        return pickle.loads(serialized)
+
+class JSONSerializer(object):
+    """ A session serializer which uses JSON.  Only strings, numbers,
+    booleans, ``None``, lists (or tuples) and dictionaries with string keys
+    may be stored; tuples are loaded as lists, and strings are loaded as
+    text."""
+    def dumps(self, data):
+        return bytes_(json.dumps(data, separators=(',', ':')))
+
+    def loads(self, serialized):
+        return json.loads(text_(serialized, 'utf-8'))
+
+class MarshalSerializer(object):
+    """ A session serializer which uses :mod:`marshal`: a compact binary
+    format which is faster than pickle, but which can only store values of
+    the builtin types (strings, numbers, booleans, ``None``, tuples, lists,
+    sets and dictionaries).  The format may change between Python versions,
+    so sessions may be lost when the Python version of an application
+    changes."""
+    def dumps(self, data):
+        return marshal.dumps(data)
+
+    def loads(self, serialized):
+        return marshal.loads(serialized)
+
+class ZlibSerializer(object):
+    """ A session serializer which compresses the output of another
+    ``serializer`` with :mod:`zlib` at the given compression ``level``,
+    unless compressing it would not make it shorter."""
+    def __init__(self, serializer, level=6):
+        self.serializer = serializer
+        self.level = level
+
+    def dumps(self, data):
+        serialized = self.serializer.dumps(data)
+        compressed = zlib.compress(serialized, self.level)
+        if len(compressed) < len(serialized):
+            return b'z' + compressed
+        return b'-' + serialized
+
+    def loads(self, serialized):
+        if serialized[:1] == b'z':
+            return self.serializer.loads(zlib.decompress(serialized[1:]))
+        return self.serializer.loads(serialized[1:])
+
+def signed_dumps(data, secret, serializer):
+    """ Serialize ``data`` using ``serializer`` (an object with ``dumps``
+    and ``loads`` methods, such as a :class:`pyramid.session.JSONSerializer`)
+    and sign it with an HMAC-SHA256 using the ``secret`` (must be a
+    string).  Return the signature and the serialization packed together as
+    a native string of URL-safe base64 (without padding, so that it needs
+    no quoting in a cookie).  ``signed_loads`` reverses the operation."""
+    serialized = serializer.dumps(data)
+    sig = hmac.new(bytes_(secret), serialized, sha256).digest()
+    return native_(base64.urlsafe_b64encode(sig + serialized).rstrip(b'='))
+
+def signed_loads(signed, secret, serializer):
+    """ Deserialize the value returned from ``signed_dumps`` using
+    ``serializer``.  If the value cannot be deserialized for any reason, a
+    :exc:`ValueError` exception will be raised."""
+    signed = bytes_(signed)
+    try:
+        packed = base64.urlsafe_b64decode(signed + b'=' * (-len(signed) % 4))
+    except (binascii.Error, TypeError) as e:
+        # Badly formed data can make base64 die
+        raise ValueError('Badly formed base64 data: %s' % e)
+    input_sig, serialized = packed[:32], packed[32:]
+    sig = hmac.new(bytes_(secret), serialized, sha256).digest()
+
+    if len(sig) != len(input_sig):
+        raise ValueError('Wrong signature length')
+
+    # Avoid timing attacks (see signed_deserialize)
+    invalid_bits = 0
+    for a, b in zip(sig, input_sig):
+        invalid_bits += a != b
+
+    if invalid_bits:
+        raise ValueError('Invalid bits in signature')
+
+    try:
+        return serializer.loads(serialized)
+    except Exception as e:
+        # the value was signed by us, but perhaps by another serializer
+        raise ValueError('Cannot deserialize value: %s' % e)
+
+
+def manage_loaded(wrapped):
+    """ Decorator which causes a server-side session to be loaded from its
+    store before a wrapped method is called"""
+    def loaded(session, *arg, **kw):
+        if not session._loaded:
+            session._load()
+        return wrapped(session, *arg, **kw)
+    loaded.__doc__ = wrapped.__doc__
+    return loaded
+
+def manage_changed(wrapped):
+    """ Decorator which calls the session's ``changed`` method (causing it
+    to be saved at the end of the request) when a wrapped method is
+    called"""
+    def changed(session, *arg, **kw):
+        session.changed()
+        return wrapped(session, *arg, **kw)
+    changed.__doc__ = wrapped.__doc__
+    return changed
+
+def ServerSideSessionFactoryConfig(
+    secret,
+    store,
+    timeout=1200,
+    reissue_time=None,
+    cookie_name='session',
+    cookie_max_age=None,
+    cookie_path='/',
+    cookie_domain=None,
+    cookie_secure=False,
+    cookie_httponly=False,
+    cookie_on_exception=True,
+    ):
+    """
+    Configure a :term:`session factory` which will provide sessions whose
+    state is kept on the server in ``store``.  The cookie sent to the
+    browser holds only a signed, randomly generated session id, so the
+    size of a session is not limited by the size of a cookie.
+
+    The session state is loaded from the store the first time the session
+    is used during a request, and is saved back to the store at the end of
+    the request only if it was changed (or if ``reissue_time`` has passed;
+    see below).  A request which never touches ``request.session`` never
+    consults the store.  As with any session, call ``session.changed()``
+    after mutating a mutable value held *in* the session.
+
+    The return value of this function is a :term:`session factory`, which
+    may be provided as the ``session_factory`` argument of a
+    :class:`pyramid.config.Configurator` constructor, or used
+    as the ``session_factory`` argument of the
+    :meth:`pyramid.config.Configurator.set_session_factory`
+    method.
+
+    Parameters:
+
+    ``secret``
+      A string which is used to sign the session id in the cookie.
+
+    ``store``
+      An object implementing :class:`pyramid.interfaces.ISessionStore`,
+      such as a :class:`pyramid.session.MemorySessionStore`,
+      :class:`pyramid.session.FileSessionStore` or
+      :class:`pyramid.session.SQLiteSessionStore`.
+
+    ``timeout``
+      A number of seconds of inactivity before a session times out.
+      Default: 1200 (20 minutes).
+
+    ``reissue_time``
+      A number of seconds after which an unchanged session which is still
+      being used is saved again, so that it does not time out while it is
+      in use.  Default: ``None`` (one tenth of ``timeout``).
+
+    ``cookie_name``
+      The name of the cookie used for sessioning.  Default: ``session``.
+
+    ``cookie_max_age``
+      The maximum age of the cookie used for sessioning (in seconds).
+      Default: ``None`` (browser scope).  When this is set, the cookie is
+      resent whenever the session is saved.
+
+    ``cookie_path``
+      The path used for the session cookie.  Default: ``/``.
+
+    ``cookie_domain``
+      The domain used for the session cookie.  Default: ``None`` (no domain).
+
+    ``cookie_secure``
+      The 'secure' flag of the session cookie.  Default: ``False``.
+
+    ``cookie_httponly``
+      The 'httpOnly' flag of the session cookie.  Default: ``False``.
+
+    ``cookie_on_exception``
+      If ``True``, save the session and set a session cookie even if an
+      exception occurs while rendering a view.  Default: ``True``.
+
+    """
+    if reissue_time is None:
+        reissue_time = timeout / 10.0
+
+    @implementer(ISession)
+    class ServerSideSessionFactory(_FlashAndCSRFMixin, dict):
+        """ Dictionary-like session object """
+
+        # configuration parameters
+        _cookie_name = cookie_name
+        _cookie_max_age = cookie_max_age
+        _cookie_path = cookie_path
+        _cookie_domain = cookie_domain
+        _cookie_secure = cookie_secure
+        _cookie_httponly = cookie_httponly
+        _cookie_on_exception = cookie_on_exception
+        _secret = secret
+        _store = store
+        _timeout = timeout
+        _reissue_time = reissue_time
+
+        # state flags
+        _loaded = False
+        _dirty = False
+        _reissue = False
+        _callback_added = False
+
+        def __init__(self, request):
+            self.request = request
+            self._cookie_id = None
+            self._session_id = None
+            cookieval = request.cookies.get(self._cookie_name)
+            if cookieval is not None:
+                self._cookie_id = unsign_session_id(cookieval, self._secret)
+            dict.__init__(self)
+
+        # ISession attributes
+        @property
+        @manage_loaded
+        def created(self):
+            return self._created
+
+        @property
+        @manage_loaded
+        def new(self):
+            return self._new
+
+        @property
+        @manage_loaded
+        def accessed(self):
+            return self._accessed
+
+        # ISession methods
+        @manage_loaded
+        def changed(self):
+            """ Mark the session as changed so that it is saved to the
+            store at the end of the request."""
+            self._dirty = True
+            self._add_callback()
+
+        def invalidate(self):
+            if self._cookie_id is not None:
+                self._store.delete(self._cookie_id)
+            dict.clear(self)
+            self._loaded = True
+            self._session_id = None
+            self._new = True
+            self._created = self._accessed = time.time()
+            self.changed()
+
+        # non-modifying dictionary methods
+        get = manage_loaded(dict.get)
+        __getitem__ = manage_loaded(dict.__getitem__)
+        items = manage_loaded(dict.items)
+        values = manage_loaded(dict.values)
+        keys = manage_loaded(dict.keys)
+        __contains__ = manage_loaded(dict.__contains__)
+        __len__ = manage_loaded(dict.__len__)
+        __iter__ = manage_loaded(dict.__iter__)
+
+        if not PY3:
+            iteritems = manage_loaded(dict.iteritems)
+            itervalues = manage_loaded(dict.itervalues)
+            iterkeys = manage_loaded(dict.iterkeys)
+            has_key = manage_loaded(dict.has_key)
+
+        # modifying dictionary methods
+        clear = manage_changed(dict.clear)
+        update = manage_changed(dict.update)
+        setdefault = manage_changed(dict.setdefault)
+        pop = manage_changed(dict.pop)
+        popitem = manage_changed(dict.popitem)
+        __setitem__ = manage_changed(dict.__setitem__)
+        __delitem__ = manage_changed(dict.__delitem__)
+
+        # non-API methods
+        def _load(self):
+            self._loaded = True
+            now = time.time()
+            value = None
+            if self._cookie_id is not None:
+                value = self._store.load(self._cookie_id)
+            if value is not None:
+                accessed, created, state = value
+                if now - accessed <= self._timeout:
+                    self._session_id = self._cookie_id
+                    self._accessed = accessed
+                    self._created = created
+                    self._new = False
+                    dict.update(self, state)
+                    if now - accessed > self._reissue_time:
+                        self._reissue = True
+                        self._add_callback()
+                    return
+            self._accessed = self._created = now
+            self._new = True
+
+        def _add_callback(self):
+            if not self._callback_added:
+                self._callback_added = True
+                def save_session_callback(request, response):
+                    self._save(response)
+                    self.request = None # explicitly break cycle for gc
+                self.request.add_response_callback(save_session_callback)
+
+        def _save(self, response):
+            if not self._cookie_on_exception:
+                exception = getattr(self.request, 'exception', None)
+                if exception is not None: # dont save during exceptions
+                    return False
+            if not (self._dirty or self._reissue):
+                return False
+            if not self:
+                # nothing worth keeping; forget the session entirely
+                if self._session_id is not None:
+                    self._store.delete(self._session_id)
+                if self._cookie_id is not None:
+                    response.delete_cookie(
+                        self._cookie_name,
+                        path = self._cookie_path,
+                        domain = self._cookie_domain,
+                        )
+                return True
+            new_id = self._session_id is None
+            if new_id:
+                self._session_id = new_session_id()
+            self._accessed = time.time()
+            self._store.save(
+                self._session_id,
+                (self._accessed, self._created, dict(self)),
+                self._timeout,
+                )
+            if new_id or self._cookie_max_age is not None:
+                response.set_cookie(
+                    self._cookie_name,
+                    value=sign_session_id(self._session_id, self._secret),
+                    max_age = self._cookie_max_age,
+                    path = self._cookie_path,
+                    domain = self._cookie_domain,
+                    secure = self._cookie_secure,
+                    httponly = self._cookie_httponly,
+                    )
+            return True
+
+    return ServerSideSessionFactory
+
+def new_session_id():
+    """ Return a new random session id (a native string of 40 hexadecimal
+    digits)."""
+    return native_(binascii.hexlify(os.urandom(20)))
+
+def sign_session_id(session_id, secret):
+    """ Return ``session_id`` prefixed with its signature (40 bytes), for use
+    as a cookie value.  ``unsign_session_id`` reverses the operation."""
+    sig = hmac.new(bytes_(secret), bytes_(session_id), sha1).hexdigest()
+    return sig + session_id
+
+def unsign_session_id(signed, secret):
+    """ Return the session id contained in ``signed``, a value created by
+    ``sign_session_id``, or ``None`` if its signature does not match."""
+    input_sig, session_id = signed[:40], signed[40:]
+    if not session_id:
+        return None
+    sig = hmac.new(bytes_(secret), bytes_(session_id), sha1).hexdigest()
+    if len(sig) != len(input_sig):
+        return None
+    # Avoid timing attacks (see signed_deserialize)
+    invalid_bits = 0
+    for a, b in zip(sig, input_sig):
+        invalid_bits += a != b
+    if invalid_bits:
+        return None
+    return session_id
+
+@implementer(ISessionStore)
+class MemorySessionStore(object):
+    """ A :class:`pyramid.interfaces.ISessionStore` which keeps sessions in
+    the memory of the current process, discarding the least recently used
+    ones once more than ``max_sessions`` are stored.  Sessions are not
+    shared between processes and do not survive a restart.  Values are
+    stored pickled, so a stored session is never shared by two
+    requests."""
+
+    def __init__(self, max_sessions=10000):
+        self._cache = LRUCache(max_sessions)
+
+    def load(self, session_id):
+        entry = self._cache.get(session_id)
+        if entry is None:
+            return None
+        expires, pickled = entry
+        if expires < time.time():
+            self._cache.invalidate(session_id)
+            return None
+        return pickle.loads(pickled)
+
+    def save(self, session_id, value, timeout):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._cache.put(session_id, (time.time() + timeout, pickled))
+
+    def delete(self, session_id):
+        self._cache.invalidate(session_id)
+
+_session_id_re = re.compile(r'^[0-9a-f]+$')
+
+@implementer(ISessionStore)
+class FileSessionStore(object):
+    """ A :class:`pyramid.interfaces.ISessionStore` which keeps each session
+    in its own file inside ``directory``, which must exist and be writable.
+    Files are replaced atomically, so several processes may share the
+    directory.  Expired sessions are removed when they are next loaded, or
+    by calling ``purge_expired``."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, session_id):
+        if not _session_id_re.match(session_id):
+            raise ValueError('Invalid session id %r' % session_id)
+        return os.path.join(self.directory, session_id)
+
+    def load(self, session_id):
+        path = self._path(session_id)
+        try:
+            with open(path, 'rb') as f:
+                expires, value = pickle.load(f)
+        except (IOError, EOFError, ValueError, pickle.UnpicklingError):
+            return None
+        if expires < time.time():
+            self.delete(session_id)
+            return None
+        return value
+
+    def save(self, session_id, value, timeout):
+        path = self._path(session_id)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((time.time() + timeout, value), f,
+                            pickle.HIGHEST_PROTOCOL)
+            try:
+                os.rename(tmp, path)
+            except OSError: # Windows will not rename over an existing file
+                self.delete(session_id)
+                os.rename(tmp, path)
+        except:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def delete(self, session_id):
+        try:
+            os.remove(self._path(session_id))
+        except OSError:
+            pass
+
+    def purge_expired(self):
+        """ Remove the files of all expired sessions."""
+        for name in os.listdir(self.directory):
+            if _session_id_re.match(name):
+                self.load(name)
+
+@implementer(ISessionStore)
+class SQLiteSessionStore(object):
+    """ A :class:`pyramid.interfaces.ISessionStore` which keeps sessions in
+    the table named ``table`` of the SQLite database file ``filename``; the
+    table is created if it does not exist.  Each thread uses its own
+    connection, so a ``:memory:`` database is not shared between threads.
+    Expired sessions are removed when they are next loaded, or by calling
+    ``purge_expired``."""
+
+    def __init__(self, filename, table='pyramid_sessions'):
+        self.filename = filename
+        self.table = table
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            import sqlite3
+            conn = sqlite3.connect(self.filename)
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS %s (id TEXT PRIMARY KEY, '
+                'expires REAL NOT NULL, value BLOB NOT NULL)' % self.table)
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id):
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT expires, value FROM %s WHERE id = ?' % self.table,
+            (session_id,)).fetchone()
+        if row is None:
+            return None
+        expires, pickled = row
+        if expires < time.time():
+            self.delete(session_id)
+            return None
+        return pickle.loads(bytes(pickled))
+
+    def save(self, session_id, value, timeout):
+        import sqlite3
+        conn = self._connection()
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        conn.execute(
+            'INSERT OR REPLACE INTO %s (id, expires, value) '
+            'VALUES (?, ?, ?)' % self.table,
+            (session_id, time.time() + timeout, sqlite3.Binary(pickled)))
+        conn.commit()
+
+    def delete(self, session_id):
+        conn = self._connection()
+        conn.execute('DELETE FROM %s WHERE id = ?' % self.table,
+                     (session_id,))
+        conn.commit()
+
+    def purge_expired(self):
+        """ Remove all expired sessions from the table."""
+        conn = self._connection()
+        conn.execute('DELETE FROM %s WHERE expires < ?' % self.table,
+                     (time.time(),))
+        conn.commit()
@@ -1,25 +1,45 @@
 # -*- coding: utf-8 -*-
+import gzip
+import hashlib
 import mimetypes
 import os
+import sys
+import threading
+import time
+from binascii import hexlify
+from calendar import timegm
+from email.utils import mktime_tz
+from email.utils import parsedate_tz
+from os import stat
 from os.path import normcase
 from os.path import normpath
 from os.path import join
 from os.path import getmtime
 from os.path import getsize
-from os.path import isdir
 from os.path import exists
+from stat import S_ISDIR
 from pkg_resources import resource_exists
 from pkg_resources import resource_filename
 from pkg_resources import resource_isdir
 
+from repoze.lru import LRUCache
 from repoze.lru import lru_cache
 
 from pyramid.asset import resolve_asset_spec
+from pyramid.compat import PY3
+from pyramid.compat import bytes_
+from pyramid.compat import json
+from pyramid.compat import native_
 from pyramid.compat import text_
+from pyramid.compat import text_type
 from pyramid.httpexceptions import HTTPNotFound
 from pyramid.httpexceptions import HTTPMovedPermanently
+from pyramid.httpexceptions import HTTPNotModified
+from pyramid.httpexceptions import HTTPRequestRangeNotSatisfiable
+from pyramid.interfaces import IPackageOverrides
 from pyramid.path import caller_package
 from pyramid.response import Response
+from pyramid.threadlocal import get_current_registry
 from pyramid.traversal import traversal_path_info
 
 slash = text_('/')
@@ -40,26 +60,243 @@ class _FileResponse(Response):
     """
     Serves a static filelike object.
     """
-    def __init__(self, path, cache_max_age):
-        super(_FileResponse, self).__init__(conditional_response=True)
-        self.last_modified = getmtime(path)
+    def __init__(self, path, cache_max_age, request=None, block_size=None,
+                 st=None, ranges=None):
+        # static_view answers conditional and Range requests itself
+        super(_FileResponse, self).__init__()
+        if st is None:
+            st = stat(path)
+        self.last_modified = st.st_mtime
+        self.etag = _file_etag(st)
         content_type = mimetypes.guess_type(path, strict=False)[0]
         if content_type is None:
             content_type = 'application/octet-stream'
         self.content_type = content_type
-        content_length = getsize(path)
-        self.app_iter = _FileIter(open(path, 'rb'), content_length)
+        content_length = st.st_size
+        if block_size is None:
+            block_size = _FileIter.block_size
+        f = open(path, 'rb')
+        file_wrapper = None
+        if request is not None:
+            file_wrapper = request.environ.get('wsgi.file_wrapper')
+        if ranges is not None:
+            parts, trailer = _partial_content(self, ranges, content_length)
+            if trailer:
+                app_iter = _FileRangesIter(f, parts, trailer, block_size)
+                content_length = _multipart_length(parts, trailer)
+            else:
+                prefix, start, stop = parts[0]
+                f.seek(start)
+                if stop == content_length and file_wrapper is not None:
+                    # a file wrapper sends the rest of the file
+                    app_iter = file_wrapper(f, block_size)
+                else:
+                    app_iter = _FileIter(f, stop - start, block_size)
+                content_length = stop - start
+        elif file_wrapper is not None:
+            # let the server send the file itself (e.g. using sendfile)
+            app_iter = file_wrapper(f, block_size)
+        else:
+            app_iter = _FileIter(f, content_length, block_size)
+        self.app_iter = app_iter
         # assignment of content_length must come after assignment of app_iter
         self.content_length = content_length
         if cache_max_age is not None:
             self.cache_expires = cache_max_age
 
+def _file_etag(st):
+    # a strong ETag which changes whenever the file is replaced or modified
+    return '%x-%x-%x' % (st.st_ino, st.st_size, int(st.st_mtime * 1000000))
+
+def _not_modified(request, etag, mtime):
+    """ Return true if ``request`` is a conditional GET or HEAD which would
+    be answered with a ``304 Not Modified`` for a file with ``etag`` and
+    ``mtime``."""
+    environ = request.environ
+    if environ.get('REQUEST_METHOD', 'GET') not in ('GET', 'HEAD'):
+        return False
+    if environ.get('HTTP_IF_NONE_MATCH'):
+        return etag in request.if_none_match
+    if environ.get('HTTP_IF_MODIFIED_SINCE'):
+        since = request.if_modified_since
+        if since is not None:
+            return int(mtime) <= timegm(since.utctimetuple())
+    return False
+
+def _not_modified_response(etag, mtime, cache_max_age, vary):
+    response = HTTPNotModified()
+    response.etag = etag
+    response.last_modified = mtime
+    if vary:
+        response.vary = _vary
+    if cache_max_age is not None:
+        response.cache_expires = cache_max_age
+    return response
+
+def _requested_ranges(request, etag, mtime, size, max_ranges):
+    """ Return the list of ``(start, stop)`` byte ranges of a file of
+    ``size`` bytes with ``etag`` and ``mtime`` which should be served in
+    answer to the ``Range`` header of ``request``: an empty list if none of
+    the ranges is satisfiable, or ``None`` if the whole file should be
+    served instead (the request is not a GET, its ``Range`` header is
+    invalid or asks for more than ``max_ranges`` ranges, or its ``If-Range``
+    header doesn't match the file)."""
+    environ = request.environ
+    header = environ.get('HTTP_RANGE')
+    if not header or environ.get('REQUEST_METHOD', 'GET') != 'GET':
+        return None
+    if_range = environ.get('HTTP_IF_RANGE')
+    if if_range and not _if_range_matches(if_range.strip(), etag, mtime):
+        return None
+    ranges = _parse_ranges(header, size)
+    if ranges and len(ranges) > 1:
+        ranges = _coalesce_ranges(ranges)
+        if len(ranges) > max_ranges:
+            return None
+    return ranges
+
+def _if_range_matches(if_range, etag, mtime):
+    if if_range.startswith('"'):
+        return if_range == '"%s"' % etag
+    if if_range.startswith('W/'):
+        # weak validators never match
+        return False
+    date = parsedate_tz(if_range)
+    return date is not None and mktime_tz(date) == int(mtime)
+
+def _parse_ranges(header, size):
+    # (start, stop) pairs of the satisfiable ranges of a "bytes=..." Range
+    # header, or None if the header is invalid
+    units, sep, specs = header.partition('=')
+    if units.strip().lower() != 'bytes':
+        return None
+    ranges = []
+    valid = False
+    for spec in specs.split(','):
+        spec = spec.strip()
+        if not spec:
+            continue
+        first, sep, last = spec.partition('-')
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                if last:
+                    stop = int(last) + 1
+                    if stop <= start:
+                        return None
+                else:
+                    stop = size
+            else:
+                # the last ``last`` bytes
+                start = size - int(last)
+                stop = size
+        except ValueError:
+            return None
+        if start < 0:
+            start = 0
+        valid = True
+        if start < size:
+            ranges.append((start, min(stop, size)))
+    if not valid:
+        return None
+    return ranges
+
+def _coalesce_ranges(ranges):
+    ranges = sorted(ranges)
+    coalesced = [ranges[0]]
+    for start, stop in ranges[1:]:
+        last_start, last_stop = coalesced[-1]
+        if start <= last_stop:
+            coalesced[-1] = (last_start, max(stop, last_stop))
+        else:
+            coalesced.append((start, stop))
+    return coalesced
+
+def _range_not_satisfiable(size):
+    response = HTTPRequestRangeNotSatisfiable()
+    response.headers['Content-Range'] = 'bytes */%d' % size
+    return response
+
+def _partial_content(response, ranges, size):
+    """ Turn ``response`` into a ``206 Partial Content`` response for the
+    ``ranges`` of a file of ``size`` bytes.  Returns a list of ``(prefix,
+    start, stop)`` parts, where ``prefix`` is the ``multipart/byteranges``
+    header of the part, and the trailer of the multipart body; both are
+    empty for a single range."""
+    response.status = '206 Partial Content'
+    if len(ranges) == 1:
+        start, stop = ranges[0]
+        response.headers['Content-Range'] = 'bytes %d-%d/%d' % (
+            start, stop - 1, size)
+        return [(b'', start, stop)], b''
+    boundary = native_(hexlify(os.urandom(12)))
+    content_type = response.headers['Content-Type']
+    parts = []
+    for start, stop in ranges:
+        prefix = ('\r\n--%s\r\nContent-Type: %s\r\n'
+                  'Content-Range: bytes %d-%d/%d\r\n\r\n' % (
+                      boundary, content_type, start, stop - 1, size))
+        parts.append((bytes_(prefix), start, stop))
+    trailer = bytes_('\r\n--%s--\r\n' % boundary)
+    response.headers['Content-Type'] = (
+        'multipart/byteranges; boundary=%s' % boundary)
+    return parts, trailer
+
+def _multipart_length(parts, trailer):
+    length = len(trailer)
+    for prefix, start, stop in parts:
+        length += len(prefix) + stop - start
+    return length
+
+def _immutable(response, max_age):
+    # the content of a URL embedding a content hash never changes, so
+    # clients needn't revalidate it before it expires
+    response.cache_expires = max_age
+    response.headers['Cache-Control'] = (
+        'max-age=%d, public, immutable' % max_age)
+    return response
+
+class _CachedFileResponse(Response):
+    """
+    Serves a static file from a :class:`StaticFileCache` entry.
+    """
+    def __init__(self, entry, cache_max_age, ranges=None):
+        super(_CachedFileResponse, self).__init__()
+        self.last_modified = entry.mtime
+        self.content_type = entry.content_type
+        body = entry.body
+        if ranges is not None:
+            parts, trailer = _partial_content(self, ranges, len(body))
+            app_iter = []
+            for prefix, start, stop in parts:
+                if prefix:
+                    app_iter.append(prefix)
+                app_iter.append(body[start:stop])
+            if trailer:
+                app_iter.append(trailer)
+        else:
+            app_iter = [body]
+        self.app_iter = app_iter
+        # assignment of content_length must come after assignment of app_iter
+        self.content_length = sum([len(chunk) for chunk in app_iter])
+        self.etag = entry.etag
+        if entry.content_encoding is not None:
+            self.content_encoding = entry.content_encoding
+        if entry.vary:
+            self.vary = _vary
+        if cache_max_age is not None:
+            self.cache_expires = cache_max_age
+
 class _FileIter(object):
     block_size = 4096 * 64 # (256K)
 
-    def __init__(self, file, size=None):
+    def __init__(self, file, size=None, block_size=None):
         self.file = file
         self.size = size
+        if block_size is not None:
+            self.block_size = block_size
 
     def __iter__(self):
         return self
@@ -80,6 +317,174 @@ class _FileIter(object):
     def close(self):
         self.file.close()
 
+class _FileRangesIter(object):
+    """ Iterates over the parts of a ``multipart/byteranges`` body, reading
+    each byte range of the file as it is reached."""
+    def __init__(self, file, parts, trailer, block_size=None):
+        self.file = file
+        self.parts = parts
+        self.trailer = trailer
+        if block_size is None:
+            block_size = _FileIter.block_size
+        self.block_size = block_size
+
+    def __iter__(self):
+        file = self.file
+        block_size = self.block_size
+        for prefix, start, stop in self.parts:
+            yield prefix
+            file.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                data = file.read(min(block_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+        yield self.trailer
+
+    def close(self):
+        self.file.close()
+
+class StaticFileCache(object):
+    """ An in-memory cache of small static files which may be passed as the
+    ``file_cache`` argument of :class:`pyramid.static.static_view` (or of
+    :meth:`pyramid.config.Configurator.add_static_view`).  A file served
+    from the cache doesn't need to be looked up, stat'ed or read.
+
+    Files larger than ``max_file_size`` bytes are never cached.  At most
+    ``max_entries`` files totalling at most ``max_total_size`` bytes are
+    held; the least recently used files are discarded to make room for new
+    ones.
+
+    A cached file is served without checking the filesystem for up to
+    ``revalidate`` seconds after it was last checked; after that, it is
+    stat'ed again and reloaded if it has changed (or discarded if it no
+    longer exists).  If ``revalidate`` is
+    ``None``, files are never checked again.
+
+    A single cache may be shared by several static views.
+    """
+    def __init__(self, max_entries=1000, max_file_size=65536,
+                 max_total_size=16777216, revalidate=1):
+        self.max_entries = max_entries
+        self.max_file_size = max_file_size
+        self.max_total_size = max_total_size
+        self.revalidate = revalidate
+        self.total_size = 0
+        # key -> [previous link, next link, key, entry]; the links form a
+        # circular list through ``_root``, from the least to the most
+        # recently used entry, which is only changed while holding the lock
+        self._data = {}
+        self._root = root = []
+        root[:] = [root, root, None, None]
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """ Return the entry for ``key`` or ``None``."""
+        link = self._data.get(key)
+        if link is None:
+            return None
+        entry = link[3]
+        revalidate = self.revalidate
+        if revalidate is not None:
+            now = time.time()
+            if now - entry.checked >= revalidate:
+                try:
+                    etag = _file_etag(stat(entry.filepath))
+                except OSError:
+                    etag = None
+                if etag != entry.etag:
+                    self.discard(key)
+                    return None
+                entry.checked = now
+        with self._lock:
+            if self._data.get(key) is link:
+                # move it to the most recently used end
+                prev, next = link[0], link[1]
+                prev[1] = next
+                next[0] = prev
+                root = self._root
+                last = root[0]
+                link[0] = last
+                link[1] = root
+                last[1] = root[0] = link
+        return entry
+
+    def add(self, key, filepath, content_encoding=None, vary=False):
+        """ Read the file at ``filepath`` into the cache as ``key`` and
+        return its entry, or return ``None`` if the file is too large to be
+        cached.  ``content_encoding`` is the ``Content-Encoding`` of the
+        file (if any) and ``vary`` is true if the response must be served
+        with a ``Vary: Accept-Encoding`` header."""
+        max_file_size = self.max_file_size
+        st = stat(filepath)
+        size = st.st_size
+        if size > max_file_size or size > self.max_total_size:
+            return None
+        f = open(filepath, 'rb')
+        try:
+            body = f.read(max_file_size + 1)
+        finally:
+            f.close()
+        if len(body) != size:
+            # modified while we were reading it
+            return None
+        content_type = mimetypes.guess_type(filepath, strict=False)[0]
+        if content_type is None:
+            content_type = 'application/octet-stream'
+        entry = _StaticFileCacheEntry(filepath, body, content_type,
+                                      st.st_mtime, _file_etag(st),
+                                      time.time(), content_encoding, vary)
+        with self._lock:
+            self._discard(key)
+            data = self._data
+            root = self._root
+            # evict the least recently used entries until the file fits
+            while data and (len(data) >= self.max_entries or
+                            self.total_size + size > self.max_total_size):
+                self._discard(root[1][2])
+            last = root[0]
+            last[1] = root[0] = data[key] = [last, root, key, entry]
+            self.total_size += size
+        return entry
+
+    def discard(self, key):
+        """ Discard the entry for ``key``, if any."""
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        """ Discard every entry."""
+        with self._lock:
+            self._data = {}
+            root = self._root
+            root[:] = [root, root, None, None]
+            self.total_size = 0
+
+    def _discard(self, key):
+        link = self._data.pop(key, None)
+        if link is not None:
+            prev, next = link[0], link[1]
+            prev[1] = next
+            next[0] = prev
+            self.total_size -= len(link[3].body)
+
+class _StaticFileCacheEntry(object):
+    __slots__ = ('filepath', 'body', 'content_type', 'mtime', 'etag',
+                 'checked', 'content_encoding', 'vary')
+
+    def __init__(self, filepath, body, content_type, mtime, etag, checked,
+                 content_encoding=None, vary=False):
+        self.filepath = filepath
+        self.body = body
+        self.content_type = content_type
+        self.mtime = mtime
+        self.etag = etag
+        self.checked = checked
+        self.content_encoding = content_encoding
+        self.vary = vary
+
 class static_view(object):
     """ An instance of this class is a callable which can act as a
     :app:`Pyramid` :term:`view callable`; this view will serve
@@ -115,6 +520,51 @@ class static_view(object):
     the static application will consider request.environ[``PATH_INFO``] as
     ``PATH_INFO`` input. By default, this is ``False``.
 
+    When the WSGI server provides ``wsgi.file_wrapper`` in the environment,
+    files are handed to it so that the server may send them efficiently
+    (e.g. using ``sendfile``); otherwise they are read and returned in
+    chunks of ``block_size`` bytes (default is 262144, or 256K).
+
+    ``file_cache`` may be a :class:`pyramid.static.StaticFileCache` in
+    which small files are kept in memory and served without touching the
+    filesystem.  By default, no such cache is used.
+
+    If ``precompressed`` is ``True``, a request for a file which has a
+    gzip-compressed sibling (e.g. ``app.js.gz`` next to ``app.js``) is
+    served that sibling, with a ``Content-Encoding: gzip`` header, when the
+    request's ``Accept-Encoding`` header allows it; responses for such
+    files carry a ``Vary: Accept-Encoding`` header.  See
+    :func:`pyramid.static.precompress` to create the siblings.  By default,
+    this is ``False``.
+
+    ``manifest`` may be a :class:`pyramid.static.StaticManifest`.  A request
+    for one of the content-hashed paths it maps is served the file it was
+    generated from, with a ``Cache-Control`` header which allows clients to
+    cache it, without revalidation, for the ``max_age`` of the manifest
+    (rather than for ``cache_max_age``).  Other paths are served as usual.
+    By default, no manifest is used.
+
+    A ``GET`` request with a ``Range`` header (and an ``If-Range`` header
+    which matches the file, if any) is answered with a ``206 Partial
+    Content`` response containing only the requested bytes, which are read
+    from the file without reading the bytes before them.  ``max_ranges`` is
+    the greatest number of (non-overlapping) ranges served in one
+    ``multipart/byteranges`` response; the whole file is served in answer to
+    a request for more ranges than that.  The default is ``1``, so only
+    single ranges are served; if it is ``0``, ``Range`` headers are
+    ignored.
+
+    When ``root_dir`` is a package-relative directory and
+    ``resolve_cache_size`` is greater than ``0``, the filesystem path to
+    which each request path resolves (taking :term:`asset override`
+    declarations into account) is kept in a cache of at most
+    ``resolve_cache_size`` paths, and is resolved again only when asset
+    overrides are added.  Paths which resolve to no file are never cached,
+    so files added later are found.  When the ``reload_assets`` setting is
+    true, a cached path is resolved again if the modification time of its
+    file changes.  By default, ``resolve_cache_size`` is ``0`` and paths are
+    resolved for every request.
+
     .. note::
 
        If the ``root_dir`` is relative to a :term:`package`, or is a
@@ -126,7 +576,9 @@ class static_view(object):
     """
 
     def __init__(self, root_dir, cache_max_age=3600, package_name=None,
-                 use_subpath=False, index='index.html'):
+                 use_subpath=False, index='index.html', block_size=None,
+                 file_cache=None, precompressed=False, manifest=None,
+                 max_ranges=1, resolve_cache_size=0):
         # package_name is for bw compat; it is preferred to pass in a
         # package-relative path as root_dir
         # (e.g. ``anotherpackage:foo/static``).
@@ -139,6 +591,14 @@ class static_view(object):
         self.docroot = docroot
         self.norm_docroot = normcase(normpath(docroot))
         self.index = index
+        self.block_size = block_size
+        self.file_cache = file_cache
+        self.precompressed = precompressed
+        self.manifest = manifest
+        self.max_ranges = max_ranges
+        self.resolved = None
+        if package_name and resolve_cache_size:
+            self.resolved = LRUCache(resolve_cache_size)
 
     def __call__(self, context, request):
         if self.use_subpath:
@@ -151,29 +611,185 @@ class static_view(object):
         if path is None:
             return HTTPNotFound('Out of bounds: %s' % request.url)
 
+        manifest = self.manifest
+        if manifest is not None:
+            original = manifest.original_path(path)
+            if original is not None:
+                response = self._serve(request, original, manifest.max_age)
+                if response.status_int in (200, 206, 304):
+                    _immutable(response, manifest.max_age)
+                return response
+
+        return self._serve(request, path, self.cache_max_age)
+
+    def _serve(self, request, path, cache_max_age):
+        precompressed = self.precompressed
+        if precompressed:
+            accepts_gzip = _accepts_gzip(request)
+
+        file_cache = self.file_cache
+        if file_cache is not None:
+            cache_key = (self.package_name, self.docroot, path)
+            if precompressed:
+                cache_key += (accepts_gzip,)
+            entry = file_cache.get(cache_key)
+            if entry is not None:
+                if _not_modified(request, entry.etag, entry.mtime):
+                    return _not_modified_response(entry.etag, entry.mtime,
+                                                  cache_max_age,
+                                                  entry.vary)
+                ranges = self._ranges(request, entry.etag, entry.mtime,
+                                      len(entry.body))
+                if ranges == []:
+                    return _range_not_satisfiable(len(entry.body))
+                return self._accept_ranges(
+                    _CachedFileResponse(entry, cache_max_age, ranges))
+
         if self.package_name: # package resource
 
-            resource_path ='%s/%s' % (self.docroot.rstrip('/'), path)
-            if resource_isdir(self.package_name, resource_path):
+            if self.resolved is not None:
+                isdir, filepath, gzip_filepath = self._resolve_cached(
+                    request, path)
+            else:
+                isdir, filepath, gzip_filepath = self._resolve(path)
+            if isdir:
                 if not request.path_url.endswith('/'):
                     return self.add_slash_redirect(request)
-                resource_path = '%s/%s' % (resource_path.rstrip('/'),self.index)
-            if not resource_exists(self.package_name, resource_path):
+                # an index is served only if the URL ends with a slash, so
+                # we can't cache it by path
+                file_cache = None
+            if filepath is None:
+                return HTTPNotFound(request.url)
+            if precompressed:
+                has_gzip = gzip_filepath is not None
+                if has_gzip and accepts_gzip:
+                    filepath = gzip_filepath
+            try:
+                st = stat(filepath)
+            except OSError:
                 return HTTPNotFound(request.url)
-            filepath = resource_filename(self.package_name, resource_path)
 
         else: # filesystem file
 
             # os.path.normpath converts / to \ on windows
             filepath = normcase(normpath(join(self.norm_docroot, path)))
-            if isdir(filepath):
+            try:
+                st = stat(filepath)
+            except OSError:
+                return HTTPNotFound(request.url)
+            if S_ISDIR(st.st_mode):
                 if not request.path_url.endswith('/'):
                     return self.add_slash_redirect(request)
                 filepath = join(filepath, self.index)
-            if not exists(filepath):
-                return HTTPNotFound(request.url)
+                file_cache = None
+                try:
+                    st = stat(filepath)
+                except OSError:
+                    return HTTPNotFound(request.url)
+            if precompressed:
+                try:
+                    gzip_st = stat(filepath + '.gz')
+                except OSError:
+                    has_gzip = False
+                else:
+                    has_gzip = True
+                    if accepts_gzip:
+                        filepath = filepath + '.gz'
+                        st = gzip_st
+
+        content_encoding = None
+        vary = False
+        if precompressed and has_gzip:
+            vary = True
+            if accepts_gzip:
+                content_encoding = 'gzip'
+
+        # answer conditional requests without opening the file
+        etag = _file_etag(st)
+        if _not_modified(request, etag, st.st_mtime):
+            return _not_modified_response(etag, st.st_mtime,
+                                          cache_max_age, vary)
+
+        ranges = self._ranges(request, etag, st.st_mtime, st.st_size)
+        if ranges == []:
+            return _range_not_satisfiable(st.st_size)
+
+        if file_cache is not None:
+            entry = file_cache.add(cache_key, filepath, content_encoding, vary)
+            if entry is not None:
+                return self._accept_ranges(
+                    _CachedFileResponse(entry, cache_max_age, ranges))
+
+        response = _FileResponse(filepath, cache_max_age, request,
+                                 self.block_size, st, ranges)
+        self._accept_ranges(response)
+        if content_encoding is not None:
+            response.content_encoding = content_encoding
+        if vary:
+            response.vary = _vary
+        return response
+
+    def _resolve(self, path):
+        # (isdir, filepath, gzip_filepath) for the package resource at
+        # ``path``; ``filepath`` is None if there is no such resource (or
+        # index, for a directory) and ``gzip_filepath`` is None if it has no
+        # precompressed sibling
+        package_name = self.package_name
+        resource_path ='%s/%s' % (self.docroot.rstrip('/'), path)
+        isdir = resource_isdir(package_name, resource_path)
+        if isdir:
+            resource_path = '%s/%s' % (resource_path.rstrip('/'), self.index)
+        if not resource_exists(package_name, resource_path):
+            return isdir, None, None
+        filepath = resource_filename(package_name, resource_path)
+        gzip_filepath = None
+        if self.precompressed:
+            gzip_path = resource_path + '.gz'
+            if resource_exists(package_name, gzip_path):
+                gzip_filepath = resource_filename(package_name, gzip_path)
+        return isdir, filepath, gzip_filepath
+
+    def _resolve_cached(self, request, path):
+        try:
+            registry = request.registry
+        except AttributeError:
+            registry = get_current_registry()
+        # asset overrides are consulted through the package's overrides,
+        # whose generation changes whenever any override is added
+        overrides = registry.queryUtility(IPackageOverrides,
+                                          name=self.package_name)
+        generation = getattr(overrides, 'generation', None)
+        settings = registry.settings
+        reload_assets = settings is not None and settings.get('reload_assets')
+        entry = self.resolved.get(path)
+        if (entry is not None and entry[0] is overrides and
+            entry[1] == generation):
+            if not reload_assets:
+                return entry[3:]
+            if entry[2] == _mtime(entry[4]):
+                return entry[3:]
+        resolved = self._resolve(path)
+        filepath = resolved[1]
+        if filepath is None:
+            # a file may be added later
+            return resolved
+        if reload_assets:
+            mtime = _mtime(filepath)
+        else:
+            mtime = None
+        self.resolved.put(path, (overrides, generation, mtime) + resolved)
+        return resolved
+
+    def _ranges(self, request, etag, mtime, size):
+        if self.max_ranges and 'HTTP_RANGE' in request.environ:
+            return _requested_ranges(request, etag, mtime, size,
+                                     self.max_ranges)
+        return None
 
-        return _FileResponse(filepath ,self.cache_max_age)
+    def _accept_ranges(self, response):
+        if self.max_ranges:
+            response.headers['Accept-Ranges'] = 'bytes'
+        return response
 
     def add_slash_redirect(self, request):
         url = request.path_url + '/'
@@ -182,6 +798,187 @@ class static_view(object):
             url = url + '?' + qs
         return HTTPMovedPermanently(url)
 
+_vary = ('Accept-Encoding',)
+
+def _mtime(filepath):
+    try:
+        return getmtime(filepath)
+    except OSError:
+        return None
+
+def _accepts_gzip(request):
+    # a request without an Accept-Encoding header is served the identity
+    # encoding, although RFC 2616 would permit any encoding
+    header = request.environ.get('HTTP_ACCEPT_ENCODING')
+    if not header or 'gzip' not in header:
+        return False
+    return 'gzip' in request.accept_encoding
+
+_precompressed_extensions = ('.css', '.js', '.html', '.htm', '.svg', '.txt',
+                             '.json', '.xml')
+
+def precompress(path, extensions=_precompressed_extensions, min_size=256,
+                compresslevel=9):
+    """ Create a gzip-compressed sibling (``name.gz``) of each file beneath
+    the directory ``path`` whose name ends with one of ``extensions`` and
+    which is at least ``min_size`` bytes long, for serving by a
+    :class:`pyramid.static.static_view` created with
+    ``precompressed=True``.  ``path`` may be a filesystem path or an
+    :term:`asset specification`.  A sibling is only (re)written if it is
+    missing or older than its file; it is given the modification time of
+    its file.  Returns a list of the paths of the siblings written.
+
+    This is intended to be called as part of building or deploying an
+    application rather than at runtime.
+    """
+    path = _asset_path(path)
+    written = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        for filename in filenames:
+            if not filename.endswith(tuple(extensions)):
+                continue
+            filepath = join(dirpath, filename)
+            gzpath = filepath + '.gz'
+            if getsize(filepath) < min_size:
+                continue
+            mtime = getmtime(filepath)
+            if exists(gzpath) and getmtime(gzpath) >= mtime:
+                continue
+            f = open(filepath, 'rb')
+            try:
+                data = f.read()
+            finally:
+                f.close()
+            gz = gzip.GzipFile(gzpath, 'wb', compresslevel)
+            try:
+                gz.write(data)
+            finally:
+                gz.close()
+            os.utime(gzpath, (mtime, mtime))
+            written.append(gzpath)
+    return written
+
+def _asset_path(path):
+    # the filesystem path of an asset specification
+    if ':' in path and not os.path.isabs(path):
+        package_name, filename = resolve_asset_spec(path)
+        path = resource_filename(package_name, filename)
+    return path
+
+class StaticManifest(object):
+    """ A mapping of the paths of static assets, relative to the directory
+    served by a static view (e.g. ``css/app.css``), to the content-hashed
+    paths by which they are addressed in URLs (e.g.
+    ``css/app.3f2a9c1d7b4e.css``).  ``paths`` is a dictionary (or an
+    iterable of pairs) of such paths.
+
+    When a manifest is passed as the ``cachebust`` argument of
+    :meth:`pyramid.config.Configurator.add_static_view`,
+    :meth:`pyramid.request.Request.static_url` generates URLs containing the
+    content-hashed paths, and the static view serves those paths with a
+    ``Cache-Control`` header which allows clients to cache them for
+    ``max_age`` seconds (default is 31536000, or one year) without
+    revalidating them.
+
+    See :func:`pyramid.static.build_manifest` and
+    :func:`pyramid.static.load_manifest`.
+    """
+    def __init__(self, paths, max_age=31536000):
+        self.paths = dict(paths)
+        self.originals = dict([(v, k) for k, v in self.paths.items()])
+        self.max_age = max_age
+
+    def busted_path(self, path):
+        """ Return the content-hashed path of the asset at ``path``, or
+        ``path`` itself if the manifest has no entry for it."""
+        return self.paths.get(path, path)
+
+    def original_path(self, path):
+        """ Return the path of the asset addressed by the content-hashed
+        ``path``, or ``None`` if ``path`` is not a content-hashed path."""
+        return self.originals.get(path)
+
+    def save(self, filename):
+        """ Write the manifest to ``filename`` as a JSON object, for
+        :func:`pyramid.static.load_manifest`."""
+        f = open(filename, 'w')
+        try:
+            json.dump(self.paths, f, indent=1, sort_keys=True)
+        finally:
+            f.close()
+
+def _hashed_path(path, digest):
+    # css/app.css -> css/app.<digest>.css
+    head, sep, name = path.rpartition('/')
+    base, dot, ext = name.rpartition('.')
+    if not base:
+        # no extension (or a dotfile)
+        return '%s.%s' % (path, digest)
+    return '%s%s%s.%s.%s' % (head, sep, base, digest, ext)
+
+def build_manifest(path, hash_length=12, max_age=31536000):
+    """ Return a :class:`pyramid.static.StaticManifest` of the files
+    beneath the directory ``path``, in which the content-hashed path of each
+    file has the first ``hash_length`` characters of the hex MD5 digest of
+    its contents inserted before its extension.  ``path`` may be a
+    filesystem path or an :term:`asset specification`.  Every file is read,
+    so this is best done once, when the application starts.
+    """
+    # walk the native path, so that file names are only decoded for use
+    # as manifest keys (and not when the files are opened)
+    root = native_(_asset_path(path), _fs_encoding())
+    paths = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            filepath = join(dirpath, filename)
+            md5 = hashlib.md5()
+            f = open(filepath, 'rb')
+            try:
+                while True:
+                    data = f.read(_FileIter.block_size)
+                    if not data:
+                        break
+                    md5.update(data)
+            finally:
+                f.close()
+            relpath = os.path.relpath(filepath, root).replace(os.sep, '/')
+            relpath = _fs_text(relpath)
+            paths[relpath] = _hashed_path(relpath,
+                                          md5.hexdigest()[:hash_length])
+    return StaticManifest(paths, max_age)
+
+def _fs_encoding():
+    return sys.getfilesystemencoding() or 'utf-8'
+
+def _fs_text(name):
+    # the text of a file name found on the filesystem; a name which cannot
+    # be decoded using the filesystem encoding is assumed to be UTF-8, as
+    # URLs are
+    encoding = _fs_encoding()
+    if isinstance(name, text_type):
+        if not PY3:
+            return name
+        name = name.encode(encoding, 'surrogateescape')
+    try:
+        return name.decode(encoding)
+    except UnicodeDecodeError:
+        return name.decode('utf-8')
+
+def load_manifest(filename, max_age=31536000):
+    """ Return a :class:`pyramid.static.StaticManifest` read from the JSON
+    object in ``filename`` (a filesystem path or an :term:`asset
+    specification`), such as one written by
+    :meth:`pyramid.static.StaticManifest.save` or by an asset build tool.
+    The object maps the paths of the assets, relative to the static
+    directory, to their content-hashed paths.
+    """
+    f = open(_asset_path(filename), 'r')
+    try:
+        paths = json.load(f)
+    finally:
+        f.close()
+    return StaticManifest(paths, max_age)
+
 _seps = set(['/', os.sep])
 def _contains_slash(item):
     for sep in _seps:
@@ -13,6 +13,7 @@ from pyramid.interfaces import ISecuredView
 from pyramid.interfaces import IView
 from pyramid.interfaces import IViewClassifier
 from pyramid.interfaces import ISession
+from pyramid.interfaces import ISessionStore
 
 from pyramid.compat import PY3
 from pyramid.compat import PYPY
@@ -621,7 +622,30 @@ class DummySession(dict):
 
     def get_csrf_token(self):
         return self.get('_csrft_', None)
-        
+
+@implementer(ISessionStore)
+class DummySessionStore(object):
+    """ A dictionary-backed :class:`pyramid.interfaces.ISessionStore` for
+    use in unit tests of code which uses
+    :func:`pyramid.session.ServerSideSessionFactoryConfig`.  Saved values
+    are kept in the ``sessions`` dictionary, keyed by session id; the
+    ``timeouts`` dictionary records the timeout passed along with each
+    one.  Values never expire."""
+    def __init__(self):
+        self.sessions = {}
+        self.timeouts = {}
+
+    def load(self, session_id):
+        return self.sessions.get(session_id)
+
+    def save(self, session_id, value, timeout):
+        self.sessions[session_id] = value
+        self.timeouts[session_id] = timeout
+
+    def delete(self, session_id):
+        self.sessions.pop(session_id, None)
+        self.timeouts.pop(session_id, None)
+
 @implementer(IRequest)
 class DummyRequest(DeprecatedRequestMethodsMixin, URLMethodsMixin,
                    CallbackMethodsMixin):
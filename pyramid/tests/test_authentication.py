@@ -142,6 +142,47 @@ class TestCallbackAuthenticationPolicyDebugging(unittest.TestCase):
             "effective_principals: returning effective principals: "
             "['system.Everyone', 'system.Authenticated', 'fred']")
 
+class TestPrincipalCache(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.authentication import PrincipalCache
+        return PrincipalCache(**kw)
+
+    def test_get_set(self):
+        cache = self._makeOne()
+        self.assertEqual(cache.get('fred'), None)
+        cache.set('fred', ['group:a'])
+        self.assertEqual(cache.get('fred'), ['group:a'])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_timeout(self):
+        cache = self._makeOne(timeout=-1)
+        cache.set('fred', ['group:a'])
+        self.assertEqual(cache.get('fred'), None)
+        self.assertEqual(cache._cache.get('fred'), None)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_max_size(self):
+        cache = self._makeOne(max_size=1)
+        cache.set('fred', [])
+        cache.set('bob', [])
+        self.assertEqual(cache.get('fred'), None)
+        self.assertEqual(cache.get('bob'), [])
+
+    def test_invalidate(self):
+        cache = self._makeOne()
+        cache.set('fred', [])
+        cache.set('bob', [])
+        cache.invalidate('fred')
+        cache.invalidate('fred')
+        self.assertEqual(cache.get('fred'), None)
+        self.assertEqual(cache.get('bob'), [])
+
+    def test_clear(self):
+        cache = self._makeOne()
+        cache.set('fred', [])
+        cache.clear()
+        self.assertEqual(cache.get('fred'), None)
+
 class TestRepozeWho1AuthenticationPolicy(unittest.TestCase):
     def _getTargetClass(self):
         from pyramid.authentication import RepozeWho1AuthenticationPolicy
@@ -319,6 +360,83 @@ class TestRemoteUserAuthenticationPolicy(unittest.TestCase):
         self.assertEqual(policy.effective_principals(request),
                          [Everyone, Authenticated, 'fred'])
 
+    def test_callback_remembered_for_request(self):
+        from pyramid.security import Everyone
+        from pyramid.security import Authenticated
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return ['group:editors']
+        request = DummyRequest({'REMOTE_USER':'fred'})
+        policy = self._makeOne(callback=callback)
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+        self.assertEqual(policy.effective_principals(request),
+                         [Everyone, Authenticated, 'fred', 'group:editors'])
+        self.assertEqual(calls, ['fred'])
+        policy.effective_principals(DummyRequest({'REMOTE_USER':'fred'}))
+        self.assertEqual(calls, ['fred', 'fred'])
+
+    def test_callback_unhashable_userid(self):
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return []
+        request = DummyRequest({'REMOTE_USER':['fred']})
+        policy = self._makeOne(callback=callback)
+        self.assertEqual(policy.authenticated_userid(request), ['fred'])
+        self.assertEqual(policy.authenticated_userid(request), ['fred'])
+        self.assertEqual(len(calls), 2)
+
+    def test_callback_principal_cache(self):
+        from pyramid.authentication import PrincipalCache
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return ['group:editors']
+        cache = PrincipalCache()
+        policy = self._getTargetClass()(callback=callback,
+                                        principal_cache=cache)
+        for i in range(3):
+            request = DummyRequest({'REMOTE_USER':'fred'})
+            self.assertEqual(policy.effective_principals(request)[-1],
+                             'group:editors')
+        self.assertEqual(calls, ['fred'])
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        cache.invalidate('fred')
+        policy.effective_principals(DummyRequest({'REMOTE_USER':'fred'}))
+        self.assertEqual(calls, ['fred', 'fred'])
+
+    def test_callback_principal_cache_unknown_user_not_cached(self):
+        from pyramid.authentication import PrincipalCache
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return None
+        cache = PrincipalCache()
+        policy = self._getTargetClass()(callback=callback,
+                                        principal_cache=cache)
+        for i in range(2):
+            request = DummyRequest({'REMOTE_USER':'fred'})
+            self.assertEqual(policy.authenticated_userid(request), None)
+        self.assertEqual(calls, ['fred', 'fred'])
+
+    def test_callback_forgotten_by_forget(self):
+        from pyramid.registry import Registry
+        from pyramid.interfaces import IAuthenticationPolicy
+        from pyramid.security import forget
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return None
+        request = DummyRequest({'REMOTE_USER':'fred'}, registry=Registry())
+        policy = self._makeOne(callback=callback)
+        request.registry.registerUtility(policy, IAuthenticationPolicy)
+        self.assertEqual(policy.authenticated_userid(request), None)
+        self.assertEqual(policy.authenticated_userid(request), None)
+        forget(request)
+        self.assertEqual(policy.authenticated_userid(request), None)
+        self.assertEqual(calls, ['fred', 'fred'])
+
     def test_remember(self):
         request = DummyRequest({'REMOTE_USER':'fred'})
         policy = self._makeOne()
@@ -348,6 +466,22 @@ class TestAutkTktAuthenticationPolicy(unittest.TestCase):
             include_ip=False, timeout=None, reissue_time=None,
             )
         self.assertEqual(inst.callback, None)
+        self.assertEqual(inst.principal_cache, None)
+
+    def test_principal_cache(self):
+        from pyramid.authentication import PrincipalCache
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return ['group:editors']
+        cache = PrincipalCache()
+        policy = self._makeOne(callback, {'userid':'fred'},
+                               principal_cache=cache)
+        self.assertEqual(policy.authenticated_userid(DummyRequest({})),
+                         'fred')
+        self.assertEqual(policy.authenticated_userid(DummyRequest({})),
+                         'fred')
+        self.assertEqual(calls, ['fred'])
 
     def test_class_implements_IAuthenticationPolicy(self):
         from zope.interface.verify import verifyClass
@@ -606,10 +740,55 @@ class TestAuthTktCookieHelper(unittest.TestCase):
     
     def test_identify_cookie_timed_out(self):
         helper = self._makeOne('secret', timeout=1)
-        request = self._makeRequest({'HTTP_COOKIE':'auth_tkt=bogus'})
+        request = self._makeRequest('bogus')
         result = helper.identify(request)
         self.assertEqual(result, None)
 
+    def test_identify_verified_ticket_remembered(self):
+        helper = self._makeOne('secret', include_ip=True)
+        helper.auth_tkt.tokens = ['a']
+        helper.auth_tkt.user_data = 'userid_type:int'
+        helper.auth_tkt.userid = '1'
+        result = helper.identify(self._makeRequest('ticket'))
+        self.assertEqual(result['userid'], 1)
+        result['tokens'].append('b')
+        helper.auth_tkt.parse_raise = True
+        request = self._makeRequest('ticket')
+        result = helper.identify(request)
+        self.assertEqual(result['userid'], 1)
+        self.assertEqual(result['tokens'], ['a'])
+        self.assertEqual(request.environ['REMOTE_USER_TOKENS'], ['a'])
+        # another cookie, or the same cookie from another address, is parsed
+        self.assertEqual(helper.identify(self._makeRequest('other')), None)
+        request = self._makeRequest('ticket')
+        request.environ['REMOTE_ADDR'] = '2.2.2.2'
+        self.assertEqual(helper.identify(request), None)
+
+    def test_identify_bad_ticket_not_remembered(self):
+        helper = self._makeOne('secret')
+        helper.auth_tkt.parse_raise = True
+        self.assertEqual(helper.identify(self._makeRequest('ticket')), None)
+        helper.auth_tkt.parse_raise = False
+        self.assertTrue(helper.identify(self._makeRequest('ticket')))
+
+    def test_identify_remembered_ticket_times_out(self):
+        helper = self._makeOne('secret', timeout=10)
+        helper.now = 5
+        self.assertTrue(helper.identify(self._makeRequest('ticket')))
+        helper.now = 11
+        self.assertEqual(helper.identify(self._makeRequest('ticket')), None)
+        self.assertEqual(helper._verified, {})
+
+    def test_identify_verified_cache_size(self):
+        helper = self._makeOne('secret')
+        helper.verified_cache_size = 2
+        helper.identify(self._makeRequest('ticket1'))
+        helper.identify(self._makeRequest('ticket2'))
+        self.assertEqual(len(helper._verified), 2)
+        helper.identify(self._makeRequest('ticket3'))
+        self.assertEqual(list(helper._verified.keys()),
+                         [('ticket3', '0.0.0.0')])
+
     def test_identify_cookie_reissue(self):
         import time
         helper = self._makeOne('secret', timeout=10, reissue_time=0)
@@ -1017,8 +1196,21 @@ class TestSessionAuthenticationPolicy(unittest.TestCase):
         from pyramid.authentication import SessionAuthenticationPolicy
         return SessionAuthenticationPolicy
 
-    def _makeOne(self, callback=None, prefix=''):
-        return self._getTargetClass()(prefix=prefix, callback=callback)
+    def _makeOne(self, callback=None, prefix='', **kw):
+        return self._getTargetClass()(prefix=prefix, callback=callback, **kw)
+
+    def test_principal_cache(self):
+        from pyramid.authentication import PrincipalCache
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return []
+        cache = PrincipalCache()
+        policy = self._makeOne(callback, principal_cache=cache)
+        for i in range(2):
+            request = DummyRequest(session={'userid':'fred'})
+            self.assertEqual(len(policy.effective_principals(request)), 3)
+        self.assertEqual(calls, ['fred'])
 
     def test_class_implements_IAuthenticationPolicy(self):
         from zope.interface.verify import verifyClass
@@ -119,6 +119,211 @@ class TestACLAuthorizationPolicy(unittest.TestCase):
             result.acl,
             '<No ACL found on any object in resource lineage>')
 
+    def test_permits_long_acl(self):
+        from pyramid.security import Allow
+        from pyramid.security import Deny
+        from pyramid.security import Everyone
+        from pyramid.security import DENY_ALL
+        context = DummyContext()
+        context.__acl__ = _padded([(Deny, 'wilma', 'edit'),
+                                   (Allow, 'fred', ('view', 'edit')),
+                                   DENY_ALL])
+        policy = self._makeOne()
+        for i in range(2):
+            result = policy.permits(context, [Everyone, 'fred'], 'edit')
+            self.assertEqual(result, True)
+            self.assertTrue(result.ace is context.__acl__[1])
+            self.assertTrue(result.acl is context.__acl__)
+            self.assertTrue(result.context is context)
+            result = policy.permits(context, ['fred', 'wilma'], 'edit')
+            self.assertEqual(result, False)
+            self.assertEqual(result.ace, (Deny, 'wilma', 'edit'))
+            result = policy.permits(context, [Everyone, 'fred'], 'delete')
+            self.assertEqual(result, False)
+            self.assertEqual(result.ace, DENY_ALL)
+            result = policy.permits(context, ['barney'], 'view')
+            self.assertEqual(result, False)
+            self.assertEqual(result.ace, '<default deny>')
+
+    def test_permits_compiled_acls_per_policy(self):
+        from pyramid.security import Allow
+        context = DummyContext()
+        context.__acl__ = _padded([(Allow, 'fred', 'view')])
+        policy = self._makeOne()
+        for i in range(2):
+            self.assertEqual(policy.permits(context, ['fred'], 'view'), True)
+        self.assertEqual(list(policy._compiled_acls), [id(context.__acl__)])
+        self.assertEqual(self._makeOne()._compiled_acls, {})
+
+    def test_subclass_not_calling_init(self):
+        from pyramid.security import Allow
+        class Policy(self._getTargetClass()):
+            def __init__(self, x):
+                self.x = x
+        context = DummyContext()
+        context.__acl__ = _padded([(Allow, 'fred', 'view')])
+        policy = Policy(1)
+        for i in range(2):
+            self.assertEqual(policy.permits(context, ['fred'], 'view'), True)
+        self.assertEqual(policy.permits_many([context], ['fred'], ['view']),
+                         [{'view':True}])
+        self.assertEqual(
+            policy.principals_allowed_by_permission(context, 'view'),
+            set(['fred']))
+
+    def test_permits_acl_mutated_between_calls(self):
+        from pyramid.security import Allow
+        from pyramid.security import Deny
+        context = DummyContext()
+        context.__acl__ = _padded([(Allow, 'fred', 'view')])
+        policy = self._makeOne()
+        for i in range(2):
+            self.assertEqual(policy.permits(context, ['fred'], 'view'), True)
+        context.__acl__.insert(0, (Deny, 'fred', 'view'))
+        result = policy.permits(context, ['fred'], 'view')
+        self.assertEqual(result, False)
+        self.assertEqual(result.ace, (Deny, 'fred', 'view'))
+
+    def test_permits_permission_list_mutated_between_calls(self):
+        from pyramid.security import Allow
+        perms = ['view']
+        context = DummyContext()
+        context.__acl__ = _padded([(Allow, 'fred', perms)])
+        policy = self._makeOne()
+        for i in range(2):
+            self.assertEqual(policy.permits(context, ['fred'], 'edit'), False)
+        perms.append('edit')
+        self.assertEqual(policy.permits(context, ['fred'], 'edit'), True)
+
+    def test_permits_returns_ace_object_from_acl(self):
+        from pyramid.security import Allow
+        ace = [Allow, 'fred', 'view']
+        context = DummyContext()
+        context.__acl__ = _padded([ace])
+        policy = self._makeOne()
+        for i in range(2):
+            result = policy.permits(context, ['fred'], 'view')
+            self.assertTrue(result.ace is ace)
+
+    def test_permits_string_permission_is_not_a_container(self):
+        from pyramid.security import Allow
+        context = DummyContext()
+        context.__acl__ = [(Allow, 'fred', 'view')]
+        policy = self._makeOne()
+        self.assertEqual(policy.permits(context, ['fred'], 'vie'), False)
+
+    def test_permits_acl_iterator(self):
+        from pyramid.security import Allow
+        context = DummyContext()
+        context.__acl__ = iter([(Allow, 'fred', 'view')])
+        policy = self._makeOne()
+        self.assertEqual(policy.permits(context, ['fred'], 'view'), True)
+
+    def test_permits_custom_permission_container(self):
+        from pyramid.security import Allow
+        class Container(object):
+            def __iter__(self):
+                return iter(())
+            def __contains__(self, other):
+                return other.startswith('v')
+        context = DummyContext()
+        context.__acl__ = [(Allow, 'fred', Container())]
+        policy = self._makeOne()
+        self.assertEqual(policy.permits(context, ['fred'], 'view'), True)
+        self.assertEqual(policy.permits(context, ['fred'], 'edit'), False)
+
+    def test_permits_unhashable_permission(self):
+        from pyramid.security import Allow
+        from pyramid.security import ALL_PERMISSIONS
+        context = DummyContext()
+        context.__acl__ = _padded([(Allow, 'fred', ALL_PERMISSIONS)])
+        policy = self._makeOne()
+        for i in range(2):
+            self.assertEqual(policy.permits(context, ['fred'], ['view']),
+                             True)
+
+    def test_permits_malformed_ace(self):
+        from pyramid.security import Allow
+        context = DummyContext()
+        context.__acl__ = [(Allow, 'fred')]
+        policy = self._makeOne()
+        self.assertRaises(ValueError, policy.permits, context, ['fred'],
+                          'view')
+
+    def test_permits_many(self):
+        from pyramid.security import Allow
+        from pyramid.security import Deny
+        from pyramid.security import Everyone
+        from pyramid.security import DENY_ALL
+        root = DummyContext(__name__='', __parent__=None)
+        root.__acl__ = [(Allow, Everyone, 'view'), DENY_ALL]
+        community = DummyContext(__name__='community', __parent__=root)
+        community.__acl__ = [(Allow, 'fred', 'edit')]
+        blog = DummyContext(__name__='blog', __parent__=community)
+        entry = DummyContext(__name__='entry', __parent__=blog)
+        entry.__acl__ = [(Deny, 'fred', 'edit'), (Allow, 'fred', 'delete')]
+        orphan = DummyContext()
+        bare = DummyContext(__name__='bare', __parent__=orphan)
+        bare.__acl__ = [(Allow, 'wilma', 'view')]
+        contexts = [entry, blog, community, root, orphan, bare, blog]
+        permissions = ['view', 'edit', 'delete', 'admin']
+        policy = self._makeOne()
+        principals = [Everyone, 'fred']
+        results = policy.permits_many(contexts, principals, permissions)
+        self.assertEqual(len(results), len(contexts))
+        for context, answers in zip(contexts, results):
+            self.assertEqual(sorted(answers), sorted(permissions))
+            for permission in permissions:
+                expected = policy.permits(context, principals, permission)
+                result = answers[permission]
+                self.assertEqual(result.__class__, expected.__class__)
+                self.assertEqual(result.ace, expected.ace)
+                self.assertTrue(result.acl is expected.acl or
+                                result.acl == expected.acl)
+                self.assertTrue(result.context is expected.context)
+                self.assertEqual(result.permission, permission)
+                self.assertTrue(result.principals is principals)
+
+    def test_permits_many_consults_shared_acls_once(self):
+        from pyramid.security import Allow
+        from pyramid.security import DENY_ALL
+        consulted = []
+        class Resource(object):
+            def __init__(self, name, parent):
+                self.__name__ = name
+                self.__parent__ = parent
+            @property
+            def __acl__(self):
+                consulted.append(self.__name__)
+                return [(Allow, 'fred', 'view')]
+        root = Resource('root', None)
+        folder = Resource('folder', root)
+        items = [DummyContext(__name__=str(i), __parent__=folder)
+                 for i in range(3)]
+        policy = self._makeOne()
+        results = policy.permits_many(items, ['wilma'], ['view', 'edit'])
+        self.assertEqual(sorted(consulted),
+                         ['folder', 'folder', 'root', 'root'])
+        self.assertEqual(results[2]['view'].ace, '<default deny>')
+        self.assertTrue(results[2]['view'].context is items[2])
+
+    def test_permits_many_stops_at_first_match(self):
+        from pyramid.security import Allow
+        class Root(object):
+            __parent__ = None
+            @property
+            def __acl__(self):
+                raise AssertionError('consulted')
+        context = DummyContext(__parent__=Root())
+        context.__acl__ = [(Allow, 'fred', 'view')]
+        policy = self._makeOne()
+        results = policy.permits_many([context], ['fred'], ['view'])
+        self.assertEqual(results[0]['view'], True)
+
+    def test_permits_many_no_contexts(self):
+        policy = self._makeOne()
+        self.assertEqual(policy.permits_many([], ['fred'], ['view']), [])
+
     def test_principals_allowed_by_permission_direct(self):
         from pyramid.security import Allow
         from pyramid.security import DENY_ALL
@@ -192,10 +397,259 @@ class TestACLAuthorizationPolicy(unittest.TestCase):
         self.assertEqual(result, [])
         
 
+class TestACLAuthorizationPolicy_principals_allowed_remembered(
+    unittest.TestCase):
+    def setUp(self):
+        from pyramid.security import Allow
+        from pyramid.security import Deny
+        self.root = DummyContext(__name__='', __parent__=None)
+        self.root.__acl__ = [(Allow, 'chrism', ('read', 'write')),
+                             (Allow, 'fred', 'read')]
+        self.folder = DummyContext(__name__='folder', __parent__=self.root)
+        self.folder.__acl__ = [(Deny, 'fred', 'read'),
+                               (Allow, 'wilma', ['read'])]
+        self.item = DummyContext(__name__='item', __parent__=self.folder)
+        from pyramid.authorization import ACLAuthorizationPolicy
+        self.policy = ACLAuthorizationPolicy()
+
+    def _callFUT(self, context, permission='read'):
+        return self.policy.principals_allowed_by_permission(context,
+                                                            permission)
+
+    def test_remembered(self):
+        self.assertEqual(self._callFUT(self.item), set(['chrism', 'wilma']))
+        memo = self.policy._allowed_principals
+        entry = memo[id(self.folder)][1]['read']
+        self.assertTrue(memo[id(self.folder)][0]() is self.folder)
+        self.assertTrue(entry[1] is memo[id(self.root)][1]['read'][3])
+        self.assertEqual(self._callFUT(self.item), set(['chrism', 'wilma']))
+        self.assertTrue(memo[id(self.folder)][1]['read'] is entry)
+
+    def test_remembered_per_policy(self):
+        from pyramid.authorization import ACLAuthorizationPolicy
+        self._callFUT(self.item)
+        other = ACLAuthorizationPolicy()
+        self.assertEqual(other._allowed_principals, {})
+        self.assertEqual(
+            other.principals_allowed_by_permission(self.item, 'read'),
+            set(['chrism', 'wilma']))
+
+    def test_resources_not_kept_alive(self):
+        import gc
+        import weakref
+        self._callFUT(self.item)
+        ref = weakref.ref(self.folder)
+        del self.item, self.folder
+        gc.collect()
+        self.assertEqual(ref(), None)
+        self.assertEqual(list(self.policy._allowed_principals),
+                         [id(self.root)])
+
+    def test_not_weakly_referenceable(self):
+        from pyramid.security import Allow
+        class Resource(object):
+            __slots__ = ('__name__', '__parent__', '__acl__')
+        resource = Resource()
+        resource.__name__ = 'resource'
+        resource.__parent__ = self.root
+        resource.__acl__ = [(Allow, 'barney', 'read')]
+        self.assertEqual(self._callFUT(resource),
+                         set(['barney', 'chrism', 'fred']))
+        self.assertFalse(id(resource) in self.policy._allowed_principals)
+
+    def test_result_is_a_copy(self):
+        result = self._callFUT(self.item)
+        result.add('barney')
+        self.assertEqual(self._callFUT(self.item), set(['chrism', 'wilma']))
+
+    def test_acl_replaced(self):
+        from pyramid.security import Allow
+        self._callFUT(self.item)
+        self.root.__acl__ = [(Allow, 'barney', 'read')]
+        self.assertEqual(self._callFUT(self.item), set(['barney', 'wilma']))
+
+    def test_acl_changed_in_place(self):
+        from pyramid.security import Deny
+        from pyramid.security import Everyone
+        self.assertEqual(self._callFUT(self.item, 'write'), set(['chrism']))
+        self.folder.__acl__[1][2].append('write')
+        self.assertEqual(self._callFUT(self.item, 'write'),
+                         set(['chrism', 'wilma']))
+        self._callFUT(self.item)
+        self.folder.__acl__.insert(0, (Deny, Everyone, 'read'))
+        self.assertEqual(self._callFUT(self.item), set())
+
+    def test_moved(self):
+        from pyramid.security import Allow
+        other = DummyContext(__name__='other', __parent__=None)
+        other.__acl__ = [(Allow, 'barney', 'read')]
+        self._callFUT(self.item)
+        self.folder.__parent__ = other
+        self.assertEqual(self._callFUT(self.item), set(['barney', 'wilma']))
+
+    def test_acl_iterator(self):
+        from pyramid.security import Allow
+        self.item.__acl__ = iter([(Allow, 'barney', 'read')])
+        self.assertEqual(self._callFUT(self.item),
+                         set(['barney', 'chrism', 'wilma']))
+
+    def test_string_permission_is_not_a_container(self):
+        self.assertEqual(self._callFUT(self.item, 'rea'), set())
+
+    def test_unhashable_permission(self):
+        self.assertEqual(self._callFUT(self.item, ['read']), set())
+
+    def test_memo_full(self):
+        from pyramid import authorization
+        old = authorization._allowed_principals_max
+        authorization._allowed_principals_max = 1
+        try:
+            self.assertEqual(self._callFUT(self.item),
+                             set(['chrism', 'wilma']))
+            self.assertEqual(list(self.policy._allowed_principals),
+                             [id(self.folder)])
+        finally:
+            authorization._allowed_principals_max = old
+
+class Test_CompiledACL(unittest.TestCase):
+    def _makeOne(self, acl):
+        from pyramid.authorization import _CompiledACL
+        return _CompiledACL(acl)
+
+    def test_table(self):
+        from pyramid.security import Allow
+        from pyramid.security import Deny
+        from pyramid.security import Everyone
+        from pyramid.security import DENY_ALL
+        compiled = self._makeOne([
+            (Allow, 'fred', ('view', 'edit')),
+            (Deny, 'wilma', 'edit'),
+            (Allow, 'wilma', ['view', 'view']),
+            DENY_ALL,
+            (Allow, 'barney', 'edit'),
+            ])
+        self.assertEqual(compiled.table('edit'),
+                         {'fred':(0, Allow),
+                          'wilma':(1, Deny),
+                          Everyone:(3, Deny),
+                          'barney':(4, Allow)})
+        self.assertEqual(compiled.table('view'),
+                         {'fred':(0, Allow),
+                          'wilma':(2, Allow),
+                          Everyone:(3, Deny)})
+
+    def test_table_memoized(self):
+        from pyramid.security import Allow
+        compiled = self._makeOne([(Allow, 'fred', 'view')])
+        table = compiled.table('view')
+        self.assertTrue(compiled.table('view') is table)
+        self.assertEqual(compiled.table('edit'), {})
+
+    def test_first(self):
+        from pyramid.security import Allow
+        from pyramid.security import Deny
+        compiled = self._makeOne([(Allow, 'fred', 'view'),
+                                  (Deny, 'wilma', 'view')])
+        self.assertEqual(compiled.first(['wilma', 'fred'], 'view'),
+                         (0, Allow))
+        self.assertEqual(compiled.first(set(['wilma']), 'view'), (1, Deny))
+        self.assertEqual(compiled.first(['barney'], 'view'), None)
+
+    def test_first_unhashable_principal(self):
+        from pyramid.security import Allow
+        compiled = self._makeOne([(Allow, 'fred', 'view')])
+        self.assertEqual(compiled.first([['x'], 'fred'], 'view'),
+                         (0, Allow))
+
+    def test_first_principals_not_a_builtin_container(self):
+        from pyramid.security import Allow
+        class Principals(object):
+            def __contains__(self, other):
+                return other == 'fred'
+        compiled = self._makeOne([(Allow, 'fred', 'view')])
+        self.assertEqual(compiled.first(Principals(), 'view'), (0, Allow))
+
+    def test_first_unhashable_permission(self):
+        from pyramid.authorization import _marker
+        from pyramid.security import Allow
+        compiled = self._makeOne([(Allow, 'fred', 'view')])
+        self.assertTrue(compiled.first(['fred'], ['view']) is _marker)
+
+    def test_custom_permission_container(self):
+        from pyramid.security import Allow
+        class Container(object):
+            def __iter__(self):
+                return iter(())
+        self.assertRaises(TypeError, self._makeOne,
+                          [(Allow, 'fred', Container())])
+
+class Test_compile(unittest.TestCase):
+    def setUp(self):
+        self.compiled_acls = {}
+
+    def _callFUT(self, acl):
+        from pyramid.authorization import _compile
+        return _compile(acl, self.compiled_acls)
+
+    def test_compiled_when_seen_again(self):
+        from pyramid.security import Allow
+        acl = [(Allow, 'fred', 'view')]
+        self.assertEqual(self._callFUT(acl), None)
+        compiled = self._callFUT(acl)
+        self.assertEqual(compiled.table('view'), {'fred':(0, Allow)})
+        self.assertTrue(self._callFUT(acl) is compiled)
+
+    def test_recompiled_when_changed(self):
+        from pyramid.security import Allow
+        from pyramid.security import Deny
+        acl = [[Allow, 'fred', ['view']]]
+        self._callFUT(acl)
+        compiled = self._callFUT(acl)
+        acl[0][2].append('edit')
+        self.assertEqual(self._callFUT(acl), None)
+        self.assertEqual(self._callFUT(acl).table('edit'),
+                         {'fred':(0, Allow)})
+        acl[0][0] = Deny
+        self.assertEqual(self._callFUT(acl), None)
+
+    def test_immutable(self):
+        from pyramid.security import Allow
+        acl = ((Allow, 'fred', ('view',)),)
+        self._callFUT(acl)
+        self.assertEqual(self.compiled_acls[id(acl)][1], None)
+
+    def test_uncompilable(self):
+        from pyramid.security import Allow
+        acl = [(Allow, ['fred'], 'view')]
+        self._callFUT(acl)
+        self.assertEqual(self._callFUT(acl), None)
+
+    def test_malformed(self):
+        from pyramid.security import Allow
+        self.assertEqual(self._callFUT([(Allow, 'fred')]), None)
+
+    def test_full(self):
+        from pyramid import authorization
+        from pyramid.security import Allow
+        old = authorization._compiled_acls_max
+        authorization._compiled_acls_max = 1
+        try:
+            acl = [(Allow, 'fred', 'view')]
+            self._callFUT([(Allow, 'barney', 'view')])
+            self._callFUT(acl)
+            self.assertEqual(list(self.compiled_acls), [id(acl)])
+        finally:
+            authorization._compiled_acls_max = old
+
 class DummyContext:
     def __init__(self, *arg, **kw):
         self.__dict__.update(kw)
 
+def _padded(acl):
+    # long enough to be compiled rather than scanned
+    from pyramid.security import Allow
+    return acl + [(Allow, 'nobody', 'nothing%s' % i) for i in range(10)]
+
 
 VIEW = 'view'
 EDIT = 'edit'
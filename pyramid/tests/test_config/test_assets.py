@@ -147,6 +147,36 @@ class TestOverrideProvider(unittest.TestCase):
         reg = get_current_registry()
         reg.registerUtility(overrides, IPackageOverrides, name=name)
 
+    def test__get_overrides_memoized(self):
+        import pyramid.tests.test_config
+        from pyramid.threadlocal import get_current_registry
+        provider = self._makeOne(pyramid.tests.test_config)
+        self.assertEqual(provider._get_overrides(), None)
+        reg = get_current_registry()
+        self.assertEqual(reg._package_overrides,
+                         {'pyramid.tests.test_config':None})
+        overrides = DummyOverrides(None)
+        self._registerOverrides(overrides)
+        self.assertTrue(provider._get_overrides() is overrides)
+        reg._package_overrides['pyramid.tests.test_config'] = 'memoized'
+        self.assertEqual(provider._get_overrides(), 'memoized')
+
+    def test__get_overrides_not_a_pyramid_registry(self):
+        import pyramid.tests.test_config
+        from zope.interface.registry import Components
+        from pyramid.interfaces import IPackageOverrides
+        from pyramid.threadlocal import manager
+        reg = Components()
+        overrides = DummyOverrides(None)
+        reg.registerUtility(overrides, IPackageOverrides,
+                            name='pyramid.tests.test_config')
+        provider = self._makeOne(pyramid.tests.test_config)
+        manager.push({'registry':reg, 'request':None})
+        try:
+            self.assertTrue(provider._get_overrides() is overrides)
+        finally:
+            manager.pop()
+
     def test_get_resource_filename_no_overrides(self):
         import os
         resource_name = 'test_assets.py'
@@ -374,6 +404,16 @@ class TestPackageOverrides(unittest.TestCase):
         override = po.overrides[0]
         self.assertEqual(override.__class__, FileOverride)
 
+    def test_insert_increments_generation(self):
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        before = po.generation
+        po.insert('foo.pt', 'package', 'bar.pt')
+        self.assertEqual(po.generation, before + 1)
+        other = self._makeOne(DummyPackage('other'))
+        other.insert('foo.pt', 'package', 'bar.pt')
+        self.assertEqual(po.generation, before + 2)
+
     def test_insert_emptystring(self):
         # XXX is this a valid case for a directory?
         from pyramid.config.assets import DirectoryOverride
@@ -393,6 +433,60 @@ class TestPackageOverrides(unittest.TestCase):
         self.assertEqual(list(po.search_path('whatever')),
                          [('package', 'name')])
 
+    def _insertOverrides(self, po):
+        po.insert('', 'p0', '')
+        po.insert('foo/', 'p1', 'bar/')
+        po.insert('foo/a.pt', 'p2', 'x.pt')
+        po.insert('foo/sub/', 'p3', '')
+        po.insert('foo/', 'p4', 'baz/')
+
+    def test_search_path_indexed(self):
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        self._insertOverrides(po)
+        self.assertEqual(list(po.search_path('foo/sub/a.pt')),
+                         [('p4', 'baz/sub/a.pt'), ('p3', 'a.pt'),
+                          ('p1', 'bar/sub/a.pt'), ('p0', 'foo/sub/a.pt')])
+        self.assertEqual(list(po.search_path('foo/a.pt')),
+                         [('p4', 'baz/a.pt'), ('p2', 'x.pt'),
+                          ('p1', 'bar/a.pt'), ('p0', 'foo/a.pt')])
+        self.assertEqual(list(po.search_path('foobar.pt')),
+                         [('p0', 'foobar.pt')])
+        self.assertEqual(list(po.search_path('foo/')),
+                         [('p4', 'baz/'), ('p1', 'bar/'), ('p0', 'foo/')])
+
+    def test_search_path_indexed_same_as_unindexed(self):
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        self._insertOverrides(po)
+        names = ['foo/sub/a.pt', 'foo/a.pt', 'foobar.pt', 'foo/', 'foo',
+                 'other/foo/a.pt', '']
+        for name in names:
+            expected = [o(name) for o in po.overrides if o(name) is not None]
+            self.assertEqual(list(po.search_path(name)), expected)
+
+    def test_search_path_memoized(self):
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        po.insert('foo/', 'p1', 'bar/')
+        self.assertEqual(list(po.search_path('foo/a.pt')),
+                         [('p1', 'bar/a.pt')])
+        self.assertEqual(po._searched.get('foo/a.pt'), (('p1', 'bar/a.pt'),))
+        po.insert('foo/a.pt', 'p2', 'x.pt')
+        self.assertEqual(po._searched.get('foo/a.pt'), None)
+        self.assertEqual(list(po.search_path('foo/a.pt')),
+                         [('p2', 'x.pt'), ('p1', 'bar/a.pt')])
+
+    def test_search_path_unindexable(self):
+        from pyramid.config.assets import DirectoryOverride
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        po.insert('foo/', 'p1', 'bar/')
+        po.overrides = [DirectoryOverride('foo', 'p2', 'baz')] + po.overrides
+        self.assertEqual(list(po.search_path('foobar.pt')),
+                         [('p2', 'bazbar.pt')])
+        self.assertEqual(po._index, False)
+
     def test_get_filename(self):
         import os
         overrides = [ DummyOverride(None), DummyOverride(
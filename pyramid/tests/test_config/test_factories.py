@@ -58,6 +58,15 @@ class TestFactoriesMixin(unittest.TestCase):
         self.assertEqual(config.registry.getUtility(ISessionFactory),
                          dummyfactory)
 
+    def test_set_traversal_cache(self):
+        from pyramid.interfaces import ITraversalCache
+        cache = object()
+        config = self._makeOne()
+        config.set_traversal_cache(cache)
+        self.assertEqual(config.registry.queryUtility(ITraversalCache), None)
+        config.commit()
+        self.assertEqual(config.registry.getUtility(ITraversalCache), cache)
+
     def test_set_session_factory_dottedname(self):
         from pyramid.interfaces import ISessionFactory
         config = self._makeOne()
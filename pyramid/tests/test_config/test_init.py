@@ -400,6 +400,18 @@ class ConfiguratorTests(unittest.TestCase):
         self.assertEqual(settings['debug_authorization'], False)
         self.assertEqual(settings['mysetting'], True)
 
+    def test_setup_registry_resource_path_cache(self):
+        from pyramid.registry import Registry
+        from pyramid.traversal import ResourcePathCache
+        reg = Registry()
+        config = self._makeOne(reg)
+        config.setup_registry()
+        self.assertEqual(reg.resource_path_cache, None)
+        reg = Registry()
+        config = self._makeOne(reg)
+        config.setup_registry(settings={'pyramid.resource_path_cache':'t'})
+        self.assertEqual(reg.resource_path_cache.__class__, ResourcePathCache)
+
     def test_setup_registry_debug_logger_None_default(self):
         from pyramid.registry import Registry
         from pyramid.interfaces import IDebugLogger
@@ -29,6 +29,18 @@ class RoutesConfiguratorMixinTests(unittest.TestCase):
         config = self._makeOne()
         mapper = config.get_routes_mapper()
         self.assertEqual(mapper.routelist, [])
+        self.assertEqual(mapper.compiled, False)
+
+    def test_get_routes_mapper_not_yet_registered_compiled_routes(self):
+        config = self._makeOne(settings={'pyramid.compiled_routes':'true'})
+        mapper = config.get_routes_mapper()
+        self.assertEqual(mapper.compiled, True)
+
+    def test_get_routes_mapper_not_yet_registered_route_match_cache(self):
+        config = self._makeOne(
+            settings={'pyramid.route_match_cache_size':'100'})
+        mapper = config.get_routes_mapper()
+        self.assertEqual(mapper.cache_size, 100)
 
     def test_get_routes_mapper_already_registered(self):
         from pyramid.interfaces import IRoutesMapper
@@ -130,6 +130,79 @@ class TestSettings(unittest.TestCase):
         self.assertEqual(result['prevent_http_cache'], True)
         self.assertEqual(result['pyramid.prevent_http_cache'], True)
 
+    def test_compiled_routes(self):
+        settings = self._makeOne({})
+        self.assertEqual(settings['compiled_routes'], False)
+        self.assertEqual(settings['pyramid.compiled_routes'], False)
+        result = self._makeOne({'compiled_routes':'false'})
+        self.assertEqual(result['compiled_routes'], False)
+        self.assertEqual(result['pyramid.compiled_routes'], False)
+        result = self._makeOne({'compiled_routes':'t'})
+        self.assertEqual(result['compiled_routes'], True)
+        self.assertEqual(result['pyramid.compiled_routes'], True)
+        result = self._makeOne({'pyramid.compiled_routes':'t'})
+        self.assertEqual(result['compiled_routes'], True)
+        self.assertEqual(result['pyramid.compiled_routes'], True)
+        result = self._makeOne({}, {'PYRAMID_COMPILED_ROUTES':'1'})
+        self.assertEqual(result['compiled_routes'], True)
+        self.assertEqual(result['pyramid.compiled_routes'], True)
+        result = self._makeOne({'compiled_routes':'false',
+                                'pyramid.compiled_routes':'1'})
+        self.assertEqual(result['compiled_routes'], True)
+        self.assertEqual(result['pyramid.compiled_routes'], True)
+        result = self._makeOne({'compiled_routes':'false',
+                                'pyramid.compiled_routes':'f'},
+                               {'PYRAMID_COMPILED_ROUTES':'1'})
+        self.assertEqual(result['compiled_routes'], True)
+        self.assertEqual(result['pyramid.compiled_routes'], True)
+
+    def test_resource_path_cache(self):
+        settings = self._makeOne({})
+        self.assertEqual(settings['resource_path_cache'], False)
+        self.assertEqual(settings['pyramid.resource_path_cache'], False)
+        result = self._makeOne({'resource_path_cache':'t'})
+        self.assertEqual(result['resource_path_cache'], True)
+        self.assertEqual(result['pyramid.resource_path_cache'], True)
+        result = self._makeOne({'pyramid.resource_path_cache':'t'})
+        self.assertEqual(result['resource_path_cache'], True)
+        self.assertEqual(result['pyramid.resource_path_cache'], True)
+        result = self._makeOne({}, {'PYRAMID_RESOURCE_PATH_CACHE':'1'})
+        self.assertEqual(result['resource_path_cache'], True)
+        self.assertEqual(result['pyramid.resource_path_cache'], True)
+        result = self._makeOne({'resource_path_cache':'false',
+                                'pyramid.resource_path_cache':'f'},
+                               {'PYRAMID_RESOURCE_PATH_CACHE':'1'})
+        self.assertEqual(result['resource_path_cache'], True)
+        self.assertEqual(result['pyramid.resource_path_cache'], True)
+
+    def test_route_match_cache_size(self):
+        settings = self._makeOne({})
+        self.assertEqual(settings['route_match_cache_size'], 0)
+        self.assertEqual(settings['pyramid.route_match_cache_size'], 0)
+        result = self._makeOne({'route_match_cache_size':'100'})
+        self.assertEqual(result['route_match_cache_size'], 100)
+        self.assertEqual(result['pyramid.route_match_cache_size'], 100)
+        result = self._makeOne({'pyramid.route_match_cache_size':'100'})
+        self.assertEqual(result['route_match_cache_size'], 100)
+        self.assertEqual(result['pyramid.route_match_cache_size'], 100)
+        result = self._makeOne({}, {'PYRAMID_ROUTE_MATCH_CACHE_SIZE':'10'})
+        self.assertEqual(result['route_match_cache_size'], 10)
+        self.assertEqual(result['pyramid.route_match_cache_size'], 10)
+        result = self._makeOne({'route_match_cache_size':'100',
+                                'pyramid.route_match_cache_size':'5'},
+                               {'PYRAMID_ROUTE_MATCH_CACHE_SIZE':'10'})
+        self.assertEqual(result['route_match_cache_size'], 10)
+        self.assertEqual(result['pyramid.route_match_cache_size'], 10)
+
+    def test_route_match_cache_size_invalid(self):
+        from pyramid.exceptions import ConfigurationError
+        self.assertRaises(ConfigurationError, self._makeOne,
+                          {'route_match_cache_size':'-1'})
+        self.assertRaises(ConfigurationError, self._makeOne,
+                          {'pyramid.route_match_cache_size':'many'})
+        self.assertRaises(ConfigurationError, self._makeOne,
+                          {}, {'PYRAMID_ROUTE_MATCH_CACHE_SIZE':'-5'})
+
     def test_reload_templates(self):
         settings = self._makeOne({})
         self.assertEqual(settings['reload_templates'], False)
@@ -1463,6 +1463,17 @@ class TestViewsConfigurationMixin(unittest.TestCase):
         config.add_static_view('static', static_path)
         self.assertEqual(info.added,
                          [(config, 'static', static_path, {})])
+
+    def test_add_static_view_cachebust_here_relative(self):
+        from pyramid.interfaces import IStaticURLInfo
+        info = DummyStaticURLInfo()
+        config = self._makeOne(autocommit=True)
+        config.registry.registerUtility(info, IStaticURLInfo)
+        config.add_static_view('static', 'files', cachebust='manifest.json')
+        self.assertEqual(
+            info.added,
+            [(config, 'static', 'pyramid.tests.test_config:files',
+              {'cachebust':'pyramid.tests.test_config:manifest.json'})])
     
     def test_set_forbidden_view(self):
         from pyramid.renderers import null_renderer
@@ -2522,6 +2533,23 @@ class TestViewDeriver(unittest.TestCase):
         request.url = 'url'
         self.assertEqual(result(None, request), response)
 
+    def test_secured_view_permitted_remembered_for_request(self):
+        from pyramid.interfaces import IAuthenticationPolicy
+        from pyramid.security import has_permission
+        response = DummyResponse()
+        view = lambda *arg: response
+        self.config.registry.settings = {}
+        self._registerSecurityPolicy(True)
+        deriver = self._makeOne(permission='view')
+        result = deriver(view)
+        request = self._makeRequest()
+        self.assertEqual(result(None, request), response)
+        policy = self.config.registry.getUtility(IAuthenticationPolicy)
+        policy.permitted = False
+        self.assertEqual(result.__permitted__(None, request), True)
+        self.assertEqual(has_permission('view', None, request), True)
+        self.assertEqual(has_permission('edit', None, request), False)
+
     def test_secured_view_raises_forbidden_no_name(self):
         from pyramid.interfaces import IAuthenticationPolicy
         from pyramid.interfaces import IAuthorizationPolicy
@@ -3303,8 +3331,9 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_registration_miss(self):
         inst = self._makeOne()
-        registrations = [(None, 'spec', 'route_name'),
-                         ('http://example.com/foo/', 'package:path/', None)]
+        registrations = [(None, 'spec', 'route_name', None),
+                         ('http://example.com/foo/', 'package:path/', None,
+                          None)]
         inst._get_registrations = lambda *x: registrations
         request = self._makeRequest()
         result = inst.generate('package:path/abc', request)
@@ -3312,7 +3341,8 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_registration_no_registry_on_request(self):
         inst = self._makeOne()
-        registrations = [('http://example.com/foo/', 'package:path/', None)]
+        registrations = [('http://example.com/foo/', 'package:path/', None,
+                          None)]
         inst._get_registrations = lambda *x: registrations
         request = self._makeRequest()
         del request.registry
@@ -3321,7 +3351,8 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_slash_in_name1(self):
         inst = self._makeOne()
-        registrations = [('http://example.com/foo/', 'package:path/', None)]
+        registrations = [('http://example.com/foo/', 'package:path/', None,
+                          None)]
         inst._get_registrations = lambda *x: registrations
         request = self._makeRequest()
         result = inst.generate('package:path/abc', request)
@@ -3329,15 +3360,43 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_slash_in_name2(self):
         inst = self._makeOne()
-        registrations = [('http://example.com/foo/', 'package:path/', None)]
+        registrations = [('http://example.com/foo/', 'package:path/', None,
+                          None)]
         inst._get_registrations = lambda *x: registrations
         request = self._makeRequest()
         result = inst.generate('package:path/', request)
         self.assertEqual(result, 'http://example.com/foo/')
 
+    def test_generate_url_with_manifest(self):
+        from pyramid.static import StaticManifest
+        inst = self._makeOne()
+        manifest = StaticManifest({'abc.css':'abc.123.css'})
+        registrations = [('http://example.com/foo/', 'package:path/', None,
+                          manifest)]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        result = inst.generate('package:path/abc.css', request)
+        self.assertEqual(result, 'http://example.com/foo/abc.123.css')
+        result = inst.generate('package:path/def.css', request)
+        self.assertEqual(result, 'http://example.com/foo/def.css')
+
+    def test_generate_route_url_with_manifest(self):
+        from pyramid.static import StaticManifest
+        inst = self._makeOne()
+        manifest = StaticManifest({'abc.css':'abc.123.css'})
+        registrations = [(None, 'package:path/', '__viewname/', manifest)]
+        inst._get_registrations = lambda *x: registrations
+        def route_url(n, **kw):
+            self.assertEqual(kw, {'subpath':'abc.123.css'})
+            return 'url'
+        request = self._makeRequest()
+        request.route_url = route_url
+        result = inst.generate('package:path/abc.css', request)
+        self.assertEqual(result, 'url')
+
     def test_generate_route_url(self):
         inst = self._makeOne()
-        registrations = [(None, 'package:path/', '__viewname/')]
+        registrations = [(None, 'package:path/', '__viewname/', None)]
         inst._get_registrations = lambda *x: registrations
         def route_url(n, **kw):
             self.assertEqual(n, '__viewname/')
@@ -3351,23 +3410,26 @@ class TestStaticURLInfo(unittest.TestCase):
     def test_add_already_exists(self):
         inst = self._makeOne()
         config = self._makeConfig(
-            [('http://example.com/', 'package:path/', None)])
+            [('http://example.com/', 'package:path/', None, None)])
         inst.add(config, 'http://example.com', 'anotherpackage:path')
-        expected = [('http://example.com/',  'anotherpackage:path/', None)]
+        expected = [('http://example.com/',  'anotherpackage:path/', None,
+                     None)]
         self._assertRegistrations(config, expected)
 
     def test_add_url_withendslash(self):
         inst = self._makeOne()
         config = self._makeConfig()
         inst.add(config, 'http://example.com/', 'anotherpackage:path')
-        expected = [('http://example.com/', 'anotherpackage:path/', None)]
+        expected = [('http://example.com/', 'anotherpackage:path/', None,
+                     None)]
         self._assertRegistrations(config, expected)
 
     def test_add_url_noendslash(self):
         inst = self._makeOne()
         config = self._makeConfig()
         inst.add(config, 'http://example.com', 'anotherpackage:path')
-        expected = [('http://example.com/', 'anotherpackage:path/', None)]
+        expected = [('http://example.com/', 'anotherpackage:path/', None,
+                     None)]
         self._assertRegistrations(config, expected)
 
     def test_add_viewname(self):
@@ -3376,18 +3438,110 @@ class TestStaticURLInfo(unittest.TestCase):
         config = self._makeConfig()
         inst = self._makeOne()
         inst.add(config, 'view', 'anotherpackage:path', cache_max_age=1)
-        expected = [(None, 'anotherpackage:path/', '__view/')]
+        expected = [(None, 'anotherpackage:path/', '__view/', None)]
         self._assertRegistrations(config, expected)
         self.assertEqual(config.route_args, ('__view/', 'view/*subpath'))
         self.assertEqual(config.view_kw['permission'], NO_PERMISSION_REQUIRED)
         self.assertEqual(config.view_kw['view'].__class__, static_view)
 
+    def test_add_viewname_with_block_size(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', block_size=1024)
+        self.assertEqual(config.view_kw['view'].block_size, 1024)
+        self.assertFalse('block_size' in config.route_kw)
+
+    def test_add_viewname_with_file_cache(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        cache = object()
+        inst.add(config, 'view', 'anotherpackage:path', file_cache=cache)
+        self.assertEqual(config.view_kw['view'].file_cache, cache)
+        self.assertFalse('file_cache' in config.route_kw)
+
+    def test_add_viewname_with_precompressed(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', precompressed=True)
+        self.assertEqual(config.view_kw['view'].precompressed, True)
+        self.assertFalse('precompressed' in config.route_kw)
+
+    def test_add_viewname_with_max_ranges(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', max_ranges=5)
+        self.assertEqual(config.view_kw['view'].max_ranges, 5)
+        self.assertFalse('max_ranges' in config.route_kw)
+
+    def test_add_viewname_with_resolve_cache_size(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', resolve_cache_size=10)
+        self.assertEqual(config.view_kw['view'].resolved.size, 10)
+        self.assertFalse('resolve_cache_size' in config.route_kw)
+
+    def test_add_viewname_resolve_cache_off_by_default(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path')
+        self.assertEqual(config.view_kw['view'].resolved, None)
+
+    def test_add_viewname_with_cachebust_true(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'pyramid.tests:fixtures/static',
+                 cachebust=True)
+        manifest = config.view_kw['view'].manifest
+        self.assertTrue(manifest.busted_path('index.html').startswith(
+            'index.'))
+        self.assertNotEqual(manifest.busted_path('index.html'), 'index.html')
+        registration = config.registry._static_url_registrations[0]
+        self.assertTrue(registration[3] is manifest)
+        self.assertFalse('cachebust' in config.route_kw)
+
+    def test_add_viewname_with_cachebust_manifest_file(self):
+        import os
+        import shutil
+        import tempfile
+        from pyramid.static import StaticManifest
+        tempdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tempdir, 'manifest.json')
+            StaticManifest({'a.css':'a.1.css'}).save(filename)
+            config = self._makeConfig()
+            inst = self._makeOne()
+            inst.add(config, 'view', 'anotherpackage:path',
+                     cachebust=filename)
+        finally:
+            shutil.rmtree(tempdir)
+        manifest = config.view_kw['view'].manifest
+        self.assertEqual(manifest.paths, {'a.css':'a.1.css'})
+
+    def test_add_viewname_with_cachebust_manifest(self):
+        from pyramid.static import StaticManifest
+        config = self._makeConfig()
+        inst = self._makeOne()
+        manifest = StaticManifest({})
+        inst.add(config, 'view', 'anotherpackage:path', cachebust=manifest)
+        self.assertTrue(config.view_kw['view'].manifest is manifest)
+
+    def test_add_url_with_cachebust_manifest(self):
+        from pyramid.static import StaticManifest
+        config = self._makeConfig()
+        inst = self._makeOne()
+        manifest = StaticManifest({})
+        inst.add(config, 'http://example.com/', 'anotherpackage:path',
+                 cachebust=manifest)
+        expected = [('http://example.com/', 'anotherpackage:path/', None,
+                     manifest)]
+        self._assertRegistrations(config, expected)
+
     def test_add_viewname_with_route_prefix(self):
         config = self._makeConfig()
         config.route_prefix = '/abc'
         inst = self._makeOne()
         inst.add(config, 'view', 'anotherpackage:path',)
-        expected = [(None, 'anotherpackage:path/', '__/abc/view/')]
+        expected = [(None, 'anotherpackage:path/', '__/abc/view/', None)]
         self._assertRegistrations(config, expected)
         self.assertEqual(config.route_args, ('__/abc/view/', 'view/*subpath'))
 
@@ -32,6 +32,26 @@ class TestRegistry(unittest.TestCase):
                                              [IDummyEvent], Interface)
         self.assertEqual(registry.has_listeners, True)
 
+    def test_registerUtility_clears_package_overrides(self):
+        registry = self._makeOne()
+        registry._package_overrides['package'] = None
+        registry.registerUtility(DummyEvent(), IDummyEvent)
+        self.assertEqual(registry._package_overrides, {})
+
+    def test_unregisterUtility_clears_package_overrides(self):
+        registry = self._makeOne()
+        event = DummyEvent()
+        registry.registerUtility(event, IDummyEvent)
+        registry._package_overrides['package'] = None
+        registry.unregisterUtility(event, IDummyEvent)
+        self.assertEqual(registry._package_overrides, {})
+
+    def test___init___clears_package_overrides(self):
+        registry = self._makeOne()
+        registry._package_overrides['package'] = None
+        registry.__init__('name')
+        self.assertEqual(registry._package_overrides, {})
+
     def test__get_settings(self):
         registry = self._makeOne()
         registry._settings = 'foo'
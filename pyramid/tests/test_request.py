@@ -41,6 +41,14 @@ class TestRequest(unittest.TestCase):
         r = self._makeOne({'PATH_INFO':'/'})
         self.assertEqual(r.exception, None)
 
+    def test_application_url_cached(self):
+        r = self._makeOne({'wsgi.url_scheme':'http',
+                           'SERVER_NAME':'example.com',
+                           'SERVER_PORT':'80',
+                           'PATH_INFO':'/'})
+        self.assertEqual(r.application_url, 'http://example.com')
+        self.assertTrue('_application_url' in r.__dict__)
+
     def test_matchdict_defaults_to_None(self):
         r = self._makeOne({'PATH_INFO':'/'})
         self.assertEqual(r.matchdict, None)
@@ -267,6 +275,62 @@ class TestRequest(unittest.TestCase):
         request = self._makeOne({'REQUEST_METHOD':'GET'})
         self.assertRaises(ValueError, getattr, request, 'json_body')
 
+class TestRequest_application_url(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.request import Request
+        environ = {'wsgi.url_scheme':'http',
+                   'SERVER_NAME':'example.com',
+                   'SERVER_PORT':'80',
+                   'SCRIPT_NAME':'/app'}
+        environ.update(kw)
+        return Request(environ)
+
+    def test_it(self):
+        request = self._makeOne()
+        self.assertEqual(request.application_url, 'http://example.com/app')
+
+    def test_cached(self):
+        request = self._makeOne()
+        request.application_url
+        key, url = request.__dict__['_application_url']
+        request.__dict__['_application_url'] = (key, 'http://cached')
+        self.assertEqual(request.application_url, 'http://cached')
+
+    def test_host_changed(self):
+        request = self._makeOne()
+        request.application_url
+        request.environ['HTTP_HOST'] = 'example.org:8080'
+        self.assertEqual(request.application_url,
+                         'http://example.org:8080/app')
+
+    def test_scheme_changed(self):
+        request = self._makeOne(SERVER_PORT='443')
+        request.application_url
+        request.environ['wsgi.url_scheme'] = 'https'
+        self.assertEqual(request.application_url, 'https://example.com/app')
+
+    def test_script_name_changed(self):
+        request = self._makeOne()
+        request.application_url
+        request.script_name = '/other'
+        self.assertEqual(request.application_url, 'http://example.com/other')
+
+    def test_used_by_route_url(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne()
+        config = testing.setUp()
+        try:
+            mapper = DummyRoutesMapper(route=DummyRoute('/1/2/3'))
+            config.registry.registerUtility(mapper, IRoutesMapper)
+            request.registry = config.registry
+            self.assertEqual(request.route_url('flub'),
+                             'http://example.com/app/1/2/3')
+            request.environ['HTTP_HOST'] = 'example.org'
+            self.assertEqual(request.route_url('flub'),
+                             'http://example.org/app/1/2/3')
+        finally:
+            testing.tearDown()
+
 class TestRequestDeprecatedMethods(unittest.TestCase):
     def setUp(self):
         self.config = testing.setUp()
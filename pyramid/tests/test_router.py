@@ -192,6 +192,29 @@ class TestRouter(unittest.TestCase):
         self.assertFalse('debug_notfound' in why.args[0])
         self.assertEqual(len(logger.messages), 0)
 
+    def test_call_traverser_default_sets_request_attrs(self):
+        from pyramid.interfaces import IViewClassifier
+        context = DummyContext()
+        self._registerRootFactory(context)
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        environ = self._makeEnviron(PATH_INFO='/view/a/b')
+        self._registerView(self.config.derive_view(view), 'view',
+                           IViewClassifier, None, None)
+        router = self._makeOne()
+        start_response = DummyStartResponse()
+        result = router(environ, start_response)
+        self.assertEqual(result, ['Hello world'])
+        request = view.request
+        self.assertEqual(request.context, context)
+        self.assertEqual(request.root, context)
+        self.assertEqual(request.view_name, 'view')
+        self.assertEqual(request.subpath, ('a', 'b'))
+        self.assertEqual(request.traversed, ())
+        self.assertEqual(request.virtual_root, context)
+        self.assertEqual(request.virtual_root_path, ())
+
     def test_traverser_raises_notfound_class(self):
         from pyramid.httpexceptions import HTTPNotFound
         environ = self._makeEnviron()
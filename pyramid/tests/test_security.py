@@ -194,6 +194,159 @@ class TestHasPermission(unittest.TestCase):
         _registerAuthorizationPolicy(registry, 'yo')
         self.assertEqual(self._callFUT('view', None, request), 'yo')
 
+    def test_result_remembered_for_request(self):
+        request = _makeRequest()
+        _registerAuthenticationPolicy(request.registry, ['fred'])
+        policy = _registerAuthorizationPolicy(request.registry, 'yo')
+        context = DummyContext()
+        self.assertEqual(self._callFUT('view', context, request), 'yo')
+        policy.result = 'no'
+        self.assertEqual(self._callFUT('view', context, request), 'yo')
+        self.assertEqual(self._callFUT('edit', context, request), 'no')
+        self.assertEqual(self._callFUT('view', DummyContext(), request),
+                         'no')
+        self.assertEqual(self._callFUT('view', context, _makeRequest()),
+                         True)
+
+    def test_result_forgotten_by_forget(self):
+        from pyramid.security import forget
+        request = _makeRequest()
+        authn_policy = _registerAuthenticationPolicy(request.registry,
+                                                     ['fred'])
+        policy = _registerAuthorizationPolicy(request.registry, 'yo')
+        context = DummyContext()
+        self.assertEqual(self._callFUT('view', context, request), 'yo')
+        policy.result = 'no'
+        authn_policy.result = ['fred', 'group:admins']
+        self.assertEqual(self._callFUT('view', context, request), 'yo')
+        forget(request)
+        self.assertEqual(self._callFUT('view', context, request), 'no')
+
+    def test_principals_remembered_for_request(self):
+        request = _makeRequest()
+        authn_policy = _registerAuthenticationPolicy(request.registry,
+                                                     ['fred'])
+        calls = []
+        def effective_principals(request):
+            calls.append(request)
+            return ['fred']
+        authn_policy.effective_principals = effective_principals
+        _registerAuthorizationPolicy(request.registry, 'yo')
+        self._callFUT('view', None, request)
+        self._callFUT('edit', None, request)
+        self.assertEqual(calls, [request])
+
+    def test_unhashable_principals(self):
+        request = _makeRequest()
+        _registerAuthenticationPolicy(request.registry, [['fred']])
+        _registerAuthorizationPolicy(request.registry, 'yo')
+        self.assertEqual(self._callFUT('view', None, request), 'yo')
+        self.assertEqual(self._callFUT('view', None, request), 'yo')
+
+    def test_result_not_remembered_for_principals_iterator(self):
+        request = _makeRequest()
+        authn_policy = _registerAuthenticationPolicy(request.registry, None)
+        authn_policy.effective_principals = lambda r: iter(['fred'])
+        policy = _registerAuthorizationPolicy(request.registry, 'yo')
+        self.assertEqual(self._callFUT('view', None, request), 'yo')
+        policy.result = 'no'
+        self.assertEqual(self._callFUT('view', None, request), 'no')
+
+    def test_result_not_remembered_for_unhashable_permission(self):
+        request = _makeRequest()
+        _registerAuthenticationPolicy(request.registry, ['fred'])
+        policy = _registerAuthorizationPolicy(request.registry, 'yo')
+        self.assertEqual(self._callFUT(['view'], None, request), 'yo')
+        policy.result = 'no'
+        self.assertEqual(self._callFUT(['view'], None, request), 'no')
+
+class TestHasPermissions(unittest.TestCase):
+    def setUp(self):
+        cleanUp()
+
+    def tearDown(self):
+        cleanUp()
+
+    def _callFUT(self, *arg):
+        from pyramid.security import has_permissions
+        return has_permissions(*arg)
+
+    def test_no_authentication_policy(self):
+        request = _makeRequest()
+        result = self._callFUT(['view', 'edit'], [None, None], request)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(sorted(result[1]), ['edit', 'view'])
+        self.assertEqual(result[1]['edit'], True)
+        self.assertEqual(result[1]['edit'].msg,
+                         'No authentication policy in use.')
+
+    def test_authentication_policy_no_authorization_policy(self):
+        request = _makeRequest()
+        _registerAuthenticationPolicy(request.registry, None)
+        self.assertRaises(ValueError, self._callFUT, ['view'], [None],
+                          request)
+
+    def test_policy_without_permits_many(self):
+        request = _makeRequest()
+        _registerAuthenticationPolicy(request.registry, ['fred'])
+        _registerAuthorizationPolicy(request.registry, 'yo')
+        result = self._callFUT(['view', 'edit'], [DummyContext()], request)
+        self.assertEqual(result, [{'view':'yo', 'edit':'yo'}])
+
+    def test_no_registry_on_request(self):
+        from pyramid.threadlocal import get_current_registry
+        request = DummyRequest({})
+        registry = get_current_registry()
+        _registerAuthenticationPolicy(registry, ['fred'])
+        _registerAuthorizationPolicy(registry, 'yo')
+        result = self._callFUT(('view',), iter([None]), request)
+        self.assertEqual(result, [{'view':'yo'}])
+
+    def test_policy_with_permits_many(self):
+        request = _makeRequest()
+        _registerAuthenticationPolicy(request.registry, ['fred'])
+        policy = _registerAuthorizationPolicy(request.registry, 'yo')
+        policy.permits_many = policy.permits_many_
+        contexts = [DummyContext(), DummyContext()]
+        result = self._callFUT(['view', 'edit'], contexts, request)
+        self.assertEqual(result, [{'view':'yo', 'edit':'yo'}] * 2)
+        self.assertEqual(policy.batches,
+                         [(contexts, ['fred'], ['view', 'edit'])])
+
+    def test_answers_remembered_for_request(self):
+        from pyramid.security import has_permission
+        request = _makeRequest()
+        _registerAuthenticationPolicy(request.registry, ['fred'])
+        policy = _registerAuthorizationPolicy(request.registry, 'yo')
+        policy.permits_many = policy.permits_many_
+        first, second = DummyContext(), DummyContext()
+        self.assertEqual(has_permission('view', first, request), 'yo')
+        self.assertEqual(has_permission('edit', first, request), 'yo')
+        policy.result = 'no'
+        result = self._callFUT(['view', 'edit'], [first, second], request)
+        self.assertEqual(result, [{'view':'yo', 'edit':'yo'},
+                                  {'view':'no', 'edit':'no'}])
+        self.assertEqual(policy.batches,
+                         [([second], ['fred'], ['view', 'edit'])])
+        policy.result = 'maybe'
+        self.assertEqual(has_permission('edit', second, request), 'no')
+        result = self._callFUT(['view'], [second, first], request)
+        self.assertEqual(result, [{'view':'no'}, {'view':'yo'}])
+        self.assertEqual(len(policy.batches), 1)
+
+    def test_principals_iterator_not_remembered(self):
+        request = _makeRequest()
+        authn_policy = _registerAuthenticationPolicy(request.registry, None)
+        authn_policy.effective_principals = lambda r: iter(['fred'])
+        policy = _registerAuthorizationPolicy(request.registry, 'yo')
+        policy.permits_many = policy.permits_many_
+        context = DummyContext()
+        self.assertEqual(self._callFUT(['view'], [context], request),
+                         [{'view':'yo'}])
+        self.assertEqual(self._callFUT(['view'], [context], request),
+                         [{'view':'yo'}])
+        self.assertEqual(len(policy.batches), 2)
+
 class TestAuthenticatedUserId(unittest.TestCase):
     def setUp(self):
         cleanUp()
@@ -224,6 +377,48 @@ class TestAuthenticatedUserId(unittest.TestCase):
         result = self._callFUT(request)
         self.assertEqual(result, 'yo')
 
+    def test_remembered_for_request(self):
+        request = _makeRequest()
+        policy = _registerAuthenticationPolicy(request.registry, 'yo')
+        self.assertEqual(self._callFUT(request), 'yo')
+        policy.result = 'other'
+        self.assertEqual(self._callFUT(request), 'yo')
+        self.assertEqual(self._callFUT(_makeRequest()), None)
+
+    def test_none_remembered_for_request(self):
+        request = _makeRequest()
+        policy = _registerAuthenticationPolicy(request.registry, None)
+        self.assertEqual(self._callFUT(request), None)
+        policy.result = 'yo'
+        self.assertEqual(self._callFUT(request), None)
+
+    def test_forgotten_by_remember(self):
+        from pyramid.security import remember
+        request = _makeRequest()
+        policy = _registerAuthenticationPolicy(request.registry, 'yo')
+        self.assertEqual(self._callFUT(request), 'yo')
+        policy.result = 'other'
+        remember(request, 'other')
+        self.assertEqual(self._callFUT(request), 'other')
+
+    def test_different_policy(self):
+        request = _makeRequest()
+        _registerAuthenticationPolicy(request.registry, 'yo')
+        self.assertEqual(self._callFUT(request), 'yo')
+        _registerAuthenticationPolicy(request.registry, 'other')
+        self.assertEqual(self._callFUT(request), 'other')
+
+    def test_request_without_dict(self):
+        class Request(object):
+            __slots__ = ('registry',)
+        from pyramid.registry import Registry
+        request = Request()
+        request.registry = Registry()
+        policy = _registerAuthenticationPolicy(request.registry, 'yo')
+        self.assertEqual(self._callFUT(request), 'yo')
+        policy.result = 'other'
+        self.assertEqual(self._callFUT(request), 'other')
+
 class TestUnauthenticatedUserId(unittest.TestCase):
     def setUp(self):
         cleanUp()
@@ -284,6 +479,40 @@ class TestEffectivePrincipals(unittest.TestCase):
         result = self._callFUT(request)
         self.assertEqual(result, 'yo')
 
+    def test_remembered_for_request(self):
+        request = _makeRequest()
+        policy = _registerAuthenticationPolicy(request.registry, ['fred'])
+        result = self._callFUT(request)
+        self.assertEqual(result, ['fred'])
+        result.append('barney')
+        policy.result = ['wilma']
+        self.assertEqual(self._callFUT(request), ['fred'])
+
+    def test_remembered_set_for_request(self):
+        request = _makeRequest()
+        policy = _registerAuthenticationPolicy(request.registry, set(['fred']))
+        result = self._callFUT(request)
+        self.assertEqual(result, set(['fred']))
+        result.add('barney')
+        policy.result = set(['wilma'])
+        self.assertEqual(self._callFUT(request), set(['fred']))
+
+    def test_forgotten_by_forget(self):
+        from pyramid.security import forget
+        request = _makeRequest()
+        policy = _registerAuthenticationPolicy(request.registry, ['fred'])
+        self.assertEqual(self._callFUT(request), ['fred'])
+        policy.result = ['wilma']
+        forget(request)
+        self.assertEqual(self._callFUT(request), ['wilma'])
+
+    def test_iterator_not_remembered(self):
+        request = _makeRequest()
+        policy = _registerAuthenticationPolicy(request.registry, None)
+        policy.effective_principals = lambda r: iter(['fred'])
+        self.assertEqual(list(self._callFUT(request)), ['fred'])
+        self.assertEqual(list(self._callFUT(request)), ['fred'])
+
 class TestPrincipalsAllowedByPermission(unittest.TestCase):
     def setUp(self):
         cleanUp()
@@ -407,6 +636,12 @@ class DummyAuthorizationPolicy:
     def principals_allowed_by_permission(self, context, permission):
         return self.result
 
+    def permits_many_(self, contexts, principals, permissions):
+        # assigned to ``permits_many`` by the tests which want it
+        self.batches = getattr(self, 'batches', [])
+        self.batches.append((contexts, principals, permissions))
+        return [dict.fromkeys(permissions, self.result) for c in contexts]
+
 def _registerAuthenticationPolicy(reg, result):
     from pyramid.interfaces import IAuthenticationPolicy
     policy = DummyAuthenticationPolicy(result)
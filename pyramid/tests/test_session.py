@@ -56,6 +56,90 @@ class TestUnencryptedCookieSession(unittest.TestCase):
         self.assertEqual(session.invalidate(), None)
         self.assertFalse('a' in session)
 
+    def test_read_sets_cookie(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(time.time(), {'a':1})
+        session = self._makeOne(request)
+        self.assertEqual(session['a'], 1)
+        self.assertEqual(len(request.response_callbacks), 1)
+
+    def test_reissue_time_read_does_not_set_cookie(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(time.time(), {'a':1})
+        session = self._makeOne(request, reissue_time=100)
+        self.assertEqual(session['a'], 1)
+        self.assertEqual(session.get('b'), None)
+        self.assertTrue('a' in session)
+        self.assertFalse(request.response_callbacks)
+
+    def test_reissue_time_read_of_stale_cookie_sets_cookie(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(time.time() - 200,
+                                                     {'a':1})
+        session = self._makeOne(request, reissue_time=100)
+        self.assertEqual(session['a'], 1)
+        self.assertEqual(session.get('a'), 1)
+        self.assertEqual(len(request.response_callbacks), 1)
+
+    def test_reissue_time_write_sets_cookie(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(time.time(), {'a':1})
+        session = self._makeOne(request, reissue_time=100)
+        session['b'] = 2
+        del session['a']
+        self.assertEqual(len(request.response_callbacks), 1)
+        import webob
+        response = webob.Response()
+        request.response_callbacks[0](request, response)
+        self.assertTrue('Set-Cookie' in dict(response.headerlist))
+
+    def test_reissue_time_changed_sets_cookie(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(time.time(), {'a':[]})
+        session = self._makeOne(request, reissue_time=100)
+        session['a'].append(1)
+        self.assertFalse(request.response_callbacks)
+        self.assertEqual(session.changed(), None)
+        session.changed()
+        self.assertEqual(len(request.response_callbacks), 1)
+
+    def test_serializer_roundtrip(self):
+        import webob
+        from pyramid.session import JSONSerializer
+        request = testing.DummyRequest()
+        session = self._makeOne(request, serializer=JSONSerializer())
+        session['a'] = [1]
+        response = webob.Response()
+        request.response_callbacks[0](request, response)
+        cookie = dict(response.headerlist)['Set-Cookie']
+        cookieval = cookie.split(';')[0].split('=', 1)[1]
+        request = testing.DummyRequest()
+        request.cookies['session'] = cookieval
+        session = self._makeOne(request, serializer=JSONSerializer())
+        self.assertEqual(dict(session), {'a':[1]})
+        self.assertFalse(session.new)
+
+    def test_serializer_ignores_legacy_cookie(self):
+        import time
+        from pyramid.session import JSONSerializer
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(time.time(), {'a':1})
+        session = self._makeOne(request, serializer=JSONSerializer())
+        self.assertEqual(dict(session), {})
+
+    def test_reissue_time_flash_sets_cookie(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request, reissue_time=100)
+        self.assertEqual(session.peek_flash(), [])
+        self.assertFalse(request.response_callbacks)
+        session.flash('msg')
+        self.assertEqual(len(request.response_callbacks), 1)
+
     def test__set_cookie_on_exception(self):
         request = testing.DummyRequest()
         request.exception = True
@@ -218,6 +302,29 @@ class Test_manage_accessed(unittest.TestCase):
         wrapper(session, 'a')
         self.assertNotEqual(session.accessed, None)
         
+    def test_reissue_time_not_passed(self):
+        import time
+        request = testing.DummyRequest()
+        session = DummySessionFactory(request)
+        session._reissue_time = 100
+        session._renewed = time.time()
+        wrapper = self._makeOne(session.__class__.get)
+        wrapper(session, 'a')
+        self.assertNotEqual(session.accessed, None)
+        self.assertFalse(session._dirty)
+        self.assertEqual(len(request.response_callbacks), 0)
+
+    def test_reissue_time_passed(self):
+        import time
+        request = testing.DummyRequest()
+        session = DummySessionFactory(request)
+        session._reissue_time = 100
+        session._renewed = time.time() - 200
+        wrapper = self._makeOne(session.__class__.get)
+        wrapper(session, 'a')
+        self.assertTrue(session._dirty)
+        self.assertEqual(len(request.response_callbacks), 1)
+
     def test_already_dirty(self):
         request = testing.DummyRequest()
         session = DummySessionFactory(request)
@@ -314,6 +421,423 @@ class Test_signed_deserialize(unittest.TestCase):
         self.assertRaises(ValueError, self._callFUT, serialized, 'secret')
         
 
+class SerializerTests(object):
+    def test_roundtrip(self):
+        serializer = self._makeOne()
+        data = [1.5, 2, {'a':[1, 'b'], 'c':None}]
+        serialized = serializer.dumps(data)
+        self.assertTrue(isinstance(serialized, bytes))
+        self.assertEqual(serializer.loads(serialized), data)
+
+class TestPickleSerializer(SerializerTests, unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.session import PickleSerializer
+        return PickleSerializer()
+
+class TestJSONSerializer(SerializerTests, unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.session import JSONSerializer
+        return JSONSerializer()
+
+    def test_compact(self):
+        serializer = self._makeOne()
+        self.assertEqual(serializer.dumps({'a':[1, 2]}), b'{"a":[1,2]}')
+
+class TestMarshalSerializer(SerializerTests, unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.session import MarshalSerializer
+        return MarshalSerializer()
+
+class TestZlibSerializer(SerializerTests, unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.session import JSONSerializer
+        from pyramid.session import ZlibSerializer
+        return ZlibSerializer(JSONSerializer())
+
+    def test_compresses(self):
+        serializer = self._makeOne()
+        data = ['abc'] * 100
+        serialized = serializer.dumps(data)
+        self.assertEqual(serialized[:1], b'z')
+        self.assertTrue(len(serialized) < 100)
+        self.assertEqual(serializer.loads(serialized), data)
+
+    def test_not_compressed_when_longer(self):
+        serializer = self._makeOne()
+        serialized = serializer.dumps(1)
+        self.assertEqual(serialized, b'-1')
+        self.assertEqual(serializer.loads(serialized), 1)
+
+class Test_signed_dumps(unittest.TestCase):
+    def _callFUT(self, data, secret):
+        from pyramid.session import JSONSerializer
+        from pyramid.session import signed_dumps
+        return signed_dumps(data, secret, JSONSerializer())
+
+    def test_it(self):
+        import base64
+        import hmac
+        from hashlib import sha256
+        result = self._callFUT([1], 'secret')
+        self.assertFalse('=' in result)
+        packed = base64.urlsafe_b64decode(result + '=' * (-len(result) % 4))
+        sig = hmac.new(b'secret', b'[1]', sha256).digest()
+        self.assertEqual(packed, sig + b'[1]')
+
+class Test_signed_loads(unittest.TestCase):
+    def _callFUT(self, signed, secret, serializer=None):
+        from pyramid.session import JSONSerializer
+        from pyramid.session import signed_loads
+        if serializer is None:
+            serializer = JSONSerializer()
+        return signed_loads(signed, secret, serializer)
+
+    def _dumps(self, data, secret='secret', serializer=None):
+        from pyramid.session import JSONSerializer
+        from pyramid.session import signed_dumps
+        if serializer is None:
+            serializer = JSONSerializer()
+        return signed_dumps(data, secret, serializer)
+
+    def test_it(self):
+        self.assertEqual(self._callFUT(self._dumps([1, 'a']), 'secret'),
+                         [1, 'a'])
+
+    def test_invalid_bits(self):
+        self.assertRaises(ValueError, self._callFUT, self._dumps([1]),
+                          'seekrit')
+
+    def test_invalid_len(self):
+        self.assertRaises(ValueError, self._callFUT, 'abcd', 'secret')
+
+    def test_bad_encoding(self):
+        self.assertRaises(ValueError, self._callFUT, 'a', 'secret')
+
+    def test_other_serializer(self):
+        from pyramid.session import MarshalSerializer
+        signed = self._dumps([1], serializer=MarshalSerializer())
+        self.assertRaises(ValueError, self._callFUT, signed, 'secret')
+
+class TestServerSideSession(unittest.TestCase):
+    def setUp(self):
+        self.store = testing.DummySessionStore()
+
+    def _makeOne(self, request, **kw):
+        from pyramid.session import ServerSideSessionFactoryConfig
+        factory = ServerSideSessionFactoryConfig('secret', self.store, **kw)
+        return factory(request)
+
+    def _makeRequest(self, session_id=None, state=None, accessed=None):
+        import time
+        from pyramid.session import sign_session_id
+        request = testing.DummyRequest()
+        if session_id is not None:
+            request.cookies['session'] = sign_session_id(session_id, 'secret')
+            if state is not None:
+                if accessed is None:
+                    accessed = time.time()
+                self.store.save(session_id, (accessed, 1, state), 1200)
+        return request
+
+    def _respond(self, request):
+        import webob
+        response = webob.Response()
+        for callback in request.response_callbacks:
+            callback(request, response)
+        return response
+
+    def test_instance_conforms(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ISession
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        verifyObject(ISession, session)
+
+    def test_ctor_does_not_load(self):
+        class Store(object):
+            def load(self, session_id):
+                raise AssertionError('loaded')
+        self.store = Store()
+        request = self._makeRequest('abc')
+        session = self._makeOne(request)
+        self.assertEqual(session._cookie_id, 'abc')
+        self.assertFalse(request.response_callbacks)
+
+    def test_ctor_with_bad_cookie(self):
+        request = self._makeRequest()
+        request.cookies['session'] = 'a' * 40 + 'abc'
+        session = self._makeOne(request)
+        self.assertEqual(session._cookie_id, None)
+
+    def test_load_no_cookie(self):
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        self.assertEqual(dict(session.items()), {})
+        self.assertTrue(session.new)
+        self.assertTrue(session.created)
+        self.assertFalse(request.response_callbacks)
+        response = self._respond(request)
+        self.assertFalse('Set-Cookie' in dict(response.headerlist))
+
+    def test_load_still_valid(self):
+        request = self._makeRequest('abc', {'state':1})
+        session = self._makeOne(request)
+        self.assertEqual(session['state'], 1)
+        self.assertFalse(session.new)
+        self.assertEqual(session.created, 1)
+        self.assertFalse(request.response_callbacks)
+
+    def test_load_expired(self):
+        request = self._makeRequest('abc', {'state':1}, accessed=1)
+        session = self._makeOne(request)
+        self.assertFalse('state' in session)
+        self.assertTrue(session.new)
+
+    def test_load_missing(self):
+        request = self._makeRequest('abc')
+        session = self._makeOne(request)
+        self.assertEqual(session.get('state'), None)
+        self.assertTrue(session.new)
+
+    def test_unchanged_not_saved(self):
+        request = self._makeRequest('abc', {'state':1})
+        self.store.timeouts.clear()
+        session = self._makeOne(request)
+        session.get('state')
+        self.assertTrue('state' in session)
+        response = self._respond(request)
+        self.assertEqual(self.store.timeouts, {})
+        self.assertFalse('Set-Cookie' in dict(response.headerlist))
+
+    def test_unchanged_reissued(self):
+        import time
+        request = self._makeRequest('abc', {'state':1},
+                                    accessed=time.time() - 200)
+        self.store.timeouts.clear()
+        session = self._makeOne(request)
+        self.assertEqual(session['state'], 1)
+        response = self._respond(request)
+        self.assertEqual(self.store.timeouts, {'abc':1200})
+        self.assertTrue(self.store.sessions['abc'][0] > time.time() - 200)
+        self.assertFalse('Set-Cookie' in dict(response.headerlist))
+
+    def test_changed_new_session(self):
+        from pyramid.session import unsign_session_id
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        session['a'] = 1
+        response = self._respond(request)
+        cookie = dict(response.headerlist)['Set-Cookie']
+        cookieval = cookie.split(';')[0].split('=', 1)[1]
+        session_id = unsign_session_id(cookieval, 'secret')
+        self.assertEqual(len(session_id), 40)
+        self.assertEqual(self.store.sessions[session_id][2], {'a':1})
+
+    def test_changed_existing_session(self):
+        request = self._makeRequest('abc', {'state':1})
+        session = self._makeOne(request)
+        session['a'] = 2
+        response = self._respond(request)
+        self.assertEqual(self.store.sessions['abc'][2], {'state':1, 'a':2})
+        self.assertFalse('Set-Cookie' in dict(response.headerlist))
+
+    def test_changed_existing_session_with_max_age(self):
+        request = self._makeRequest('abc', {'state':1})
+        session = self._makeOne(request, cookie_max_age=100)
+        session['a'] = 2
+        response = self._respond(request)
+        cookie = dict(response.headerlist)['Set-Cookie']
+        self.assertTrue('Max-Age=100' in cookie)
+
+    def test_changed_callback_added_once(self):
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        session['a'] = 1
+        session['b'] = 2
+        session.changed()
+        self.assertEqual(len(request.response_callbacks), 1)
+
+    def test_emptied_session_deleted(self):
+        request = self._makeRequest('abc', {'state':1})
+        session = self._makeOne(request)
+        del session['state']
+        response = self._respond(request)
+        self.assertEqual(self.store.sessions, {})
+        cookie = dict(response.headerlist)['Set-Cookie']
+        self.assertTrue(cookie.startswith('session=;'))
+
+    def test_empty_new_session_not_saved(self):
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        session['a'] = 1
+        session.clear()
+        response = self._respond(request)
+        self.assertEqual(self.store.sessions, {})
+        self.assertFalse('Set-Cookie' in dict(response.headerlist))
+
+    def test_invalidate(self):
+        request = self._makeRequest('abc', {'state':1})
+        session = self._makeOne(request)
+        self.assertEqual(session.invalidate(), None)
+        self.assertFalse('state' in session)
+        self.assertTrue(session.new)
+        self.assertEqual(self.store.sessions, {})
+        response = self._respond(request)
+        cookie = dict(response.headerlist)['Set-Cookie']
+        self.assertTrue(cookie.startswith('session=;'))
+
+    def test_invalidate_then_changed_issues_new_id(self):
+        request = self._makeRequest('abc', {'state':1})
+        session = self._makeOne(request)
+        session.invalidate()
+        session['a'] = 1
+        self._respond(request)
+        self.assertFalse('abc' in self.store.sessions)
+        self.assertEqual(len(self.store.sessions), 1)
+
+    def test_on_exception_false(self):
+        request = self._makeRequest('abc', {'state':1})
+        request.exception = True
+        session = self._makeOne(request, cookie_on_exception=False)
+        session['a'] = 2
+        self._respond(request)
+        self.assertEqual(self.store.sessions['abc'][2], {'state':1})
+
+    def test_flash_and_csrf(self):
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        session.flash('msg1')
+        session.flash('msg1', allow_duplicate=False)
+        self.assertEqual(session.peek_flash(), ['msg1'])
+        token = session.get_csrf_token()
+        self.assertEqual(session.get_csrf_token(), token)
+        self._respond(request)
+        (value,) = self.store.sessions.values()
+        self.assertEqual(value[2], {'_f_':['msg1'], '_csrft_':token})
+
+class Test_sign_session_id(unittest.TestCase):
+    def test_roundtrip(self):
+        from pyramid.session import sign_session_id
+        from pyramid.session import unsign_session_id
+        signed = sign_session_id('abc', 'secret')
+        self.assertEqual(len(signed), 43)
+        self.assertEqual(unsign_session_id(signed, 'secret'), 'abc')
+        self.assertEqual(unsign_session_id(signed, 'seekrit'), None)
+
+    def test_unsign_malformed(self):
+        from pyramid.session import unsign_session_id
+        self.assertEqual(unsign_session_id('abc', 'secret'), None)
+        self.assertEqual(unsign_session_id('a' * 40, 'secret'), None)
+
+class SessionStoreTests(object):
+    def test_instance_conforms(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ISessionStore
+        verifyObject(ISessionStore, self._makeOne())
+
+    def test_save_load_delete(self):
+        store = self._makeOne()
+        self.assertEqual(store.load('abc'), None)
+        store.save('abc', (1, 2, {'a':1}), 10)
+        self.assertEqual(store.load('abc'), (1, 2, {'a':1}))
+        store.save('abc', (1, 2, {'a':2}), 10)
+        self.assertEqual(store.load('abc'), (1, 2, {'a':2}))
+        store.delete('abc')
+        self.assertEqual(store.load('abc'), None)
+        store.delete('abc')
+
+    def test_expired(self):
+        store = self._makeOne()
+        store.save('abc', {'a':1}, -1)
+        self.assertEqual(store.load('abc'), None)
+
+    def test_loaded_value_is_a_copy(self):
+        store = self._makeOne()
+        value = {'a':[]}
+        store.save('abc', value, 10)
+        value['a'].append(1)
+        store.load('abc')['a'].append(2)
+        self.assertEqual(store.load('abc'), {'a':[]})
+
+class TestMemorySessionStore(SessionStoreTests, unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.session import MemorySessionStore
+        return MemorySessionStore(**kw)
+
+    def test_max_sessions(self):
+        store = self._makeOne(max_sessions=1)
+        store.save('abc', 1, 10)
+        store.save('def', 2, 10)
+        self.assertEqual(store.load('abc'), None)
+        self.assertEqual(store.load('def'), 2)
+
+class TestFileSessionStore(SessionStoreTests, unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+
+    def _makeOne(self):
+        from pyramid.session import FileSessionStore
+        return FileSessionStore(self.directory)
+
+    def test_invalid_session_id(self):
+        store = self._makeOne()
+        self.assertRaises(ValueError, store.load, '../abc')
+
+    def test_corrupt_file(self):
+        import os
+        with open(os.path.join(self.directory, 'abc'), 'wb') as f:
+            f.write(b'garbage')
+        store = self._makeOne()
+        self.assertEqual(store.load('abc'), None)
+
+    def test_save_failure_removes_tempfile(self):
+        import os
+        store = self._makeOne()
+        self.assertRaises(Exception, store.save, 'abc', lambda: None, 10)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_purge_expired(self):
+        import os
+        store = self._makeOne()
+        store.save('abc', 1, -1)
+        store.save('def', 2, 10)
+        store.purge_expired()
+        self.assertEqual(os.listdir(self.directory), ['def'])
+
+class TestSQLiteSessionStore(SessionStoreTests, unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+
+    def _makeOne(self, table='pyramid_sessions'):
+        import os
+        from pyramid.session import SQLiteSessionStore
+        return SQLiteSessionStore(os.path.join(self.directory, 'sessions.db'),
+                                  table=table)
+
+    def test_shared_between_instances(self):
+        self._makeOne().save('abc', 1, 10)
+        self.assertEqual(self._makeOne().load('abc'), 1)
+        self.assertEqual(self._makeOne(table='other').load('abc'), None)
+
+    def test_purge_expired(self):
+        store = self._makeOne()
+        store.save('abc', 1, -1)
+        store.save('def', 2, 10)
+        store.purge_expired()
+        rows = store._connection().execute(
+            'SELECT id FROM pyramid_sessions').fetchall()
+        self.assertEqual([row[0] for row in rows], ['def'])
+
 class DummySessionFactory(dict):
     _dirty = False
     _cookie_name = 'session'
@@ -323,6 +847,8 @@ class DummySessionFactory(dict):
     _cookie_secure = False
     _cookie_httponly = False
     _timeout = 1200
+    _reissue_time = None
+    _renewed = 0
     _secret = 'secret'
     def __init__(self, request):
         self.request = request
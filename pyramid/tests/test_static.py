@@ -118,12 +118,13 @@ class Test_static_view_use_subpath_False(unittest.TestCase):
         context = DummyContext()
         response = inst(context, request)
         self.assertTrue(b'<html>static</html>' in response.body)
-        self.assertEqual(len(response.headerlist), 5)
+        self.assertEqual(len(response.headerlist), 7)
         header_names = [ x[0] for x in response.headerlist ]
         header_names.sort()
         self.assertEqual(header_names,
-                         ['Cache-Control', 'Content-Length', 'Content-Type',
-                          'Expires', 'Last-Modified'])
+                         ['Accept-Ranges', 'Cache-Control', 'Content-Length',
+                          'Content-Type', 'ETag', 'Expires',
+                          'Last-Modified'])
 
     def test_resource_is_file_with_no_cache_max_age(self):
         inst = self._makeOne('pyramid.tests:fixtures/static',
@@ -132,12 +133,55 @@ class Test_static_view_use_subpath_False(unittest.TestCase):
         context = DummyContext()
         response = inst(context, request)
         self.assertTrue(b'<html>static</html>' in response.body)
-        self.assertEqual(len(response.headerlist), 3)
+        self.assertEqual(len(response.headerlist), 5)
         header_names = [ x[0] for x in response.headerlist ]
         header_names.sort()
         self.assertEqual(
             header_names,
-            ['Content-Length', 'Content-Type', 'Last-Modified'])
+            ['Accept-Ranges', 'Content-Length', 'Content-Type', 'ETag',
+             'Last-Modified'])
+
+    def test_resource_is_file_with_wsgi_file_wrapper(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'PATH_INFO':'/index.html',
+                                     'wsgi.file_wrapper':DummyFileWrapper})
+        context = DummyContext()
+        response = inst(context, request)
+        app_iter = response.app_iter
+        self.assertTrue(isinstance(app_iter, DummyFileWrapper))
+        self.assertEqual(app_iter.block_size, 262144)
+        start_response = DummyStartResponse()
+        result = response(request.environ, start_response)
+        self.assertTrue(result is app_iter)
+        try:
+            self.assertTrue(b'<html>static</html>' in b''.join(result))
+        finally:
+            result.close()
+        self.assertTrue(app_iter.file.closed)
+
+    def test_resource_is_file_with_wsgi_file_wrapper_and_block_size(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static', block_size=10)
+        request = self._makeRequest({'PATH_INFO':'/index.html',
+                                     'wsgi.file_wrapper':DummyFileWrapper})
+        context = DummyContext()
+        response = inst(context, request)
+        self.assertEqual(response.app_iter.block_size, 10)
+        response.app_iter.close()
+
+    def test_resource_is_file_with_block_size(self):
+        from pyramid.static import _FileIter
+        inst = self._makeOne('pyramid.tests:fixtures/static', block_size=4)
+        request = self._makeRequest({'PATH_INFO':'/index.html'})
+        context = DummyContext()
+        response = inst(context, request)
+        app_iter = response.app_iter
+        self.assertTrue(isinstance(app_iter, _FileIter))
+        try:
+            chunks = list(app_iter)
+        finally:
+            app_iter.close()
+        self.assertEqual(chunks[0], b'<htm')
+        self.assertTrue(b'<html>static</html>' in b''.join(chunks))
 
     def test_resource_notmodified(self):
         inst = self._makeOne('pyramid.tests:fixtures/static')
@@ -147,11 +191,8 @@ class Test_static_view_use_subpath_False(unittest.TestCase):
         response = inst(context, request)
         start_response = DummyStartResponse()
         app_iter = response(request.environ, start_response)
-        try:
-            self.assertEqual(start_response.status, '304 Not Modified')
-            self.assertEqual(list(app_iter), [])
-        finally:
-            app_iter.close()
+        self.assertEqual(start_response.status, '304 Not Modified')
+        self.assertEqual(b''.join(app_iter), b'')
 
     def test_not_found(self):
         inst = self._makeOne('pyramid.tests:fixtures/static')
@@ -282,12 +323,13 @@ class Test_static_view_use_subpath_True(unittest.TestCase):
         context = DummyContext()
         response = inst(context, request)
         self.assertTrue(b'<html>static</html>' in response.body)
-        self.assertEqual(len(response.headerlist), 5)
+        self.assertEqual(len(response.headerlist), 7)
         header_names = [ x[0] for x in response.headerlist ]
         header_names.sort()
         self.assertEqual(header_names,
-                         ['Cache-Control', 'Content-Length', 'Content-Type',
-                          'Expires', 'Last-Modified'])
+                         ['Accept-Ranges', 'Cache-Control', 'Content-Length',
+                          'Content-Type', 'ETag', 'Expires',
+                          'Last-Modified'])
 
     def test_resource_is_file_with_no_cache_max_age(self):
         inst = self._makeOne('pyramid.tests:fixtures/static',
@@ -297,12 +339,13 @@ class Test_static_view_use_subpath_True(unittest.TestCase):
         context = DummyContext()
         response = inst(context, request)
         self.assertTrue(b'<html>static</html>' in response.body)
-        self.assertEqual(len(response.headerlist), 3)
+        self.assertEqual(len(response.headerlist), 5)
         header_names = [ x[0] for x in response.headerlist ]
         header_names.sort()
         self.assertEqual(
             header_names,
-            ['Content-Length', 'Content-Type', 'Last-Modified'])
+            ['Accept-Ranges', 'Content-Length', 'Content-Type', 'ETag',
+             'Last-Modified'])
 
     def test_resource_notmodified(self):
         inst = self._makeOne('pyramid.tests:fixtures/static')
@@ -313,11 +356,8 @@ class Test_static_view_use_subpath_True(unittest.TestCase):
         response = inst(context, request)
         start_response = DummyStartResponse()
         app_iter = response(request.environ, start_response)
-        try:
-            self.assertEqual(start_response.status, '304 Not Modified')
-            self.assertEqual(list(app_iter), [])
-        finally:
-            app_iter.close()
+        self.assertEqual(start_response.status, '304 Not Modified')
+        self.assertEqual(b''.join(app_iter), b'')
 
     def test_not_found(self):
         inst = self._makeOne('pyramid.tests:fixtures/static')
@@ -327,6 +367,1143 @@ class Test_static_view_use_subpath_True(unittest.TestCase):
         response = inst(context, request)
         self.assertEqual(response.status, '404 Not Found')
 
+class Test_static_view_conditional(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.static import static_view
+        return static_view(*arg, **kw)
+
+    def _makeRequest(self, kw=None):
+        from pyramid.request import Request
+        environ = {
+            'wsgi.url_scheme':'http',
+            'wsgi.version':(1,0),
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'6543',
+            'PATH_INFO':'/index.html',
+            'SCRIPT_NAME':'',
+            'REQUEST_METHOD':'GET',
+            }
+        if kw is not None:
+            environ.update(kw)
+        return Request(environ=environ)
+
+    def _getETag(self, inst):
+        return inst(DummyContext(), self._makeRequest()).etag
+
+    def test_etag_from_stat(self):
+        import os
+        from pyramid.static import _file_etag
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        here = os.path.dirname(__file__)
+        fn = os.path.join(here, 'fixtures', 'static', 'index.html')
+        self.assertEqual(self._getETag(inst), _file_etag(os.stat(fn)))
+
+    def test_if_none_match_matches(self):
+        from pyramid.httpexceptions import HTTPNotModified
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             cache_max_age=600)
+        etag = self._getETag(inst)
+        request = self._makeRequest({'HTTP_IF_NONE_MATCH':'"%s"' % etag})
+        response = inst(DummyContext(), request)
+        self.assertTrue(isinstance(response, HTTPNotModified))
+        self.assertEqual(response.etag, etag)
+        self.assertNotEqual(response.last_modified, None)
+        self.assertNotEqual(response.cache_control.max_age, None)
+        start_response = DummyStartResponse()
+        app_iter = response(request.environ, start_response)
+        self.assertEqual(start_response.status, '304 Not Modified')
+        self.assertEqual(b''.join(app_iter), b'')
+
+    def test_if_none_match_star(self):
+        from pyramid.httpexceptions import HTTPNotModified
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'HTTP_IF_NONE_MATCH':'*'})
+        response = inst(DummyContext(), request)
+        self.assertTrue(isinstance(response, HTTPNotModified))
+
+    def test_if_none_match_differs(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'HTTP_IF_NONE_MATCH':'"foo"',
+                                     'HTTP_IF_MODIFIED_SINCE':
+                                     'Wed, 01 Jan 2020 00:00:00 GMT'})
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.status, '200 OK')
+        self.assertTrue(b'<html>static</html>' in response.body)
+
+    def test_if_modified_since_later(self):
+        from pyramid.httpexceptions import HTTPNotModified
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest()
+        request.if_modified_since = fiveyrsfuture
+        response = inst(DummyContext(), request)
+        self.assertTrue(isinstance(response, HTTPNotModified))
+
+    def test_if_modified_since_earlier(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'HTTP_IF_MODIFIED_SINCE':
+                                     'Thu, 01 Jan 1970 00:00:01 GMT'})
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.status, '200 OK')
+
+    def test_post_not_conditional(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        etag = self._getETag(inst)
+        request = self._makeRequest({'HTTP_IF_NONE_MATCH':'"%s"' % etag,
+                                     'REQUEST_METHOD':'POST'})
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.status, '200 OK')
+
+    def test_filesystem_if_none_match(self):
+        import os
+        from pyramid.httpexceptions import HTTPNotModified
+        here = os.path.dirname(__file__)
+        inst = self._makeOne(os.path.join(here, 'fixtures', 'static'))
+        etag = self._getETag(inst)
+        request = self._makeRequest({'HTTP_IF_NONE_MATCH':'"%s"' % etag})
+        response = inst(DummyContext(), request)
+        self.assertTrue(isinstance(response, HTTPNotModified))
+
+    def test_precompressed_variants_differ(self):
+        from pyramid.httpexceptions import HTTPNotModified
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             precompressed=True)
+        request = self._makeRequest({'PATH_INFO':'/compressed.css'})
+        identity = inst(DummyContext(), request).etag
+        request = self._makeRequest({'PATH_INFO':'/compressed.css',
+                                     'HTTP_ACCEPT_ENCODING':'gzip'})
+        gzipped = inst(DummyContext(), request).etag
+        self.assertNotEqual(identity, gzipped)
+        request = self._makeRequest({'PATH_INFO':'/compressed.css',
+                                     'HTTP_ACCEPT_ENCODING':'gzip',
+                                     'HTTP_IF_NONE_MATCH':'"%s"' % gzipped})
+        response = inst(DummyContext(), request)
+        self.assertTrue(isinstance(response, HTTPNotModified))
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+
+    def test_file_cache_if_none_match(self):
+        from pyramid.httpexceptions import HTTPNotModified
+        from pyramid.static import StaticFileCache
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             file_cache=StaticFileCache())
+        etag = self._getETag(inst)
+        request = self._makeRequest({'HTTP_IF_NONE_MATCH':'"%s"' % etag})
+        response = inst(DummyContext(), request)
+        self.assertTrue(isinstance(response, HTTPNotModified))
+        self.assertEqual(response.etag, etag)
+
+class Test_static_view_file_cache(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.static import static_view
+        from pyramid.static import StaticFileCache
+        self.cache = StaticFileCache()
+        return static_view(file_cache=self.cache, *arg, **kw)
+
+    def _makeRequest(self, kw=None):
+        from pyramid.request import Request
+        environ = {
+            'wsgi.url_scheme':'http',
+            'wsgi.version':(1,0),
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'6543',
+            'PATH_INFO':'/',
+            'SCRIPT_NAME':'',
+            'REQUEST_METHOD':'GET',
+            }
+        if kw is not None:
+            environ.update(kw)
+        return Request(environ=environ)
+
+    def test_package_file_cached(self):
+        from pyramid.static import _CachedFileResponse
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'PATH_INFO':'/index.html'})
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.__class__, _CachedFileResponse)
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(len(self.cache._data), 1)
+        response = inst(DummyContext(), request)
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(len(self.cache._data), 1)
+
+    def test_filesystem_file_cached(self):
+        import os
+        from pyramid.static import _CachedFileResponse
+        here = os.path.dirname(__file__)
+        static = os.path.join(here, 'fixtures', 'static')
+        inst = self._makeOne(static)
+        request = self._makeRequest({'PATH_INFO':'/index.html'})
+        inst(DummyContext(), request)
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.__class__, _CachedFileResponse)
+        self.assertTrue(b'<html>static</html>' in response.body)
+
+    def test_cached_response_headers(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             cache_max_age=600)
+        request = self._makeRequest({'PATH_INFO':'/index.html'})
+        first = inst(DummyContext(), request)
+        second = inst(DummyContext(), request)
+        header_names = sorted([ x[0] for x in second.headerlist ])
+        self.assertEqual(header_names,
+                         ['Accept-Ranges', 'Cache-Control', 'Content-Length',
+                          'Content-Type', 'ETag', 'Expires',
+                          'Last-Modified'])
+        self.assertEqual(second.content_type, first.content_type)
+        self.assertEqual(second.last_modified, first.last_modified)
+        self.assertEqual(second.etag, first.etag)
+
+    def test_cached_notmodified(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'PATH_INFO':'/index.html'})
+        etag = inst(DummyContext(), request).etag
+        request.if_none_match = etag
+        response = inst(DummyContext(), request)
+        start_response = DummyStartResponse()
+        app_iter = response(request.environ, start_response)
+        self.assertEqual(start_response.status, '304 Not Modified')
+        self.assertEqual(b''.join(app_iter), b'')
+
+    def test_directory_index_not_cached(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'PATH_INFO':'/subdir/'})
+        response = inst(DummyContext(), request)
+        self.assertTrue(b'<html>subdir</html>' in response.body)
+        self.assertEqual(self.cache._data, {})
+        request = self._makeRequest({'PATH_INFO':'/subdir'})
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.status, '301 Moved Permanently')
+
+    def test_filesystem_directory_index_not_cached(self):
+        import os
+        here = os.path.dirname(__file__)
+        static = os.path.join(here, 'fixtures', 'static')
+        inst = self._makeOne(static)
+        request = self._makeRequest({'PATH_INFO':'/subdir/'})
+        response = inst(DummyContext(), request)
+        self.assertTrue(b'<html>subdir</html>' in response.body)
+        self.assertEqual(self.cache._data, {})
+
+    def test_not_found_not_cached(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'PATH_INFO':'/notthere.html'})
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.status, '404 Not Found')
+        self.assertEqual(self.cache._data, {})
+
+class Test_static_view_precompressed(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.static import static_view
+        return static_view(precompressed=True, *arg, **kw)
+
+    def _makeRequest(self, kw=None):
+        from pyramid.request import Request
+        environ = {
+            'wsgi.url_scheme':'http',
+            'wsgi.version':(1,0),
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'6543',
+            'PATH_INFO':'/compressed.css',
+            'SCRIPT_NAME':'',
+            'REQUEST_METHOD':'GET',
+            }
+        if kw is not None:
+            environ.update(kw)
+        return Request(environ=environ)
+
+    def _getStatic(self):
+        import os
+        here = os.path.dirname(__file__)
+        return os.path.join(here, 'fixtures', 'static')
+
+    def _assertGzip(self, response):
+        import gzip
+        import io
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        self.assertEqual(response.content_type, 'text/css')
+        body = gzip.GzipFile(fileobj=io.BytesIO(response.body)).read()
+        self.assertEqual(body, b'body { color: red; }\n')
+
+    def _assertIdentity(self, response):
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        self.assertEqual(response.content_type, 'text/css')
+        self.assertEqual(response.body, b'body { color: red; }\n')
+
+    def test_package_accepts_gzip(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'HTTP_ACCEPT_ENCODING':'gzip, deflate'})
+        self._assertGzip(inst(DummyContext(), request))
+
+    def test_package_no_accept_encoding(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest()
+        self._assertIdentity(inst(DummyContext(), request))
+
+    def test_package_gzip_refused(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'HTTP_ACCEPT_ENCODING':'gzip;q=0'})
+        self._assertIdentity(inst(DummyContext(), request))
+
+    def test_filesystem_accepts_gzip(self):
+        inst = self._makeOne(self._getStatic())
+        request = self._makeRequest({'HTTP_ACCEPT_ENCODING':'gzip'})
+        self._assertGzip(inst(DummyContext(), request))
+
+    def test_filesystem_no_accept_encoding(self):
+        inst = self._makeOne(self._getStatic())
+        request = self._makeRequest()
+        self._assertIdentity(inst(DummyContext(), request))
+
+    def test_no_sibling(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'PATH_INFO':'/index.html',
+                                     'HTTP_ACCEPT_ENCODING':'gzip'})
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, None)
+        self.assertTrue(b'<html>static</html>' in response.body)
+
+    def test_not_precompressed(self):
+        from pyramid.static import static_view
+        inst = static_view('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'HTTP_ACCEPT_ENCODING':'gzip'})
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, None)
+
+    def test_with_file_cache(self):
+        from pyramid.static import StaticFileCache
+        from pyramid.static import _CachedFileResponse
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             file_cache=StaticFileCache())
+        gzip_request = self._makeRequest({'HTTP_ACCEPT_ENCODING':'gzip'})
+        request = self._makeRequest()
+        for i in range(2):
+            response = inst(DummyContext(), gzip_request)
+            self.assertEqual(response.__class__, _CachedFileResponse)
+            self._assertGzip(response)
+            response = inst(DummyContext(), request)
+            self.assertEqual(response.__class__, _CachedFileResponse)
+            self._assertIdentity(response)
+
+class Test_static_view_resolve_cache(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.static import static_view
+        kw.setdefault('resolve_cache_size', 1000)
+        return static_view(*arg, **kw)
+
+    def _makeRequest(self, path, settings=None, overrides=None):
+        from pyramid.interfaces import IPackageOverrides
+        from pyramid.registry import Registry
+        from pyramid.request import Request
+        request = Request.blank(path)
+        request.registry = Registry()
+        if settings is not None:
+            request.registry.settings = settings
+        if overrides is not None:
+            request.registry.registerUtility(overrides, IPackageOverrides,
+                                             name='pyramid.tests')
+        return request
+
+    def _fixture(self, *names):
+        import os
+        here = os.path.dirname(__file__)
+        return os.path.join(here, 'fixtures', 'static', *names)
+
+    def test_resolution_cached(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        response = inst(None, self._makeRequest('/index.html'))
+        self.assertTrue(b'<html>static</html>' in response.body)
+        entry = inst.resolved.get('index.html')
+        self.assertEqual(entry[3:],
+                         (False, self._fixture('index.html'), None))
+        # the cached resolution is used for later requests
+        inst.resolved.put('index.html', entry[:3] + (
+            False, self._fixture('subdir', 'index.html'), None))
+        response = inst(None, self._makeRequest('/index.html'))
+        self.assertTrue(b'<html>subdir</html>' in response.body)
+
+    def test_missing_not_cached(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        response = inst(None, self._makeRequest('/notthere.html'))
+        self.assertEqual(response.status, '404 Not Found')
+        self.assertEqual(inst.resolved.get('notthere.html'), None)
+
+    def test_reload_assets_missing_not_cached(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        settings = {'reload_assets':True}
+        inst(None, self._makeRequest('/notthere.html', settings=settings))
+        self.assertEqual(inst.resolved.get('notthere.html'), None)
+
+    def test_directory_cached(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        response = inst(None, self._makeRequest('/subdir'))
+        self.assertEqual(response.status, '301 Moved Permanently')
+        response = inst(None, self._makeRequest('/subdir/'))
+        self.assertTrue(b'<html>subdir</html>' in response.body)
+        self.assertEqual(inst.resolved.get('subdir')[3:],
+                         (True, self._fixture('subdir', 'index.html'), None))
+
+    def test_precompressed_cached(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             precompressed=True)
+        request = self._makeRequest('/compressed.css')
+        request.environ['HTTP_ACCEPT_ENCODING'] = 'gzip'
+        response = inst(None, request)
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(inst.resolved.get('compressed.css')[3:],
+                         (False, self._fixture('compressed.css'),
+                          self._fixture('compressed.css.gz')))
+
+    def test_overrides_change(self):
+        overrides = DummyPackageOverrides()
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        inst(None, self._makeRequest('/index.html', overrides=overrides))
+        entry = inst.resolved.get('index.html')
+        self.assertTrue(entry[0] is overrides)
+        inst.resolved.put('index.html', entry[:3] + (False, None, None))
+        overrides.generation += 1
+        response = inst(None, self._makeRequest('/index.html',
+                                                overrides=overrides))
+        self.assertEqual(response.status, '200 OK')
+        self.assertEqual(inst.resolved.get('index.html')[1],
+                         overrides.generation)
+
+    def test_overrides_added(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        inst(None, self._makeRequest('/index.html'))
+        entry = inst.resolved.get('index.html')
+        inst.resolved.put('index.html', entry[:3] + (False, None, None))
+        response = inst(None, self._makeRequest(
+            '/index.html', overrides=DummyPackageOverrides()))
+        self.assertEqual(response.status, '200 OK')
+
+    def test_reload_assets_mtime_changed(self):
+        from os.path import getmtime
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        settings = {'reload_assets':True}
+        inst(None, self._makeRequest('/index.html', settings=settings))
+        entry = inst.resolved.get('index.html')
+        self.assertEqual(entry[2], getmtime(self._fixture('index.html')))
+        stale = (entry[0], entry[1], entry[2] - 1, False,
+                 self._fixture('subdir', 'index.html'), None)
+        inst.resolved.put('index.html', stale)
+        response = inst(None, self._makeRequest('/index.html',
+                                                settings=settings))
+        self.assertTrue(b'<html>static</html>' in response.body)
+
+    def test_reload_assets_mtime_unchanged(self):
+        from os.path import getmtime
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        settings = {'reload_assets':True}
+        subdir_index = self._fixture('subdir', 'index.html')
+        inst.resolved.put('index.html', (
+            None, None, getmtime(subdir_index), False, subdir_index,
+            None))
+        response = inst(None, self._makeRequest('/index.html',
+                                                settings=settings))
+        self.assertTrue(b'<html>subdir</html>' in response.body)
+
+    def test_resolve_cache_off_by_default(self):
+        from pyramid.static import static_view
+        inst = static_view('pyramid.tests:fixtures/static')
+        self.assertEqual(inst.resolved, None)
+
+    def test_resolve_cache_size_zero(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             resolve_cache_size=0)
+        self.assertEqual(inst.resolved, None)
+        response = inst(None, self._makeRequest('/index.html'))
+        self.assertTrue(b'<html>static</html>' in response.body)
+
+    def test_filesystem_not_cached(self):
+        inst = self._makeOne(self._fixture())
+        self.assertEqual(inst.resolved, None)
+
+class Test_static_view_ranges(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.static import static_view
+        return static_view(*arg, **kw)
+
+    def _makeRequest(self, kw=None):
+        from pyramid.request import Request
+        environ = {
+            'wsgi.url_scheme':'http',
+            'wsgi.version':(1,0),
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'6543',
+            'PATH_INFO':'/index.html',
+            'SCRIPT_NAME':'',
+            'REQUEST_METHOD':'GET',
+            }
+        if kw is not None:
+            environ.update(kw)
+        return Request(environ=environ)
+
+    def _serve(self, inst, range, **kw):
+        kw['HTTP_RANGE'] = range
+        request = self._makeRequest(kw)
+        response = inst(DummyContext(), request)
+        start_response = DummyStartResponse()
+        app_iter = response(request.environ, start_response)
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        headers = dict(start_response.headers)
+        return start_response.status, headers, body
+
+    def _getETag(self, inst):
+        return inst(DummyContext(), self._makeRequest()).etag
+
+    def test_single_range(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(inst, 'bytes=0-5')
+        self.assertEqual(status, '206 Partial Content')
+        self.assertEqual(body, b'<html>')
+        self.assertEqual(headers['Content-Range'], 'bytes 0-5/20')
+        self.assertEqual(headers['Content-Length'], '6')
+        self.assertEqual(headers['Content-Type'], 'text/html; charset=UTF-8')
+
+    def test_single_range_filesystem(self):
+        import os
+        here = os.path.dirname(__file__)
+        inst = self._makeOne(os.path.join(here, 'fixtures', 'static'))
+        status, headers, body = self._serve(inst, 'bytes=6-11')
+        self.assertEqual(status, '206 Partial Content')
+        self.assertEqual(body, b'static')
+
+    def test_suffix_range(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(inst, 'bytes=-8')
+        self.assertEqual(status, '206 Partial Content')
+        self.assertEqual(body, b'</html>\n')
+        self.assertEqual(headers['Content-Range'], 'bytes 12-19/20')
+
+    def test_suffix_range_longer_than_file(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(inst, 'bytes=-100')
+        self.assertEqual(status, '206 Partial Content')
+        self.assertEqual(body, b'<html>static</html>\n')
+
+    def test_open_range_with_file_wrapper(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(
+            inst, 'bytes=6-', **{'wsgi.file_wrapper':DummyFileWrapper})
+        self.assertEqual(status, '206 Partial Content')
+        self.assertEqual(body, b'static</html>\n')
+        self.assertEqual(headers['Content-Length'], '14')
+
+    def test_bounded_range_with_file_wrapper(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest({'HTTP_RANGE':'bytes=6-11',
+                                     'wsgi.file_wrapper':DummyFileWrapper})
+        response = inst(DummyContext(), request)
+        self.assertFalse(isinstance(response.app_iter, DummyFileWrapper))
+        self.assertEqual(response.body, b'static')
+
+    def test_range_end_past_file(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(inst, 'bytes=12-100')
+        self.assertEqual(status, '206 Partial Content')
+        self.assertEqual(headers['Content-Range'], 'bytes 12-19/20')
+
+    def test_unsatisfiable(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(inst, 'bytes=20-')
+        self.assertEqual(status, '416 Request Range Not Satisfiable')
+        self.assertEqual(headers['Content-Range'], 'bytes */20')
+
+    def test_invalid(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(inst, 'bytes=5-1')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(body, b'<html>static</html>\n')
+
+    def test_multiple_ranges_not_allowed(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(inst, 'bytes=0-0,6-11')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(body, b'<html>static</html>\n')
+
+    def test_overlapping_ranges_coalesced(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(inst, 'bytes=6-9,8-11')
+        self.assertEqual(status, '206 Partial Content')
+        self.assertEqual(body, b'static')
+
+    def _assertMultipart(self, headers, body):
+        for name, value in headers.items():
+            # as required by PEP 333 (wsgiref asserts it)
+            self.assertEqual(type(value), str)
+        ct = headers['Content-Type']
+        self.assertTrue(ct.startswith('multipart/byteranges; boundary='))
+        boundary = ct.split('=', 1)[1].encode('ascii')
+        self.assertEqual(headers['Content-Length'], str(len(body)))
+        expected = (
+            b'\r\n--' + boundary + b'\r\n'
+            b'Content-Type: text/html; charset=UTF-8\r\n'
+            b'Content-Range: bytes 0-0/20\r\n\r\n<'
+            b'\r\n--' + boundary + b'\r\n'
+            b'Content-Type: text/html; charset=UTF-8\r\n'
+            b'Content-Range: bytes 6-11/20\r\n\r\nstatic'
+            b'\r\n--' + boundary + b'--\r\n')
+        self.assertEqual(body, expected)
+
+    def test_multiple_ranges(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static', max_ranges=2)
+        status, headers, body = self._serve(inst, 'bytes=6-11,0-0')
+        self.assertEqual(status, '206 Partial Content')
+        self._assertMultipart(headers, body)
+
+    def test_multiple_ranges_file_cache(self):
+        from pyramid.static import StaticFileCache
+        inst = self._makeOne('pyramid.tests:fixtures/static', max_ranges=2,
+                             file_cache=StaticFileCache())
+        for i in range(2):
+            status, headers, body = self._serve(inst, 'bytes=0-0,6-11')
+            self.assertEqual(status, '206 Partial Content')
+            self._assertMultipart(headers, body)
+
+    def test_single_range_file_cache(self):
+        from pyramid.static import StaticFileCache
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             file_cache=StaticFileCache())
+        for i in range(2):
+            status, headers, body = self._serve(inst, 'bytes=6-11')
+            self.assertEqual(status, '206 Partial Content')
+            self.assertEqual(body, b'static')
+            self.assertEqual(headers['Content-Range'], 'bytes 6-11/20')
+        status, headers, body = self._serve(inst, 'bytes=30-')
+        self.assertEqual(status, '416 Request Range Not Satisfiable')
+
+    def test_if_range_etag(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        etag = self._getETag(inst)
+        status, headers, body = self._serve(
+            inst, 'bytes=6-11', HTTP_IF_RANGE='"%s"' % etag)
+        self.assertEqual(status, '206 Partial Content')
+        status, headers, body = self._serve(
+            inst, 'bytes=6-11', HTTP_IF_RANGE='"foo"')
+        self.assertEqual(status, '200 OK')
+        status, headers, body = self._serve(
+            inst, 'bytes=6-11', HTTP_IF_RANGE='W/"%s"' % etag)
+        self.assertEqual(status, '200 OK')
+
+    def test_if_range_date(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        last_modified = inst(DummyContext(),
+                             self._makeRequest()).headers['Last-Modified']
+        status, headers, body = self._serve(
+            inst, 'bytes=6-11', HTTP_IF_RANGE=last_modified)
+        self.assertEqual(status, '206 Partial Content')
+        status, headers, body = self._serve(
+            inst, 'bytes=6-11', HTTP_IF_RANGE='Thu, 01 Jan 1970 00:00:01 GMT')
+        self.assertEqual(status, '200 OK')
+
+    def test_not_get(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        status, headers, body = self._serve(inst, 'bytes=6-11',
+                                            REQUEST_METHOD='POST')
+        self.assertEqual(status, '200 OK')
+
+    def test_max_ranges_zero(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static', max_ranges=0)
+        request = self._makeRequest({'HTTP_RANGE':'bytes=6-11'})
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.status, '200 OK')
+        self.assertFalse('Accept-Ranges' in response.headers)
+
+class Test_parse_ranges(unittest.TestCase):
+    def _callFUT(self, header, size=100):
+        from pyramid.static import _parse_ranges
+        return _parse_ranges(header, size)
+
+    def test_single(self):
+        self.assertEqual(self._callFUT('bytes=0-9'), [(0, 10)])
+
+    def test_multiple(self):
+        self.assertEqual(self._callFUT('bytes=0-9, 20-, -5'),
+                         [(0, 10), (20, 100), (95, 100)])
+
+    def test_unsatisfiable_dropped(self):
+        self.assertEqual(self._callFUT('bytes=0-9,200-300'), [(0, 10)])
+        self.assertEqual(self._callFUT('bytes=200-300'), [])
+        self.assertEqual(self._callFUT('bytes=-0'), [])
+
+    def test_invalid(self):
+        self.assertEqual(self._callFUT('bytes=9-0'), None)
+        self.assertEqual(self._callFUT('bytes=a-b'), None)
+        self.assertEqual(self._callFUT('bytes=5'), None)
+        self.assertEqual(self._callFUT('bytes='), None)
+        self.assertEqual(self._callFUT('items=0-9'), None)
+
+class Test_coalesce_ranges(unittest.TestCase):
+    def _callFUT(self, ranges):
+        from pyramid.static import _coalesce_ranges
+        return _coalesce_ranges(ranges)
+
+    def test_it(self):
+        self.assertEqual(
+            self._callFUT([(50, 60), (0, 10), (5, 20), (20, 30), (70, 80)]),
+            [(0, 30), (50, 60), (70, 80)])
+
+class Test_FileRangesIter(unittest.TestCase):
+    def _makeOne(self, file, parts, trailer, block_size=None):
+        from pyramid.static import _FileRangesIter
+        return _FileRangesIter(file, parts, trailer, block_size)
+
+    def test_it(self):
+        import io
+        f = io.BytesIO(b'0123456789')
+        inst = self._makeOne(f, [(b'a', 1, 4), (b'b', 6, 10)], b'z',
+                             block_size=2)
+        self.assertEqual(list(inst),
+                         [b'a', b'12', b'3', b'b', b'67', b'89', b'z'])
+        inst.close()
+        self.assertTrue(f.closed)
+
+class Test_static_view_manifest(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.static import static_view
+        return static_view(*arg, **kw)
+
+    def _makeManifest(self):
+        from pyramid.static import StaticManifest
+        return StaticManifest({'index.html':'index.abc.html',
+                               'subdir/index.html':'subdir/index.abc.html'},
+                              max_age=1000)
+
+    def _makeRequest(self, kw=None):
+        from pyramid.request import Request
+        environ = {
+            'wsgi.url_scheme':'http',
+            'wsgi.version':(1,0),
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'6543',
+            'PATH_INFO':'/index.abc.html',
+            'SCRIPT_NAME':'',
+            'REQUEST_METHOD':'GET',
+            }
+        if kw is not None:
+            environ.update(kw)
+        return Request(environ=environ)
+
+    def _assertImmutable(self, response, max_age):
+        directives = response.headers['Cache-Control'].split(', ')
+        self.assertEqual(sorted(directives),
+                         ['immutable', 'max-age=%d' % max_age, 'public'])
+
+    def test_busted_path(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             manifest=self._makeManifest())
+        response = inst(None, self._makeRequest())
+        self.assertEqual(response.status, '200 OK')
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.cache_control.max_age, 1000)
+        self._assertImmutable(response, 1000)
+        self.assertNotEqual(response.expires, None)
+
+    def test_busted_path_subdir_filesystem(self):
+        import os
+        here = os.path.dirname(__file__)
+        inst = self._makeOne(os.path.join(here, 'fixtures', 'static'),
+                             manifest=self._makeManifest())
+        request = self._makeRequest({'PATH_INFO':'/subdir/index.abc.html'})
+        response = inst(None, request)
+        self.assertTrue(b'<html>subdir</html>' in response.body)
+        self.assertEqual(response.cache_control.max_age, 1000)
+
+    def test_busted_path_not_modified(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             manifest=self._makeManifest())
+        etag = inst(None, self._makeRequest()).etag
+        request = self._makeRequest({'HTTP_IF_NONE_MATCH':'"%s"' % etag})
+        response = inst(None, request)
+        self.assertEqual(response.status, '304 Not Modified')
+        self._assertImmutable(response, 1000)
+
+    def test_busted_path_with_file_cache(self):
+        from pyramid.static import StaticFileCache
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             manifest=self._makeManifest(),
+                             file_cache=StaticFileCache())
+        inst(None, self._makeRequest())
+        response = inst(None, self._makeRequest())
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.cache_control.max_age, 1000)
+
+    def test_unbusted_path(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             cache_max_age=10, manifest=self._makeManifest())
+        request = self._makeRequest({'PATH_INFO':'/index.html'})
+        response = inst(None, request)
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.cache_control.max_age, 10)
+        self.assertFalse('immutable' in response.headers['Cache-Control'])
+
+    def test_unknown_busted_path(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static',
+                             manifest=self._makeManifest())
+        request = self._makeRequest({'PATH_INFO':'/index.def.html'})
+        response = inst(None, request)
+        self.assertEqual(response.status, '404 Not Found')
+        self.assertFalse('immutable' in response.headers.get(
+            'Cache-Control', ''))
+
+class StaticManifestTests(unittest.TestCase):
+    def _makeOne(self, paths, **kw):
+        from pyramid.static import StaticManifest
+        return StaticManifest(paths, **kw)
+
+    def test_defaults(self):
+        inst = self._makeOne([('a.css', 'a.1.css')])
+        self.assertEqual(inst.paths, {'a.css':'a.1.css'})
+        self.assertEqual(inst.max_age, 31536000)
+
+    def test_busted_path(self):
+        inst = self._makeOne({'a.css':'a.1.css'})
+        self.assertEqual(inst.busted_path('a.css'), 'a.1.css')
+        self.assertEqual(inst.busted_path('b.css'), 'b.css')
+
+    def test_original_path(self):
+        inst = self._makeOne({'a.css':'a.1.css'})
+        self.assertEqual(inst.original_path('a.1.css'), 'a.css')
+        self.assertEqual(inst.original_path('a.css'), None)
+
+    def test_save_and_load_manifest(self):
+        import os
+        import shutil
+        import tempfile
+        from pyramid.static import load_manifest
+        inst = self._makeOne({'a.css':'a.1.css', 'js/b.js':'js/b.2.js'})
+        tempdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tempdir, 'manifest.json')
+            inst.save(filename)
+            result = load_manifest(filename, max_age=5)
+        finally:
+            shutil.rmtree(tempdir)
+        self.assertEqual(result.paths, inst.paths)
+        self.assertEqual(result.max_age, 5)
+        self.assertEqual(result.original_path('js/b.2.js'), 'js/b.js')
+
+class Test_build_manifest(unittest.TestCase):
+    def _callFUT(self, path, **kw):
+        from pyramid.static import build_manifest
+        return build_manifest(path, **kw)
+
+    def _digest(self, *names):
+        import hashlib
+        import os
+        here = os.path.dirname(__file__)
+        path = os.path.join(here, 'fixtures', 'static', *names)
+        f = open(path, 'rb')
+        try:
+            return hashlib.md5(f.read()).hexdigest()
+        finally:
+            f.close()
+
+    def test_asset_spec(self):
+        result = self._callFUT('pyramid.tests:fixtures/static')
+        digest = self._digest('index.html')[:12]
+        self.assertEqual(result.busted_path('index.html'),
+                         'index.%s.html' % digest)
+        digest = self._digest('subdir', 'index.html')[:12]
+        self.assertEqual(result.busted_path('subdir/index.html'),
+                         'subdir/index.%s.html' % digest)
+        digest = self._digest('compressed.css.gz')[:12]
+        self.assertEqual(result.busted_path('compressed.css.gz'),
+                         'compressed.css.%s.gz' % digest)
+        self.assertEqual(result.max_age, 31536000)
+
+    def test_filesystem_path(self):
+        import os
+        here = os.path.dirname(__file__)
+        result = self._callFUT(os.path.join(here, 'fixtures', 'static'),
+                               hash_length=4, max_age=10)
+        digest = self._digest('index.html')[:4]
+        self.assertEqual(result.busted_path('index.html'),
+                         'index.%s.html' % digest)
+        self.assertEqual(result.max_age, 10)
+
+    def test_text_paths(self):
+        from pyramid.compat import text_type
+        result = self._callFUT('pyramid.tests:fixtures/static')
+        for path in result.paths:
+            self.assertTrue(isinstance(path, text_type))
+
+    def test_nonascii_filename(self):
+        from pyramid.compat import native_
+        from pyramid.compat import text_
+        result = self._callFUT('pyramid.tests:fixtures/static')
+        name = text_(b'h\xc3\xa9h\xc3\xa9.html', 'utf-8')
+        digest = self._digest(native_(name, 'utf-8'))[:12]
+        self.assertEqual(result.busted_path(name),
+                         text_(b'h\xc3\xa9h\xc3\xa9.', 'utf-8') + digest +
+                         '.html')
+
+class Test_hashed_path(unittest.TestCase):
+    def _callFUT(self, path, digest):
+        from pyramid.static import _hashed_path
+        return _hashed_path(path, digest)
+
+    def test_with_extension(self):
+        self.assertEqual(self._callFUT('a/b/c.css', 'x'), 'a/b/c.x.css')
+
+    def test_without_extension(self):
+        self.assertEqual(self._callFUT('a/LICENSE', 'x'), 'a/LICENSE.x')
+
+    def test_dotfile(self):
+        self.assertEqual(self._callFUT('.htaccess', 'x'), '.htaccess.x')
+
+class Test_precompress(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tempdir)
+
+    def _callFUT(self, path, **kw):
+        from pyramid.static import precompress
+        return precompress(path, **kw)
+
+    def _makeFile(self, name, data, mtime=None):
+        import os
+        path = os.path.join(self.tempdir, name)
+        dirname = os.path.dirname(path)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        f = open(path, 'wb')
+        try:
+            f.write(data)
+        finally:
+            f.close()
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def _read(self, path):
+        import gzip
+        f = gzip.GzipFile(path, 'rb')
+        try:
+            return f.read()
+        finally:
+            f.close()
+
+    def test_it(self):
+        import os
+        css = self._makeFile('a.css', b'x' * 300, mtime=1000)
+        js = self._makeFile('sub/b.js', b'y' * 300)
+        self._makeFile('c.png', b'z' * 300)
+        self._makeFile('d.css', b'small')
+        result = self._callFUT(self.tempdir)
+        self.assertEqual(sorted(result), sorted([css + '.gz', js + '.gz']))
+        self.assertEqual(self._read(css + '.gz'), b'x' * 300)
+        self.assertEqual(self._read(js + '.gz'), b'y' * 300)
+        self.assertEqual(os.path.getmtime(css + '.gz'), 1000)
+
+    def test_up_to_date_not_rewritten(self):
+        css = self._makeFile('a.css', b'x' * 300, mtime=1000)
+        self._callFUT(self.tempdir)
+        self.assertEqual(self._callFUT(self.tempdir), [])
+        self._makeFile('a.css', b'w' * 300, mtime=2000)
+        self.assertEqual(self._callFUT(self.tempdir), [css + '.gz'])
+        self.assertEqual(self._read(css + '.gz'), b'w' * 300)
+
+    def test_extensions_and_min_size(self):
+        png = self._makeFile('c.png', b'z')
+        result = self._callFUT(self.tempdir, extensions=('.png',),
+                               min_size=0)
+        self.assertEqual(result, [png + '.gz'])
+
+    def test_asset_spec(self):
+        # resolves the spec; the fixture files are all below min_size
+        result = self._callFUT('pyramid.tests:fixtures/static',
+                               min_size=1000000)
+        self.assertEqual(result, [])
+
+class StaticFileCacheTests(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tempdir)
+
+    def _makeOne(self, **kw):
+        from pyramid.static import StaticFileCache
+        return StaticFileCache(**kw)
+
+    def _makeFile(self, name, data, mtime=None):
+        import os
+        path = os.path.join(self.tempdir, name)
+        f = open(path, 'wb')
+        try:
+            f.write(data)
+        finally:
+            f.close()
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_add_and_get(self):
+        import os
+        from pyramid.static import _file_etag
+        path = self._makeFile('a.css', b'body {}')
+        cache = self._makeOne()
+        entry = cache.add('a', path)
+        self.assertEqual(entry.body, b'body {}')
+        self.assertEqual(entry.content_type, 'text/css')
+        self.assertEqual(entry.etag, _file_etag(os.stat(path)))
+        self.assertTrue(cache.get('a') is entry)
+        self.assertEqual(cache.total_size, 7)
+
+    def test_get_miss(self):
+        cache = self._makeOne()
+        self.assertEqual(cache.get('a'), None)
+
+    def test_unknown_content_type(self):
+        path = self._makeFile('a.unknownext', b'abc')
+        cache = self._makeOne()
+        entry = cache.add('a', path)
+        self.assertEqual(entry.content_type, 'application/octet-stream')
+
+    def test_add_too_large(self):
+        path = self._makeFile('a.css', b'x' * 11)
+        cache = self._makeOne(max_file_size=10)
+        self.assertEqual(cache.add('a', path), None)
+        self.assertEqual(cache.get('a'), None)
+
+    def test_add_larger_than_total(self):
+        path = self._makeFile('a.css', b'x' * 11)
+        cache = self._makeOne(max_total_size=10)
+        self.assertEqual(cache.add('a', path), None)
+
+    def test_add_replaces(self):
+        path = self._makeFile('a.css', b'abc')
+        cache = self._makeOne()
+        cache.add('a', path)
+        cache.add('a', path)
+        self.assertEqual(cache.total_size, 3)
+        self.assertEqual(len(cache._data), 1)
+
+    def test_max_entries(self):
+        cache = self._makeOne(max_entries=4)
+        for name in 'abcd':
+            cache.add(name, self._makeFile(name, b'x'))
+        cache.get('a')
+        cache.add('e', self._makeFile('e', b'x'))
+        self.assertEqual(len(cache._data), 4)
+        self.assertEqual(cache.get('b'), None)
+        self.assertNotEqual(cache.get('a'), None)
+        self.assertNotEqual(cache.get('e'), None)
+        self.assertEqual(cache.total_size, 4)
+
+    def test_max_total_size(self):
+        cache = self._makeOne(max_total_size=10)
+        cache.add('a', self._makeFile('a', b'x' * 6))
+        cache.add('b', self._makeFile('b', b'x' * 6))
+        self.assertEqual(cache.get('a'), None)
+        self.assertNotEqual(cache.get('b'), None)
+        self.assertEqual(cache.total_size, 6)
+
+    def test_max_total_size_evicts_least_recently_used(self):
+        cache = self._makeOne(max_total_size=10)
+        cache.add('a', self._makeFile('a', b'x' * 4))
+        cache.add('b', self._makeFile('b', b'x' * 4))
+        cache.get('a')
+        cache.add('c', self._makeFile('c', b'x' * 4))
+        self.assertEqual(cache.get('b'), None)
+        self.assertNotEqual(cache.get('a'), None)
+        self.assertNotEqual(cache.get('c'), None)
+        self.assertEqual(cache.total_size, 8)
+
+    def test_revalidate_unchanged(self):
+        path = self._makeFile('a.css', b'abc', mtime=1000)
+        cache = self._makeOne(revalidate=0)
+        entry = cache.add('a', path)
+        self.assertTrue(cache.get('a') is entry)
+
+    def test_revalidate_changed(self):
+        path = self._makeFile('a.css', b'abc', mtime=1000)
+        cache = self._makeOne(revalidate=0)
+        cache.add('a', path)
+        self._makeFile('a.css', b'abcd', mtime=2000)
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.total_size, 0)
+
+    def test_revalidate_removed(self):
+        import os
+        path = self._makeFile('a.css', b'abc', mtime=1000)
+        cache = self._makeOne(revalidate=0)
+        cache.add('a', path)
+        os.remove(path)
+        self.assertEqual(cache.get('a'), None)
+
+    def test_revalidate_not_due(self):
+        path = self._makeFile('a.css', b'abc', mtime=1000)
+        cache = self._makeOne(revalidate=3600)
+        entry = cache.add('a', path)
+        self._makeFile('a.css', b'abcd', mtime=2000)
+        self.assertTrue(cache.get('a') is entry)
+
+    def test_revalidate_None(self):
+        import os
+        path = self._makeFile('a.css', b'abc')
+        cache = self._makeOne(revalidate=None)
+        entry = cache.add('a', path)
+        entry.checked = 0
+        os.remove(path)
+        self.assertTrue(cache.get('a') is entry)
+
+    def test_discard(self):
+        cache = self._makeOne()
+        cache.add('a', self._makeFile('a', b'abc'))
+        cache.discard('a')
+        cache.discard('b')
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.total_size, 0)
+
+    def test_clear(self):
+        cache = self._makeOne()
+        cache.add('a', self._makeFile('a', b'abc'))
+        cache.clear()
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.total_size, 0)
+        cache.add('b', self._makeFile('b', b'x'))
+        self.assertNotEqual(cache.get('b'), None)
+        self.assertEqual(cache.total_size, 1)
+
+class Test_FileIter(unittest.TestCase):
+    def _makeOne(self, data, size=None, block_size=None):
+        import io
+        from pyramid.static import _FileIter
+        return _FileIter(io.BytesIO(data), size, block_size)
+
+    def test_default_block_size(self):
+        inst = self._makeOne(b'abc')
+        self.assertEqual(inst.block_size, 262144)
+        self.assertEqual(list(inst), [b'abc'])
+
+    def test_block_size(self):
+        inst = self._makeOne(b'abcdefg', block_size=3)
+        self.assertEqual(list(inst), [b'abc', b'def', b'g'])
+
+    def test_size_limits_read(self):
+        inst = self._makeOne(b'abcdefg', size=5, block_size=3)
+        self.assertEqual(list(inst), [b'abc', b'de'])
+
+    def test_close(self):
+        inst = self._makeOne(b'abc')
+        inst.close()
+        self.assertTrue(inst.file.closed)
+
 class Test_patch_mimetypes(unittest.TestCase):
     def _callFUT(self, module):
         from pyramid.static import init_mimetypes
@@ -351,6 +1528,20 @@ class Test_patch_mimetypes(unittest.TestCase):
 class DummyContext:
     pass
 
+class DummyPackageOverrides(object):
+    generation = 0
+
+class DummyFileWrapper(object):
+    def __init__(self, file, block_size=8192):
+        self.file = file
+        self.block_size = block_size
+
+    def __iter__(self):
+        return iter(lambda: self.file.read(self.block_size), b'')
+
+    def close(self):
+        self.file.close()
+
 class DummyStartResponse:
     status = ()
     headers = ()
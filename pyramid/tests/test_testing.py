@@ -584,6 +584,27 @@ class TestDummyTemplateRenderer(unittest.TestCase):
         result = renderer({'a':1, 'b':2})
         self.assertEqual(result, 'abc')
 
+class TestDummySessionStore(unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.testing import DummySessionStore
+        return DummySessionStore()
+
+    def test_instance_conforms(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ISessionStore
+        verifyObject(ISessionStore, self._makeOne())
+
+    def test_save_load_delete(self):
+        store = self._makeOne()
+        self.assertEqual(store.load('a'), None)
+        store.save('a', {'b':1}, 10)
+        self.assertEqual(store.load('a'), {'b':1})
+        self.assertEqual(store.timeouts, {'a':10})
+        store.delete('a')
+        self.assertEqual(store.load('a'), None)
+        self.assertEqual(store.timeouts, {})
+        store.delete('a')
+
 class Test_setUp(unittest.TestCase):
     def _callFUT(self, **kw):
         from pyramid.testing import setUp
@@ -416,6 +416,215 @@ class ResourceTreeTraverserTests(unittest.TestCase):
         finally:
             warnings.resetwarnings()
 
+class ResourceTreeTraverserCacheTests(unittest.TestCase):
+    def _makeOne(self, root):
+        from pyramid.traversal import ResourceTreeTraverser
+        return ResourceTreeTraverser(root)
+
+    def _makeCache(self, **kw):
+        from pyramid.traversal import TraversalCache
+        return TraversalCache(**kw)
+
+    def _makeRequest(self, cache, path, **environ):
+        from pyramid.interfaces import ITraversalCache
+        request = _makeRequest()
+        request.registry.registerUtility(cache, ITraversalCache)
+        request.environ['PATH_INFO'] = path
+        request.environ.update(environ)
+        return request
+
+    def _makeTree(self, cacheable=True):
+        root = CountingContext(True)
+        foo = root['foo'] = CountingContext(cacheable)
+        bar = foo['bar'] = CountingContext(cacheable)
+        baz = bar['baz'] = CountingContext(cacheable)
+        return root, foo, bar, baz
+
+    def _traverse(self, root, cache, path, **environ):
+        request = self._makeRequest(cache, path, **environ)
+        return self._makeOne(root)(request)
+
+    def _uncached(self, root, path, **environ):
+        request = _makeRequest(dict(PATH_INFO=path, **environ))
+        return self._makeOne(root)(request)
+
+    def test_caches_and_reuses(self):
+        root, foo, bar, baz = self._makeTree()
+        cache = self._makeCache()
+        self._traverse(root, cache, '/foo/bar/baz')
+        self.assertEqual(bar.getitem_calls, 1)
+        result = self._traverse(root, cache, '/foo/bar/baz')
+        self.assertEqual(bar.getitem_calls, 1)
+        self.assertEqual(result['context'], baz)
+        self.assertEqual(result, self._uncached(root, '/foo/bar/baz'))
+
+    def test_resumes_from_longest_prefix(self):
+        root, foo, bar, baz = self._makeTree()
+        cache = self._makeCache()
+        self._traverse(root, cache, '/foo/bar')
+        self.assertEqual(foo.getitem_calls, 1)
+        result = self._traverse(root, cache, '/foo/bar/baz/@@view/a')
+        self.assertEqual(foo.getitem_calls, 1)
+        self.assertEqual(bar.getitem_calls, 1)
+        self.assertEqual(result['context'], baz)
+        self.assertEqual(result['view_name'], 'view')
+        self.assertEqual(result['subpath'], ('a',))
+        self.assertEqual(result, self._uncached(root, '/foo/bar/baz/@@view/a'))
+
+    def test_view_name_after_cached_path(self):
+        root, foo, bar, baz = self._makeTree()
+        cache = self._makeCache()
+        self._traverse(root, cache, '/foo/bar/baz')
+        result = self._traverse(root, cache, '/foo/bar/baz/view/x/y')
+        self.assertEqual(result['context'], baz)
+        self.assertEqual(result['view_name'], 'view')
+        self.assertEqual(result['subpath'], ('x', 'y'))
+        self.assertEqual(result, self._uncached(root, '/foo/bar/baz/view/x/y'))
+
+    def test_with_virtual_root(self):
+        from pyramid.interfaces import VH_ROOT_KEY
+        root, foo, bar, baz = self._makeTree()
+        cache = self._makeCache()
+        env = {VH_ROOT_KEY:'/foo'}
+        self._traverse(root, cache, '/bar/baz', **env)
+        result = self._traverse(root, cache, '/bar/baz', **env)
+        self.assertEqual(bar.getitem_calls, 1)
+        self.assertEqual(result['virtual_root'], foo)
+        self.assertEqual(result['traversed'], ('foo', 'bar', 'baz'))
+        self.assertEqual(result, self._uncached(root, '/bar/baz', **env))
+
+    def test_noncacheable_not_cached(self):
+        root, foo, bar, baz = self._makeTree(cacheable=False)
+        cache = self._makeCache()
+        self._traverse(root, cache, '/foo/bar')
+        self._traverse(root, cache, '/foo/bar')
+        self.assertEqual(foo.getitem_calls, 2)
+        self.assertEqual(cache._cache.data, {})
+
+    def test_beneath_noncacheable_not_cached(self):
+        from zope.interface import alsoProvides
+        from pyramid.interfaces import ICacheableResource
+        root, foo, bar, baz = self._makeTree(cacheable=False)
+        alsoProvides(bar, ICacheableResource)
+        cache = self._makeCache()
+        self._traverse(root, cache, '/foo/bar')
+        self.assertEqual(cache._cache.data, {})
+
+    def test_noncacheable_root_not_cached(self):
+        root = CountingContext()
+        foo = root['foo'] = CountingContext(True)
+        cache = self._makeCache()
+        self._traverse(root, cache, '/foo')
+        self._traverse(root, cache, '/foo')
+        self.assertEqual(root.getitem_calls, 2)
+        self.assertEqual(cache._cache.data, {})
+
+    def test_roots_of_same_class_not_shared(self):
+        from pyramid.location import lineage
+        root1, foo1, bar1, baz1 = self._makeTree()
+        root1.__acl__ = [('Allow', 'alice', 'view')]
+        root2, foo2, bar2, baz2 = self._makeTree()
+        root2.__acl__ = [('Allow', 'bob', 'view')]
+        cache = self._makeCache()
+        self._traverse(root1, cache, '/foo/bar')
+        result = self._traverse(root2, cache, '/foo/bar')
+        self.assertEqual(result['context'], bar2)
+        self.assertEqual(result['root'], root2)
+        self.assertEqual(list(lineage(result['context']))[-1].__acl__,
+                         [('Allow', 'bob', 'view')])
+        self.assertEqual(result, self._uncached(root2, '/foo/bar'))
+
+    def test_no_cache_registered(self):
+        root, foo, bar, baz = self._makeTree()
+        request = _makeRequest(dict(PATH_INFO='/foo/bar'))
+        result = self._makeOne(root)(request)
+        self.assertEqual(result['context'], bar)
+
+class TraversalCacheTests(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.traversal import TraversalCache
+        return TraversalCache(**kw)
+
+    def test_class_conforms_to_ITraversalCache(self):
+        from zope.interface.verify import verifyClass
+        from pyramid.interfaces import ITraversalCache
+        from pyramid.traversal import TraversalCache
+        verifyClass(ITraversalCache, TraversalCache)
+
+    def test_get_miss(self):
+        cache = self._makeOne()
+        self.assertEqual(cache.get(DummyContext(), ('a',)), None)
+
+    def test_set_get(self):
+        cache = self._makeOne()
+        root = DummyContext()
+        cache.set(root, ('a',), (1,))
+        self.assertEqual(cache.get(root, ('a',)), (1,))
+
+    def test_keyed_by_root_identity(self):
+        cache = self._makeOne()
+        root = DummyContext()
+        cache.set(root, ('a',), (1,))
+        self.assertEqual(cache.get(DummyContext(), ('a',)), None)
+        self.assertEqual(cache.get(root, ('a',)), (1,))
+
+    def test_root_not_kept_alive(self):
+        import gc
+        import weakref
+        cache = self._makeOne()
+        root = DummyContext()
+        ref = weakref.ref(root)
+        cache.set(root, ('a',), (1,))
+        del root
+        gc.collect()
+        self.assertEqual(ref(), None)
+
+    def test_timeout(self):
+        cache = self._makeOne(timeout=-1)
+        root = DummyContext()
+        cache.set(root, ('a',), (1,))
+        self.assertEqual(cache.get(root, ('a',)), None)
+        self.assertEqual(cache._cache.data, {})
+
+    def test_max_entries(self):
+        cache = self._makeOne(max_entries=4)
+        root = DummyContext()
+        for name in 'abcd':
+            cache.set(root, (name,), (name,))
+        cache.set(root, ('e',), ('e',))
+        self.assertEqual(len(cache._cache.data), 4)
+        self.assertEqual(cache.get(root, ('e',)), ('e',))
+
+    def test_invalidate_all(self):
+        cache = self._makeOne()
+        root = DummyContext()
+        cache.set(root, ('a',), (1,))
+        cache.invalidate()
+        self.assertEqual(cache.get(root, ('a',)), None)
+
+    def test_invalidate_tuple(self):
+        cache = self._makeOne()
+        root = DummyContext()
+        cache.set(root, ('a',), (1,))
+        cache.set(root, ('a', 'b'), (1, 2))
+        cache.set(root, ('ab',), (3,))
+        cache.invalidate(['a'])
+        self.assertEqual(cache.get(root, ('a',)), None)
+        self.assertEqual(cache.get(root, ('a', 'b')), None)
+        self.assertEqual(cache.get(root, ('ab',)), (3,))
+
+    def test_invalidate_path_string(self):
+        cache = self._makeOne()
+        root = DummyContext()
+        text = text_(b'La Pe\xc3\xb1a', 'utf-8')
+        cache.set(root, ('a', text), (1, 2))
+        cache.set(root, ('a', text, 'c'), (1, 2, 3))
+        cache.set(root, ('a',), (1,))
+        cache.invalidate('/a/La%20Pe%C3%B1a')
+        self.assertEqual(cache.get(root, ('a', text)), None)
+        self.assertEqual(cache.get(root, ('a', text, 'c')), None)
+        self.assertEqual(cache.get(root, ('a',)), (1,))
+
 class FindInterfaceTests(unittest.TestCase):
     def _callFUT(self, context, iface):
         from pyramid.traversal import find_interface
@@ -769,6 +978,202 @@ class ResourcePathTupleTests(unittest.TestCase):
         result = self._callFUT(other2)
         self.assertEqual(result, ('', '', 'other2'))
 
+class _CacheEnabledMixin(object):
+    def setUp(self):
+        from pyramid import testing
+        from pyramid.traversal import ResourcePathCache
+        config = testing.setUp()
+        config.registry.resource_path_cache = ResourcePathCache()
+
+    def tearDown(self):
+        from pyramid import testing
+        testing.tearDown()
+
+class CachedResourcePathTests(_CacheEnabledMixin, ResourcePathTests):
+    pass
+
+class CachedResourcePathTupleTests(_CacheEnabledMixin,
+                                   ResourcePathTupleTests):
+    pass
+
+class ResourcePathCacheTests(unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.traversal import ResourcePathCache
+        return ResourcePathCache()
+
+    def _makeTree(self):
+        root = DummyContext()
+        foo = DummyContext(name='foo')
+        foo.__parent__ = root
+        bar = DummyContext(name='bar')
+        bar.__parent__ = foo
+        return root, foo, bar
+
+    def test_disabled_by_default(self):
+        from pyramid.registry import Registry
+        self.assertEqual(Registry().resource_path_cache, None)
+
+    def test_path_tuple(self):
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        self.assertEqual(cache.path_tuple(bar), ('', 'foo', 'bar'))
+        self.assertEqual(cache.path_tuple(foo), ('', 'foo'))
+        self.assertEqual(cache.path_tuple(root), ('',))
+        self.assertEqual(len(cache._entries), 3)
+
+    def test_path(self):
+        root, foo, bar = self._makeTree()
+        bar.__name__ = 'b r'
+        cache = self._makeOne()
+        self.assertEqual(cache.path(bar), '/foo/b%20r')
+        self.assertEqual(cache.path(bar), '/foo/b%20r')
+        self.assertEqual(cache.path(root), '/')
+
+    def test_reuses_entry(self):
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        first = cache.path_tuple(bar)
+        self.assertTrue(cache.path_tuple(bar) is first)
+
+    def test_rename_noticed(self):
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        bar.__name__ = 'baz'
+        self.assertEqual(cache.path_tuple(bar), ('', 'foo', 'baz'))
+
+    def test_move_noticed(self):
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        bar.__parent__ = root
+        self.assertEqual(cache.path_tuple(bar), ('', 'bar'))
+
+    def test_ancestor_change_noticed_via_ancestor(self):
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        foo.__name__ = 'fuz'
+        self.assertEqual(cache.path_tuple(foo), ('', 'fuz'))
+        self.assertEqual(cache.path_tuple(bar), ('', 'fuz', 'bar'))
+
+    def test_ancestor_rename_noticed_via_descendant(self):
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        foo.__name__ = 'renamed'
+        self.assertEqual(cache.path_tuple(bar), ('', 'renamed', 'bar'))
+        self.assertEqual(cache.path(bar), '/renamed/bar')
+
+    def test_ancestor_move_noticed_via_descendant(self):
+        root, foo, bar = self._makeTree()
+        other = DummyContext(name='other')
+        other.__parent__ = root
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        cache.path_tuple(other)
+        foo.__parent__ = other
+        self.assertEqual(cache.path_tuple(bar), ('', 'other', 'foo', 'bar'))
+        self.assertEqual(len(cache._entries), 4)
+
+    def test_parent_not_kept_alive(self):
+        import gc
+        import weakref
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        ref = weakref.ref(foo)
+        bar.__parent__ = None
+        del foo
+        gc.collect()
+        self.assertEqual(ref(), None)
+
+    def test_collected_while_locked(self):
+        import gc
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        cache._lock.acquire()
+        try:
+            del bar
+            gc.collect()
+        finally:
+            cache._lock.release()
+        self.assertEqual(len(cache._pending), 1)
+        baz = DummyContext(name='baz')
+        baz.__parent__ = foo
+        self.assertEqual(cache.path_tuple(baz), ('', 'foo', 'baz'))
+        self.assertEqual(cache._pending, [])
+        self.assertEqual(len(cache._entries), 3)
+
+    def test_invalidate_resource_discards_descendants(self):
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        foo.__name__ = 'fuz'
+        cache.invalidate(foo)
+        self.assertEqual(len(cache._entries), 1)
+        self.assertEqual(cache.path_tuple(bar), ('', 'fuz', 'bar'))
+
+    def test_invalidate_uncached_resource(self):
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.invalidate(foo)
+        self.assertEqual(cache._entries, {})
+
+    def test_invalidate_all(self):
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        cache.invalidate()
+        self.assertEqual(cache._entries, {})
+        bar.__name__ = 'baz'
+        self.assertEqual(cache.path_tuple(bar), ('', 'foo', 'baz'))
+
+    def test_entry_removed_when_resource_collected(self):
+        import gc
+        root, foo, bar = self._makeTree()
+        cache = self._makeOne()
+        cache.path_tuple(bar)
+        foo_entry = cache._entries[id(foo)]
+        del bar
+        gc.collect()
+        self.assertEqual(len(cache._entries), 2)
+        self.assertEqual(foo_entry.children, set())
+
+    def test_not_weakrefable(self):
+        class Slotted(object):
+            __slots__ = ('__name__', '__parent__')
+        root, foo, bar = self._makeTree()
+        leaf = Slotted()
+        leaf.__name__ = 'leaf'
+        leaf.__parent__ = bar
+        cache = self._makeOne()
+        self.assertEqual(cache.path_tuple(leaf), ('', 'foo', 'bar', 'leaf'))
+        self.assertEqual(len(cache._entries), 3)
+
+    def test_child_of_not_weakrefable(self):
+        class Slotted(object):
+            __slots__ = ('__name__', '__parent__')
+        root = Slotted()
+        root.__name__ = None
+        root.__parent__ = None
+        foo = DummyContext(name='foo')
+        foo.__parent__ = root
+        cache = self._makeOne()
+        self.assertEqual(cache.path_tuple(foo), ('', 'foo'))
+        self.assertEqual(cache._entries, {})
+
+    def test_parent_attribute_missing(self):
+        class Root(object):
+            __name__ = None
+        root = Root()
+        foo = DummyContext(name='foo')
+        foo.__parent__ = root
+        cache = self._makeOne()
+        self.assertEqual(cache.path_tuple(foo), ('', 'foo'))
+        self.assertEqual(cache.path_tuple(foo), ('', 'foo'))
+
 class QuotePathSegmentTests(unittest.TestCase):
     def _callFUT(self, s):
         from pyramid.traversal import quote_path_segment
@@ -1214,6 +1619,26 @@ class DummyContext(object):
     def __repr__(self):
         return '<DummyContext with name %s at id %s>'%(self.__name__, id(self))
 
+class CountingContext(object):
+    __parent__ = None
+    __name__ = None
+    def __init__(self, cacheable=False):
+        self.children = {}
+        self.getitem_calls = 0
+        if cacheable:
+            from zope.interface import alsoProvides
+            from pyramid.interfaces import ICacheableResource
+            alsoProvides(self, ICacheableResource)
+
+    def __setitem__(self, name, value):
+        value.__name__ = name
+        value.__parent__ = self
+        self.children[name] = value
+
+    def __getitem__(self, name):
+        self.getitem_calls += 1
+        return self.children[name]
+
 class DummyRequest:
     application_url = 'http://example.com:5432' # app_url never ends with slash
     def __init__(self, environ=None):
@@ -1230,6 +1655,6 @@ class DummyContextURL:
 
 def _makeRequest(environ=None):
     from pyramid.registry import Registry
-    request = DummyRequest()
+    request = DummyRequest(environ)
     request.registry = Registry()
     return request
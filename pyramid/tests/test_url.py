@@ -471,6 +471,132 @@ class TestURLMethodsMixin(unittest.TestCase):
                           {'_app_url':'/foo'})
                          )
 
+    def test_route_urls(self):
+        from pyramid.interfaces import IRoutesMapper
+        from pyramid.urldispatch import Route
+        request = self._makeOne()
+        mapper = DummyRoutesMapper(route=Route('flub', '/items/{id}'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        kws = [{'id':1}, {'id':'a b', '_query':{'q':'1'}},
+               {'id':3, '_anchor':'foo', '_app_url':'http://example2.com'}]
+        result = request.route_urls('flub', kws)
+        self.assertEqual(list(result),
+                         ['http://example.com:5432/items/1',
+                          'http://example.com:5432/items/a%20b?q=1',
+                          'http://example2.com/items/3#foo'])
+        self.assertEqual(kws[1], {'id':'a b', '_query':{'q':'1'}})
+
+    def test_route_urls_same_as_route_url(self):
+        from pyramid.interfaces import IRoutesMapper
+        from pyramid.urldispatch import Route
+        request = self._makeOne()
+        mapper = DummyRoutesMapper(route=Route('flub', '/items/{id}'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        kws = [{'id':1, '_query':{'a':'1'}}, {'id':2, '_anchor':'b'}]
+        result = list(request.route_urls('flub', kws, 'edit'))
+        expected = [request.route_url('flub', 'edit', **kw) for kw in kws]
+        self.assertEqual(result, expected)
+
+    def test_route_urls_with_pregenerator(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne()
+        route = DummyRoute(result='/1/2/3')
+        def pregenerator(request, elements, kw):
+            return elements + (kw['extra'],), {}
+        route.pregenerator = pregenerator
+        mapper = DummyRoutesMapper(route=route)
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        result = request.route_urls('flub', [{'extra':'a'}, {'extra':'b'}])
+        self.assertEqual(list(result),
+                         ['http://example.com:5432/1/2/3/a',
+                          'http://example.com:5432/1/2/3/b'])
+
+    def test_route_urls_no_route(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne()
+        mapper = DummyRoutesMapper(route=None)
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        self.assertRaises(KeyError, request.route_urls, 'flub', [{}])
+
+    def test_route_urls_generation_error(self):
+        from pyramid.interfaces import IRoutesMapper
+        from pyramid.urldispatch import Route
+        request = self._makeOne()
+        mapper = DummyRoutesMapper(route=Route('flub', '/items/{id}'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        result = request.route_urls('flub', [{}])
+        self.assertRaises(KeyError, list, result)
+
+    def test_resource_urls(self):
+        request = self._makeOne()
+        self._registerContextURL(request.registry)
+        result = request.resource_urls([DummyContext(), DummyContext()],
+                                       'a', query={'b':'c'}, anchor='d')
+        self.assertEqual(list(result),
+                         ['http://example.com/context/a?b=c#d',
+                          'http://example.com/context/a?b=c#d'])
+
+    def test_resource_urls_no_IContextURL_registered(self):
+        # falls back to TraversalContextURL
+        root = DummyContext()
+        root.__name__ = ''
+        root.__parent__ = None
+        child = DummyContext()
+        child.__name__ = 'child'
+        child.__parent__ = root
+        request = self._makeOne()
+        request.environ = {}
+        result = request.resource_urls([root, child])
+        self.assertEqual(list(result),
+                         ['http://example.com:5432/',
+                          'http://example.com:5432/child/'])
+
+    def test_resource_urls_adapter_returns_None(self):
+        from pyramid.interfaces import IContextURL
+        from zope.interface import Interface
+        root = DummyContext()
+        root.__name__ = ''
+        root.__parent__ = None
+        request = self._makeOne()
+        request.environ = {}
+        request.registry.registerAdapter(lambda *arg: None,
+                                         (Interface, Interface), IContextURL)
+        result = request.resource_urls([root])
+        self.assertEqual(list(result), ['http://example.com:5432/'])
+
+    def test_resource_urls_adapter_looked_up_once_per_iface(self):
+        request = self._makeOne()
+        self._registerContextURL(request.registry)
+        lookups = []
+        adapters = request.registry.adapters
+        class DummyAdapters(object):
+            def lookup(self, *arg, **kw):
+                lookups.append(arg)
+                return adapters.lookup(*arg, **kw)
+        class DummyRegistry(object):
+            pass
+        request.registry = DummyRegistry()
+        request.registry.adapters = DummyAdapters()
+        result = request.resource_urls([DummyContext(), DummyContext()])
+        self.assertEqual(len(list(result)), 2)
+        self.assertEqual(len(lookups), 1)
+
+    def test_resource_urls_no_registry_on_request(self):
+        request = self._makeOne()
+        self._registerContextURL(request.registry)
+        del request.registry
+        result = request.resource_urls([DummyContext()])
+        self.assertEqual(list(result), ['http://example.com/context/'])
+
+class TestURLMethodsMixin_application_url(unittest.TestCase):
+    def test_assignable(self):
+        from pyramid.url import URLMethodsMixin
+        class Request(URLMethodsMixin):
+            pass
+        request = Request()
+        request.application_url = 'http://example.com'
+        self.assertEqual(request.application_url, 'http://example.com')
+
 class Test_route_url(unittest.TestCase):
     def _callFUT(self, route_name, request, *elements, **kw):
         from pyramid.url import route_url
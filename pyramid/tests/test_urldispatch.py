@@ -250,6 +250,218 @@ class RoutesMapperTests(unittest.TestCase):
         mapper.routes['abc'] =  route
         self.assertEqual(mapper.generate('abc', {}), 123)
 
+    def test___call__nonascii_literal_prefix(self):
+        mapper = self._makeOne()
+        mapper.connect('a', text_(b'/caf\xc3\xa9{x}', 'utf-8'))
+        mapper.connect('b', '/{x}')
+        request = self._getRequest(PATH_INFO=native_(b'/caf\xc3\xa9'))
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['b'])
+        self.assertEqual(result['match'],
+                         {'x':text_(b'caf\xc3\xa9', 'utf-8')})
+
+class CompiledRoutesMapperTests(RoutesMapperTests):
+    def _makeOne(self):
+        klass = self._getTargetClass()
+        return klass(compiled=True)
+
+    def test_ctor(self):
+        mapper = self._makeOne()
+        self.assertEqual(mapper.compiled, True)
+
+    def test___call__first_registered_wins(self):
+        mapper = self._makeOne()
+        mapper.connect('generic', '/{action}/{id}')
+        mapper.connect('specific', '/archives/{id}')
+        request = self._getRequest(PATH_INFO='/archives/1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['generic'])
+        self.assertEqual(result['match'], {'action':'archives', 'id':'1'})
+
+    def test___call__predicate_fallthrough(self):
+        mapper = self._makeOne()
+        mapper.connect('foo', '/archives/{id}',
+                       predicates=[lambda *arg: False])
+        mapper.connect('bar', '/archives/{id}')
+        mapper.connect('baz', '/{id}/{other}')
+        request = self._getRequest(PATH_INFO='/archives/1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['bar'])
+
+    def test___call__partial_segment_prefix(self):
+        mapper = self._makeOne()
+        mapper.connect('foo', '/archives/page{num}')
+        mapper.connect('bar', '/archives')
+        request = self._getRequest(PATH_INFO='/archives/page2')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['foo'])
+        self.assertEqual(result['match'], {'num':'2'})
+        request = self._getRequest(PATH_INFO='/archives/other')
+        result = mapper(request)
+        self.assertEqual(result['route'], None)
+        request = self._getRequest(PATH_INFO='/archives')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['bar'])
+
+    def test___call__prefix_requires_next_segment(self):
+        mapper = self._makeOne()
+        mapper.connect('foo', '/archives/*subpath')
+        request = self._getRequest(PATH_INFO='/archives')
+        result = mapper(request)
+        self.assertEqual(result['route'], None)
+        request = self._getRequest(PATH_INFO='/archives/')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['foo'])
+        self.assertEqual(result['match'], {'subpath':()})
+
+    def test_connect_resets_trie(self):
+        mapper = self._makeOne()
+        mapper.connect('foo', '/archives/{id}')
+        request = self._getRequest(PATH_INFO='/blog/1')
+        result = mapper(request)
+        self.assertEqual(result['route'], None)
+        self.assertNotEqual(mapper._trie, None)
+        mapper.connect('bar', '/blog/{id}')
+        self.assertEqual(mapper._trie, None)
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['bar'])
+
+class CachedRoutesMapperTests(RoutesMapperTests):
+    def _makeOne(self):
+        klass = self._getTargetClass()
+        return klass(cache_size=10)
+
+    def test_ctor(self):
+        mapper = self._makeOne()
+        self.assertEqual(mapper.cache_size, 10)
+        self.assertEqual(mapper.cache_hits, 0)
+        self.assertEqual(mapper.cache_misses, 0)
+
+    def test___call__counts_hits_and_misses(self):
+        mapper = self._makeOne()
+        mapper.connect('foo', '/archives/{id}')
+        request = self._getRequest(PATH_INFO='/archives/1')
+        result1 = mapper(request)
+        result2 = mapper(request)
+        self.assertEqual(mapper.cache_misses, 1)
+        self.assertEqual(mapper.cache_hits, 1)
+        self.assertEqual(result1['route'], mapper.routes['foo'])
+        self.assertEqual(result2['route'], mapper.routes['foo'])
+        self.assertEqual(result2['match'], {'id':'1'})
+
+    def test___call__does_not_rematch(self):
+        mapper = self._makeOne()
+        route = mapper.connect('foo', '/archives/{id}')
+        request = self._getRequest(PATH_INFO='/archives/1')
+        mapper(request)
+        def match(path): raise AssertionError('should not be called')
+        route.match = match
+        result = mapper(request)
+        self.assertEqual(result['match'], {'id':'1'})
+
+    def test___call__cached_matchdict_not_shared(self):
+        mapper = self._makeOne()
+        mapper.connect('foo', '/archives/{id}')
+        request = self._getRequest(PATH_INFO='/archives/1')
+        result = mapper(request)
+        result['match']['id'] = 'changed'
+        result = mapper(request)
+        self.assertEqual(result['match'], {'id':'1'})
+
+    def test___call__predicates_evaluated_per_request(self):
+        mapper = self._makeOne()
+        allowed = []
+        def pred(info, request):
+            return bool(allowed)
+        mapper.connect('foo', '/archives/{id}', predicates=[pred])
+        mapper.connect('bar', '/archives/{id}')
+        mapper.connect('baz', '/{other}/{id}')
+        request = self._getRequest(PATH_INFO='/archives/1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['bar'])
+        allowed.append(True)
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['foo'])
+
+    def test___call__extends_entry_when_predicates_fail(self):
+        mapper = self._makeOne()
+        allowed = [True]
+        def pred(info, request):
+            return bool(allowed)
+        mapper.connect('foo', '/archives/{id}', predicates=[pred])
+        mapper.connect('bar', '/{other}/{id}')
+        request = self._getRequest(PATH_INFO='/archives/1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['foo'])
+        allowed.pop()
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['bar'])
+        self.assertEqual(result['match'], {'other':'archives', 'id':'1'})
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['bar'])
+
+    def test___call__no_match_cached(self):
+        mapper = self._makeOne()
+        route = mapper.connect('foo', '/archives/{id}')
+        request = self._getRequest(PATH_INFO='/blog')
+        mapper(request)
+        def match(path): raise AssertionError('should not be called')
+        route.match = match
+        result = mapper(request)
+        self.assertEqual(result['route'], None)
+        self.assertEqual(mapper.cache_hits, 1)
+
+    def test_connect_clears_cache(self):
+        mapper = self._makeOne()
+        mapper.connect('foo', '/archives/{id}')
+        request = self._getRequest(PATH_INFO='/blog/1')
+        result = mapper(request)
+        self.assertEqual(result['route'], None)
+        mapper.connect('bar', '/blog/{id}')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['bar'])
+        self.assertEqual(mapper.cache_misses, 2)
+
+class CachedCompiledRoutesMapperTests(CachedRoutesMapperTests):
+    def _makeOne(self):
+        klass = self._getTargetClass()
+        return klass(compiled=True, cache_size=10)
+
+class TestRouteTrie(unittest.TestCase):
+    def _makeOne(self, *patterns):
+        from pyramid.urldispatch import _RouteTrie
+        from pyramid.urldispatch import Route
+        routes = [Route(pattern, pattern) for pattern in patterns]
+        return _RouteTrie(routes)
+
+    def _callFUT(self, trie, path):
+        return [route.pattern for route in trie(path)]
+
+    def test_candidates_preserve_order(self):
+        trie = self._makeOne('/a/b/{c}', '/{x}', '/a/{b}', '/a/b', '/z')
+        self.assertEqual(self._callFUT(trie, '/a/b/c'),
+                         ['/a/b/{c}', '/{x}', '/a/{b}', '/a/b'])
+        self.assertEqual(self._callFUT(trie, '/z'), ['/{x}', '/z'])
+        self.assertEqual(self._callFUT(trie, '/q'), ['/{x}'])
+
+    def test_oldstyle_and_relative_patterns(self):
+        trie = self._makeOne('archives/:action', 'foo')
+        self.assertEqual(self._callFUT(trie, '/archives/x'),
+                         ['archives/:action'])
+        self.assertEqual(self._callFUT(trie, '/foo'), ['foo'])
+
+    def test_nonascii_prefix(self):
+        pattern = text_(b'/caf\xc3\xa9/{x}', 'utf-8')
+        trie = self._makeOne(pattern, '/c{x}')
+        for path in (native_(b'/caf\xc3\xa9/x'),
+                     text_(b'/caf\xc3\xa9/x', 'utf-8')):
+            self.assertEqual(self._callFUT(trie, path), [pattern, '/c{x}'])
+        self.assertEqual(self._callFUT(trie, '/d/x'), [])
+
+    def test_path_without_leading_slash(self):
+        trie = self._makeOne('/{x}')
+        self.assertEqual(self._callFUT(trie, 'foo'), [])
+
 class TestCompileRoute(unittest.TestCase):
     def _callFUT(self, pattern):
         from pyramid.urldispatch import _compile_route
@@ -408,6 +620,31 @@ class TestCompileRouteFunctional(unittest.TestCase):
     def test_generator_functional_notdynamic(self):
         self.generates('', {}, '/')
         self.generates('/', {}, '/')
+        self.generates('/foo/bar', {'extra':'1'}, '/foo/bar')
+        self.generates('/100%', {}, '/100%')
+
+    def test_generator_functional_missing_name(self):
+        from pyramid.urldispatch import _compile_route
+        generator = _compile_route('/{x}/{y}')[1]
+        self.assertRaises(KeyError, generator, {'x':'a'})
+        generator = _compile_route('/{x}*traverse')[1]
+        self.assertRaises(KeyError, generator, {'x':'a'})
+
+    def test_generator_functional_extra_names_ignored(self):
+        self.generates('/{x}', {'x':'a', 'y':object()}, '/a')
+
+    def test_generator_functional_nonstring_values(self):
+        self.generates('/{x}/{y}', {'x':1, 'y':2.5}, '/1/2.5')
+        self.generates('/{x}*traverse', {'x':1, 'traverse':2}, '/12')
+
+    def test_generator_functional_percent_in_pattern(self):
+        self.generates('/100%/{x}', {'x':'a b'}, '/100%/a%20b')
+
+    def test_generator_functional_equal_values_of_differing_types(self):
+        self.generates('/{x}', {'x':1}, '/1')
+        self.generates('/{x}', {'x':True}, '/True')
+        self.generates('/{x}', {'x':1.0}, '/1.0')
+        self.generates('/{x}', {'x':1}, '/1')
 
     def test_generator_functional_newstyle(self):
         self.generates('/{x}', {'x':''}, '/')
@@ -449,6 +686,45 @@ class TestCompileRouteFunctional(unittest.TestCase):
         self.generates('/foo/:_abc', {'_abc':'20'}, '/foo/20')
         self.generates('/foo/:abc_def', {'abc_def':'20'}, '/foo/20')
 
+class Test_quote_segment(unittest.TestCase):
+    def setUp(self):
+        from pyramid import urldispatch
+        self.memo = urldispatch._quoted_segments
+        self.memo.clear()
+
+    def tearDown(self):
+        self.memo.clear()
+
+    def _callFUT(self, v):
+        from pyramid.urldispatch import _quote_segment
+        return _quote_segment(v)
+
+    def test_text(self):
+        la = text_(b'La Pe\xc3\xb1a', 'utf-8')
+        self.assertEqual(self._callFUT(la), 'La%20Pe%C3%B1a')
+        self.assertEqual(self.memo, {la:'La%20Pe%C3%B1a'})
+
+    def test_native(self):
+        self.assertEqual(self._callFUT('a/b'), 'a%2Fb')
+        self.assertEqual(self.memo, {'a/b':'a%2Fb'})
+
+    def test_int(self):
+        self.assertEqual(self._callFUT(1), '1')
+        self.assertEqual(self.memo, {1:'1'})
+
+    def test_other_types_not_memoized(self):
+        self.assertEqual(self._callFUT(True), 'True')
+        self.assertEqual(self._callFUT(1.5), '1.5')
+        self.assertEqual(self.memo, {})
+
+    def test_memo_bounded(self):
+        from pyramid import urldispatch
+        for i in range(urldispatch._quoted_segments_max):
+            self._callFUT(i)
+        self.assertEqual(len(self.memo), urldispatch._quoted_segments_max)
+        self._callFUT('a')
+        self.assertEqual(self.memo, {'a':'a'})
+
 class DummyContext(object):
     """ """
         
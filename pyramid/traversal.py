@@ -1,12 +1,18 @@
+import threading
+import time
 import warnings
+import weakref
 
 from zope.interface import implementer
 from zope.interface.interfaces import IInterface
 
+from repoze.lru import LRUCache
 from repoze.lru import lru_cache
 
+from pyramid.interfaces import ICacheableResource
 from pyramid.interfaces import IContextURL
 from pyramid.interfaces import IRequestFactory
+from pyramid.interfaces import ITraversalCache
 from pyramid.interfaces import ITraverser
 from pyramid.interfaces import VH_ROOT_KEY
 
@@ -19,6 +25,7 @@ from pyramid.compat import text_type
 from pyramid.compat import binary_type
 from pyramid.compat import url_unquote_native
 from pyramid.compat import is_nonstr_iter
+from pyramid.compat import string_types
 from pyramid.encode import url_quote
 from pyramid.exceptions import URLDecodeError
 from pyramid.location import lineage
@@ -167,9 +174,15 @@ def resource_path(resource, *elements):
        be imported as ``model_path``, although doing so will cause
        a deprecation warning to be emitted.
     """
+    if _resource_path_cache_used:
+        cache = getattr(get_current_registry(), 'resource_path_cache', None)
+        if cache is not None:
+            if not elements:
+                return cache.path(resource)
+            return _join_path_tuple(cache.path_tuple(resource) + elements)
     # joining strings is a bit expensive so we delegate to a function
     # which caches the joined result for us
-    return _join_path_tuple(resource_path_tuple(resource, *elements))
+    return _join_path_tuple(tuple(_resource_path_list(resource, *elements)))
 
 model_path = resource_path # b/w compat (forever)
 
@@ -374,6 +387,10 @@ def resource_path_tuple(resource, *elements):
        as ``model_path_tuple``, although doing so will cause a deprecation
        warning to be emitted.
     """
+    if _resource_path_cache_used:
+        cache = getattr(get_current_registry(), 'resource_path_cache', None)
+        if cache is not None:
+            return cache.path_tuple(resource) + elements
     return tuple(_resource_path_list(resource, *elements))
 
 model_path_tuple = resource_path_tuple  # b/w compat (forever)
@@ -387,6 +404,188 @@ def _resource_path_list(resource, *elements):
 
 _model_path_list = _resource_path_list # b/w compat, not an API
 
+_resource_path_cache_used = False
+
+class ResourcePathCache(object):
+    """ A cache of the physical paths of :term:`location`-aware resources,
+    keyed by resource identity.  It is consulted by
+    :func:`pyramid.traversal.resource_path`,
+    :func:`pyramid.traversal.resource_path_tuple` and (by way of those)
+    :meth:`pyramid.request.Request.resource_url` when the
+    ``pyramid.resource_path_cache`` setting is true, in which case the
+    :term:`application registry` holds an instance as its
+    ``resource_path_cache`` attribute (otherwise that attribute is
+    ``None``).
+
+    A cached path is reused only while the resource and each of its
+    ancestors still have the ``__name__`` and ``__parent__`` they had when
+    the path was computed; when a changed ``__name__`` or ``__parent__`` is
+    noticed, the entries of the changed resource and of all its cached
+    descendants are discarded.  Entries are removed when their resource is
+    garbage collected; resources which cannot be weakly referenced are
+    never cached.  The cache may be used by several threads at once.
+    """
+    def __init__(self):
+        global _resource_path_cache_used
+        # until a cache exists, resource_path and resource_path_tuple don't
+        # look for one in the current registry
+        _resource_path_cache_used = True
+        self._entries = {}
+        self._lock = threading.Lock()
+        # entries of collected resources, discarded under the lock later
+        self._pending = []
+
+    def path_tuple(self, resource):
+        """ Return the path tuple of ``resource`` as
+        :func:`pyramid.traversal.resource_path_tuple` would (without
+        ``elements``)."""
+        return self._entry(resource).path
+
+    def path(self, resource):
+        """ Return the path string of ``resource`` as
+        :func:`pyramid.traversal.resource_path` would (without
+        ``elements``)."""
+        entry = self._entry(resource)
+        joined = entry.joined
+        if joined is None:
+            joined = entry.joined = _join_path_tuple(entry.path)
+        return joined
+
+    def invalidate(self, resource=None):
+        """ Discard the cached path of ``resource`` and of every resource
+        cached beneath it.  If ``resource`` is ``None``, empty the cache."""
+        with self._lock:
+            self._purge()
+            if resource is None:
+                entries = self._entries
+                self._entries = {}
+                for entry in entries.values():
+                    entry.valid = False
+            else:
+                entry = self._entries.get(id(resource))
+                if entry is not None and entry.ref() is resource:
+                    self._discard(entry)
+
+    def _purge(self):
+        pending = self._pending
+        while pending:
+            self._discard(pending.pop())
+
+    def _discard(self, entry):
+        entries = self._entries
+        if entry.parent_entry is not None:
+            entry.parent_entry.children.discard(entry)
+        todo = [entry]
+        while todo:
+            entry = todo.pop()
+            entry.valid = False
+            entry.parent_entry = None
+            if entries.get(entry.key) is entry:
+                del entries[entry.key]
+            todo.extend(entry.children)
+            entry.children = set()
+
+    def _lookup(self, resource):
+        # return the entry of ``resource`` if it is still valid: the
+        # resource and each of its ancestors must still have the name and
+        # parent they had when it was made.  A stale entry is replaced (and
+        # its descendants discarded) when the path is computed again.  This
+        # only reads the cache, so it does not need the lock.
+        entry = self._entries.get(id(resource))
+        if entry is None:
+            return None
+        current = entry
+        loc = resource
+        while current is not None:
+            if current.ref() is not loc or current.name != loc.__name__:
+                return None
+            loc = getattr(loc, '__parent__', None)
+            current = current.parent_entry
+        if loc is not None:
+            return None
+        return entry
+
+    def _entry(self, resource):
+        entry = self._lookup(resource)
+        if entry is not None:
+            return entry
+        with self._lock:
+            self._purge()
+            # walk up until we find a cached ancestor (or the root), then
+            # compute the paths back down, caching each of them on the way
+            todo = [resource]
+            parent_entry = None
+            while True:
+                parent = getattr(todo[-1], '__parent__', None)
+                if parent is None:
+                    break
+                parent_entry = self._lookup(parent)
+                if parent_entry is not None:
+                    break
+                todo.append(parent)
+            for loc in reversed(todo):
+                entry = self._add(loc, parent_entry)
+                parent_entry = entry
+            return entry
+
+    def _add(self, resource, parent_entry):
+        name = resource.__name__
+        if parent_entry is None:
+            path = (name or '',)
+        else:
+            path = parent_entry.path + (name or '',)
+        entry = _ResourcePathEntry(id(resource), name, path)
+        try:
+            entry.ref = weakref.ref(resource, self._collected(entry))
+        except TypeError:
+            # not weakly referenceable; hand back an uncached entry
+            entry.valid = False
+            return entry
+        if parent_entry is not None:
+            if not parent_entry.valid:
+                # our parent could not be cached, so neither can we
+                entry.valid = False
+                return entry
+            entry.parent_entry = parent_entry
+            parent_entry.children.add(entry)
+        entries = self._entries
+        old = entries.get(entry.key)
+        if old is not None:
+            self._discard(old)
+        entries[entry.key] = entry
+        return entry
+
+    def _collected(self, entry):
+        # the callback may run in any thread, even one which holds the
+        # lock (a collection can happen during any allocation), so it only
+        # queues the entry when it cannot take the lock itself
+        def callback(ref, entry=entry, pending=self._pending,
+                     lock=self._lock):
+            if lock.acquire(False):
+                try:
+                    self._discard(entry)
+                finally:
+                    lock.release()
+            else:
+                pending.append(entry)
+        return callback
+
+class _ResourcePathEntry(object):
+    # the parent of an entry's resource is reachable (weakly) through
+    # ``parent_entry``, so cached entries never keep resources alive
+    __slots__ = ('key', 'ref', 'name', 'path', 'joined', 'valid',
+                 'parent_entry', 'children')
+
+    def __init__(self, key, name, path):
+        self.key = key
+        self.name = name
+        self.path = path
+        self.joined = None
+        self.valid = True
+        self.ref = None
+        self.parent_entry = None
+        self.children = set()
+
 def virtual_root(resource, request):
     """
     Provided any :term:`resource` and a :term:`request` object, return
@@ -656,7 +855,29 @@ class ResourceTreeTraverser(object):
             i = 0
             view_selector = self.VIEW_SELECTOR
             vpath_tuple = traversal_path_info(vpath)
-            for segment in vpath_tuple:
+            try:
+                registry = request.registry
+            except AttributeError:
+                registry = get_current_registry()
+            cache = None
+            if ICacheableResource.providedBy(root):
+                # only a root which is shared between requests may have
+                # its descendants cached
+                cache = registry.queryUtility(ITraversalCache)
+            if cache is not None:
+                # resume from the longest traversed prefix of the path
+                # which has been cached
+                obs = ()
+                for j in range(len(vpath_tuple), 0, -1):
+                    cached = cache.get(root, vpath_tuple[:j])
+                    if cached is not None:
+                        obs = cached
+                        i = j
+                        ob = obs[-1]
+                        if vroot_idx >= 0 and vroot_idx < i:
+                            vroot = obs[vroot_idx]
+                        break
+            for segment in vpath_tuple[i:]:
                 if segment[:2] == view_selector:
                     return {'context':ob,
                             'view_name':segment[2:],
@@ -690,6 +911,14 @@ class ResourceTreeTraverser(object):
                     vroot = next
                 ob = next
                 i += 1
+                if cache is not None and obs is not None:
+                    # only resources reached by way of cacheable resources
+                    # are cached
+                    if ICacheableResource.providedBy(next):
+                        obs = obs + (next,)
+                        cache.set(root, vpath_tuple[:i], obs)
+                    else:
+                        obs = None
 
         return {'context':ob, 'view_name':empty, 'subpath':subpath,
                 'traversed':vpath_tuple, 'virtual_root':vroot,
@@ -697,6 +926,68 @@ class ResourceTreeTraverser(object):
 
 ModelGraphTraverser = ResourceTreeTraverser # b/w compat, not API, used in wild
 
+@implementer(ITraversalCache)
+class TraversalCache(object):
+    """ A :term:`traversal cache` which can be registered via
+    :meth:`pyramid.config.Configurator.set_traversal_cache`.  It holds at
+    most ``max_entries`` entries, discarding the least recently used first
+    when it is full.  If ``timeout`` is not ``None``, each entry is
+    discarded ``timeout`` seconds after it was cached.
+
+    Entries are keyed by traversed path and by the identity of the
+    :term:`root` resource, so resources cached while traversing one root
+    object are never returned when traversing another.  The cache is only
+    used when the root itself provides
+    :class:`pyramid.interfaces.ICacheableResource`, and only resources
+    which provide that interface (and which were reached by way of such
+    resources) are cached.
+
+    Call :meth:`invalidate` when a cached resource changes."""
+
+    def __init__(self, max_entries=1000, timeout=None):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._cache = LRUCache(max_entries)
+
+    def get(self, root, path):
+        key = (id(root), path)
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        ref, resources, expires = entry
+        if ref() is not root or (
+            expires is not None and expires < time.time()):
+            self._cache.invalidate(key)
+            return None
+        return resources
+
+    def set(self, root, path, resources):
+        expires = None
+        if self.timeout is not None:
+            expires = time.time() + self.timeout
+        # a weak reference lets the root be collected, and tells a root
+        # apart from a later one which happens to have the same id
+        self._cache.put((id(root), path),
+                        (weakref.ref(root), resources, expires))
+
+    def invalidate(self, path=None):
+        """ Discard the entries for ``path`` and every path beneath it.
+        ``path`` may be a tuple of path segments or a path string such as
+        those returned by :func:`pyramid.traversal.resource_path`.  If
+        ``path`` is ``None``, every entry is discarded."""
+        cache = self._cache
+        if path is None:
+            cache.clear()
+            return
+        if isinstance(path, string_types):
+            path = traversal_path(path)
+        else:
+            path = tuple(path)
+        size = len(path)
+        for key in list(cache.data.keys()):
+            if key[1][:size] == path:
+                cache.invalidate(key)
+
 @implementer(IContextURL)
 class TraversalContextURL(object):
     """ The IContextURL adapter used to generate URLs for a resource in a
@@ -1,13 +1,15 @@
 import re
 from zope.interface import implementer
 
+from repoze.lru import LRUCache
+
 from pyramid.interfaces import IRoutesMapper
 from pyramid.interfaces import IRoute
 
 from pyramid.compat import native_
 from pyramid.compat import bytes_
 from pyramid.compat import text_type
-from pyramid.compat import string_types
+from pyramid.compat import integer_types
 from pyramid.compat import is_nonstr_iter
 from pyramid.compat import url_quote
 from pyramid.exceptions import URLDecodeError
@@ -30,9 +32,24 @@ class Route(object):
 
 @implementer(IRoutesMapper)
 class RoutesMapper(object):
-    def __init__(self):
+    cache_hits = 0
+    cache_misses = 0
+
+    def __init__(self, compiled=False, cache_size=None):
         self.routelist = []
         self.routes = {}
+        # when ``compiled`` is true, __call__ only tries the routes whose
+        # literal pattern prefix could match the path; the trie that finds
+        # them is built lazily and thrown away whenever a route is connected
+        self.compiled = compiled
+        self._trie = None
+        # when ``cache_size`` is nonzero, the routes whose patterns matched a
+        # path (and their matchdicts) are remembered for that path;
+        # predicates are still evaluated for every request
+        self.cache_size = cache_size
+        self._cache = None
+        if cache_size:
+            self._cache = LRUCache(cache_size)
 
     def has_routes(self):
         return bool(self.routelist)
@@ -53,6 +70,9 @@ class RoutesMapper(object):
         if not static:
             self.routelist.append(route)
         self.routes[name] = route
+        self._trie = None
+        if self._cache is not None:
+            self._cache.clear()
         return route
 
     def generate(self, name, kw):
@@ -66,7 +86,10 @@ class RoutesMapper(object):
         except KeyError:
             path = '/'
 
-        for route in self.routelist:
+        if self._cache is not None:
+            return self._cached_match(request, path)
+
+        for route in self._candidates(path):
             match = route.match(path)
             if match is not None:
                 preds = route.predicates
@@ -77,6 +100,89 @@ class RoutesMapper(object):
 
         return {'route':None, 'match':None}
 
+    def _candidates(self, path):
+        if self.compiled:
+            trie = self._trie
+            if trie is None:
+                trie = self._trie = _RouteTrie(self.routelist)
+            return trie(path)
+        return self.routelist
+
+    def _cached_match(self, request, path):
+        # a cache entry is a tuple of (route, matchdict) pairs for the routes
+        # whose pattern matched ``path`` plus the index of the next candidate
+        # route to try, or ``None`` if every candidate has been tried; the
+        # entry is extended only when predicates reject all of its routes
+        cache = self._cache
+        entry = cache.get(path)
+        if entry is None:
+            self.cache_misses += 1
+            found, start = (), 0
+        else:
+            self.cache_hits += 1
+            found, start = entry
+
+        for route, match in found:
+            preds = route.predicates
+            # a copy, so the cached matchdict can't be mutated by the app
+            info = {'match':dict(match), 'route':route}
+            if preds and not all((p(info, request) for p in preds)):
+                continue
+            return info
+
+        if start is not None:
+            found = list(found)
+            routes = self._candidates(path)
+            for i in range(start, len(routes)):
+                route = routes[i]
+                match = route.match(path)
+                if match is not None:
+                    found.append((route, match))
+                    preds = route.predicates
+                    info = {'match':dict(match), 'route':route}
+                    if preds and not all((p(info, request) for p in preds)):
+                        continue
+                    cache.put(path, (tuple(found), i + 1))
+                    return info
+            cache.put(path, (tuple(found), None))
+
+        return {'route':None, 'match':None}
+
+class _RouteTrie(object):
+    """ A trie of the static path segments which begin each route pattern in
+    ``routelist``.  Calling it with a path returns the routes which could
+    possibly match that path, in ``routelist`` order. """
+    def __init__(self, routelist):
+        self.routelist = list(routelist)
+        # a node is a (children, entries) tuple; ``entries`` is a list of
+        # (route index, tail) pairs for the routes whose literal prefix ends
+        # in the segment represented by the node plus a partial segment
+        # ``tail`` which must start the next path segment
+        self.root = ({}, [])
+        for i, route in enumerate(self.routelist):
+            segments = _trie_prefix(route.pattern).split('/')
+            tail = segments.pop()
+            node = self.root
+            for segment in segments:
+                node = node[0].setdefault(segment, ({}, []))
+            node[1].append((i, tail))
+
+    def __call__(self, path):
+        segments = path.split('/')
+        found = []
+        children, entries = self.root
+        for segment in segments:
+            for i, tail in entries:
+                if segment.startswith(tail):
+                    found.append(i)
+            node = children.get(segment)
+            if node is None:
+                break
+            children, entries = node
+        found.sort()
+        routelist = self.routelist
+        return [routelist[i] for i in found]
+
 # stolen from bobo and modified
 old_route_re = re.compile(r'(\:[_a-zA-Z]\w*)')
 star_at_end = re.compile(r'\*\w*$')
@@ -91,7 +197,7 @@ def update_pattern(matchobj):
     name = matchobj.group(0)
     return '{%s}' % name[1:]
 
-def _compile_route(route):
+def _normalize_route(route):
     if old_route_re.search(route) and not route_re.search(route):
         route = old_route_re.sub(update_pattern, route)
 
@@ -102,13 +208,39 @@ def _compile_route(route):
     if star_at_end.search(route):
         route, star = route.rsplit('*', 1)
 
+    return route, star
+
+def _literal_prefix(route):
+    # the part of the pattern before its first replacement marker; every path
+    # matched by the route begins with exactly this string
+    route, star = _normalize_route(route)
+    return route_re.split(route)[0]
+
+def _trie_prefix(route):
+    # the literal prefix of the pattern up to its first non-ASCII character,
+    # as a native string: on Python 2, comparing a text prefix with a path
+    # segment holding non-ASCII bytes (or the reverse) raises
+    # UnicodeDecodeError, while the route's regex simply decides whether it
+    # matches; a shorter prefix only makes the route a candidate for more
+    # paths
+    prefix = _literal_prefix(route)
+    for i, char in enumerate(prefix):
+        if ord(char) > 127:
+            prefix = prefix[:i]
+            break
+    return native_(prefix)
+
+def _compile_route(route):
+    route, star = _normalize_route(route)
+
     pat = route_re.split(route)
     pat.reverse()
     rpat = []
     gen = []
+    names = []
     prefix = pat.pop() # invar: always at least one element (route='/'+route)
     rpat.append(re.escape(prefix))
-    gen.append(prefix)
+    gen.append(prefix.replace('%', '%%'))
 
     while pat:
         name = pat.pop()
@@ -118,12 +250,13 @@ def _compile_route(route):
         else:
             reg = '[^/]+'
         gen.append('%%(%s)s' % name)
+        names.append(name)
         name = '(?P<%s>%s)' % (name, reg)
         rpat.append(name)
         s = pat.pop()
         if s:
             rpat.append(re.escape(s))
-            gen.append(s)
+            gen.append(s.replace('%', '%%'))
 
     if star:
         rpat.append('(?P<%s>.*?)' % star)
@@ -154,18 +287,56 @@ def _compile_route(route):
                     
 
     gen = ''.join(gen)
+
+    if not names and not star:
+        # nothing to replace; the URL path is always the same
+        path = gen % {}
+        def generator(dict):
+            return path
+        return matcher, generator
+
     def generator(dict):
+        # only the replacement names used by the pattern are converted;
+        # extra names are ignored and a missing name raises a KeyError
         newdict = {}
-        for k, v in dict.items():
+        for k in names:
+            v = dict[k]
+            if v.__class__ in _memoizable_types:
+                try:
+                    newdict[k] = _quoted_segments[v]
+                    continue
+                except KeyError:
+                    pass
+            newdict[k] = _quote_segment(v)
+        if star:
+            v = dict[star]
             if v.__class__ is text_type:
                 v = native_(v, 'utf-8')
-            if k == star and is_nonstr_iter(v):
+            if is_nonstr_iter(v):
                 v = '/'.join([quote_path_segment(x) for x in v])
-            elif k != star:
-                if v.__class__ not in string_types:
-                    v = str(v)
-                v = url_quote(v, safe='')
-            newdict[k] = v
+            newdict[star] = v
         return gen % newdict
 
     return matcher, generator
+
+# a memo of the quoted representations of replacement values; it is bounded
+# by emptying it when it becomes full, as route_url may be passed arbitrary
+# user-supplied values.  Only values of the types below are memoized: they
+# never compare equal to a value of another of these types that would be
+# rendered differently (unlike, say, ``1``, ``1.0`` and ``True``).
+_quoted_segments = {}
+_quoted_segments_max = 1000
+_memoizable_types = (text_type, str) + integer_types
+
+def _quote_segment(v):
+    cls = v.__class__
+    if cls is text_type:
+        result = url_quote(native_(v, 'utf-8'), safe='')
+    elif cls in _memoizable_types:
+        result = url_quote(str(v), safe='')
+    else:
+        return url_quote(str(v), safe='')
+    if len(_quoted_segments) >= _quoted_segments_max:
+        _quoted_segments.clear()
+    _quoted_segments[v] = result
+    return result